@@ -0,0 +1,491 @@
+"""
+GameTable engine benchmark suite.
+
+Plays random hands directly against `GameTable` (no sockets, no delays) and
+reports how many `record_action` calls per second the engine sustains, plus
+the rate of the seat-set queries every action runs (`_street_complete`,
+`_hand_over`, `should_auto_runout`, `_next_active_seat`).
+
+It then times individual operations on freshly prepared, seeded tables
+(`start_new_hand`, `record_action` per action type, `_settle_pots` with 2-6
+players at showdown, `to_state_for` at several history lengths,
+`build_earnings_updates`) and reports time and `tracemalloc` bytes per call:
+the peak allocated during the call and what is still held afterwards.
+
+The full run also prices the `/metrics` and tracing instrumentation: the same
+action messages (engine call, per-viewer state build, frame fanout to fake
+sockets) are played once on a bare table and once through the real
+`instrument()` wrappers, `ConnectionManager` send counters and tracer spans
+that `src/main.py` installs, and the difference is reported per message.
+
+Results can be saved as a JSON baseline; later runs print the change against
+it, and allocation numbers are deterministic, so a diff of the saved file
+shows regressions directly.
+
+    cd api
+    python scripts/bench_engine.py --hands 20000 --players 6
+    python scripts/bench_engine.py --save          # refresh scripts/bench_engine_baseline.json
+    python scripts/bench_engine.py --only settle   # ops whose name contains "settle"
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_API_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _API_ROOT not in sys.path:
+    sys.path.insert(0, _API_ROOT)
+
+from src.game.manager import ConnectionManager, GameTable, _encode_message  # noqa: E402
+from src.game.models import ActionPayload, ActionRecord, ActionType, Street  # noqa: E402
+from src.metrics import MetricsRegistry, instrument  # noqa: E402
+from src.tracing import Tracer  # noqa: E402
+
+BETTING_STREETS = (Street.preflop, Street.flop, Street.turn, Street.river)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_engine_baseline.json")
+
+
+def _seat_table(players: int) -> GameTable:
+    table = GameTable(table_id="bench")
+    for seat_index in range(players):
+        table.reserve_seat(f"p{seat_index}@bench", f"p{seat_index}", seat_index)
+    return table
+
+
+def _random_action(table: GameTable, rng: random.Random) -> ActionPayload:
+    seat = table.seats[table.current_turn_seat]
+    to_call = max(0, table.current_bet - table.street_contribs[seat.seat_index])
+    roll = rng.random()
+    if to_call == 0:
+        if roll < 0.6:
+            return ActionPayload(email=seat.email, action=ActionType.check)
+        if table.current_bet == 0 and roll < 0.95:
+            return ActionPayload(
+                email=seat.email, action=ActionType.bet, amount=table.big_blind * 2
+            )
+        return ActionPayload(email=seat.email, action=ActionType.all_in)
+    if roll < 0.3:
+        return ActionPayload(email=seat.email, action=ActionType.fold)
+    if roll < 0.85:
+        return ActionPayload(email=seat.email, action=ActionType.call)
+    if roll < 0.97:
+        return ActionPayload(
+            email=seat.email,
+            action=ActionType.raise_,
+            amount=table.current_bet + table.min_raise,
+        )
+    return ActionPayload(email=seat.email, action=ActionType.all_in)
+
+
+def _finish_hand(table: GameTable) -> None:
+    while table.should_auto_runout():
+        if not table.advance_auto_runout():
+            break
+    if table.street == Street.settlement:
+        table.build_earnings_updates()
+        table.complete_settlement()
+
+
+def bench_actions(hands: int, players: int, seed: int) -> tuple[int, float]:
+    rng = random.Random(seed)
+    random.seed(seed)
+    table = _seat_table(players)
+    actions = 0
+    elapsed = 0.0
+    for _ in range(hands):
+        table.start_new_hand()
+        while table.street in BETTING_STREETS and table.current_turn_seat is not None:
+            payload = _random_action(table, rng)
+            start = time.perf_counter()
+            try:
+                table.record_action(payload)
+            except ValueError:
+                # Raise sizing can be illegal for short stacks; fall back to a call/check.
+                fallback = ActionType.call if payload.action != ActionType.check else ActionType.fold
+                table.record_action(ActionPayload(email=payload.email, action=fallback))
+            elapsed += time.perf_counter() - start
+            actions += 1
+        _finish_hand(table)
+    return actions, elapsed
+
+
+def bench_seat_queries(players: int, seed: int, rounds: int) -> tuple[int, float]:
+    random.seed(seed)
+    table = _seat_table(players)
+    table.start_new_hand()
+    # Move a few actions into the hand so the seat sets are non-trivial.
+    for _ in range(players // 2):
+        seat = table.seats[table.current_turn_seat]
+        table.record_action(ActionPayload(email=seat.email, action=ActionType.call))
+    start_seat = table.current_turn_seat or 0
+    queries = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        table._street_complete()
+        table._hand_over()
+        table.should_auto_runout()
+        table._next_active_seat(start_seat)
+        queries += 4
+    return queries, time.perf_counter() - start
+
+
+# --- metrics / tracing overhead ----------------------------------------------
+
+
+class _NullSocket:
+    async def send_text(self, text: str) -> None:
+        return None
+
+
+def _instrument_like_main(table: GameTable) -> Tracer:
+    """The engine wrappers and tracer `src/main.py` sets up, on a private registry."""
+    registry = MetricsRegistry()
+    for method, sample_every in (
+        ("start_new_hand", 1),
+        ("record_action", 1),
+        ("to_state_for", 8),
+        ("_settle_pots", 1),
+    ):
+        instrument(table, method, registry.histogram(f"{method}_seconds", method), sample_every=sample_every)
+    return Tracer(
+        registry.histogram("message_seconds", "Message.", labelnames=("type",)),
+        registry.histogram("phase_seconds", "Phase.", labelnames=("type", "phase")),
+    )
+
+
+def _next_payload(table: GameTable) -> ActionPayload:
+    """Passive play to showdown: call a bet, otherwise check; deal on when the hand is over."""
+    if table.street not in BETTING_STREETS or table.current_turn_seat is None:
+        _finish_hand(table)
+        table.start_new_hand()
+    seat_index = table.current_turn_seat
+    to_call = table.current_bet - table.street_contribs[seat_index]
+    return ActionPayload(
+        email=table.seats[seat_index].email, action=ActionType.call if to_call else ActionType.check
+    )
+
+
+async def _bare_message(table: GameTable, payload: ActionPayload, sockets: List[Any], emails: List[str]) -> None:
+    table.record_action(payload)
+    text = _encode_message({"type": "actionApplied", "payload": payload.model_dump()})
+    for socket in sockets:
+        await socket.send_text(text)
+    connected = set(emails)
+    states = [
+        (socket, {"type": "tableState", "payload": table.to_state_for(email, connected).model_dump()})
+        for socket, email in zip(sockets, emails)
+    ]
+    for socket, message in states:
+        await socket.send_text(_encode_message(message))
+
+
+async def _traced_message(
+    table: GameTable,
+    payload: ActionPayload,
+    sockets: List[Any],
+    emails: List[str],
+    manager: ConnectionManager,
+    tracer: Tracer,
+) -> None:
+    # Same steps as the `/ws/game` "action" branch and `broadcast_table_state`.
+    span = tracer.begin("action")
+    table.record_action(payload)
+    await manager.broadcast("bench", {"type": "actionApplied", "payload": payload.model_dump()})
+    connected = set(emails)
+    with tracer.phase("serialize"):
+        states = [
+            (socket, {"type": "tableState", "payload": table.to_state_for(email, connected).model_dump()})
+            for socket, email in zip(sockets, emails)
+        ]
+    with tracer.phase("fanout"):
+        for socket, message in states:
+            await manager.send(socket, message)
+    tracer.end(span)
+
+
+async def _play_messages(players: int, seed: int, messages: int) -> Tuple[float, float]:
+    # Two identical tables advance in lockstep, alternating which goes first, so
+    # machine noise lands on both sides alike.
+    bare_table = _seeded_table(players, seed)
+    traced_table = _seeded_table(players, seed)
+    tracer = _instrument_like_main(traced_table)
+    emails = [seat.email for seat in bare_table.seats if seat.email]
+    sockets = [_NullSocket() for _ in emails]
+    manager = ConnectionManager()
+    manager.active_connections["bench"] = set(sockets)
+    for socket, email in zip(sockets, emails):
+        manager.set_player(socket, email)
+    bare = traced = 0.0
+    for index in range(messages):
+        bare_payload = _next_payload(bare_table)
+        traced_payload = _next_payload(traced_table)
+        for traced_turn in ((False, True) if index % 2 else (True, False)):
+            start = time.perf_counter()
+            if traced_turn:
+                await _traced_message(traced_table, traced_payload, sockets, emails, manager, tracer)
+                traced += time.perf_counter() - start
+            else:
+                await _bare_message(bare_table, bare_payload, sockets, emails)
+                bare += time.perf_counter() - start
+    return bare, traced
+
+
+def bench_metrics_overhead(players: int, seed: int, messages: int, repeat: int) -> Tuple[float, float]:
+    """Best-of-`repeat` seconds per action message: (bare, instrumented)."""
+    runs = [asyncio.run(_play_messages(players, seed, messages)) for _ in range(repeat)]
+    return min(run[0] for run in runs) / messages, min(run[1] for run in runs) / messages
+
+
+# --- per-operation suite -------------------------------------------------------
+#
+# Each case is (name, prepare, op): `prepare(seed)` builds the state outside the
+# timed region and `op(state)` is the single call being measured.
+
+Case = Tuple[str, Callable[[int], Any], Callable[[Any], Any]]
+
+
+def _seeded_table(players: int, seed: int) -> GameTable:
+    table = GameTable(table_id="bench", rng=random.Random(seed))
+    for seat_index in range(players):
+        table.reserve_seat(f"p{seat_index}@bench", f"p{seat_index}", seat_index)
+    return table
+
+
+def _act(table: GameTable, action: ActionType, amount: Optional[int] = None) -> None:
+    seat = table.seats[table.current_turn_seat]
+    table.record_action(ActionPayload(email=seat.email, action=action, amount=amount))
+
+
+def _preflop_table(seed: int) -> GameTable:
+    """6-max preflop, UTG to act facing the big blind."""
+    table = _seeded_table(6, seed)
+    table.start_new_hand()
+    return table
+
+
+def _flop_table(seed: int) -> GameTable:
+    """6-max flop after a limped pot, first seat to act with no bet."""
+    table = _preflop_table(seed)
+    while table.street == Street.preflop:
+        seat_index = table.current_turn_seat
+        to_call = table.current_bet - table.street_contribs[seat_index]
+        _act(table, ActionType.call if to_call else ActionType.check)
+    return table
+
+
+def _showdown_table(players: int, seed: int) -> GameTable:
+    """
+    `players` seats all-in preflop with distinct stacks (the two biggest equal),
+    i.e. `players - 1` pots, stopped right before `_settle_pots`.
+    """
+    table = _seeded_table(6, seed)
+    levels = [60 * (index + 1) for index in range(players - 1)]
+    levels.append(levels[-1])
+    for seat_index in range(6):
+        table.stacks[seat_index] = levels[seat_index] if seat_index < players else 600
+    table.start_new_hand()
+    shoving = set(range(players))
+    while table.street == Street.preflop and table.current_turn_seat is not None:
+        _act(table, ActionType.all_in if table.current_turn_seat in shoving else ActionType.fold)
+    while table.street != Street.river:
+        table.advance_auto_runout()
+    # Same steps `_advance_street` takes at the end of the river.
+    table.street = Street.showdown
+    table.pots.close_street()
+    table.current_turn_seat = None
+    return table
+
+
+def _settled_table(seed: int) -> GameTable:
+    table = _showdown_table(4, seed)
+    table._settle_pots()
+    return table
+
+
+def _history_table(length: int, seed: int) -> GameTable:
+    table = _flop_table(seed)
+    filler = [record for record in table.action_history if record.actor_email]
+    while len(table.action_history) < length:
+        record = filler[len(table.action_history) % len(filler)]
+        table.action_history.append(ActionRecord(**record.model_dump()))
+    return table
+
+
+def _suite_cases() -> List[Case]:
+    cases: List[Case] = [
+        ("start_new_hand", lambda seed: _seeded_table(6, seed), lambda table: table.start_new_hand()),
+    ]
+    for action in (ActionType.fold, ActionType.call, ActionType.raise_, ActionType.all_in):
+        cases.append(
+            (
+                f"record_action/{action.value}",
+                _preflop_table,
+                lambda table, action=action: _act(
+                    table,
+                    action,
+                    table.current_bet + table.min_raise if action == ActionType.raise_ else None,
+                ),
+            )
+        )
+    for action in (ActionType.check, ActionType.bet):
+        cases.append(
+            (
+                f"record_action/{action.value}",
+                _flop_table,
+                lambda table, action=action: _act(
+                    table, action, table.big_blind * 2 if action == ActionType.bet else None
+                ),
+            )
+        )
+    for players in range(2, 7):
+        cases.append(
+            (
+                f"_settle_pots/{players}-way",
+                lambda seed, players=players: _showdown_table(players, seed),
+                lambda table: table._settle_pots(),
+            )
+        )
+    for length in (10, 50, 200):
+        cases.append(
+            (
+                f"to_state_for/history={length}",
+                lambda seed, length=length: _history_table(length, seed),
+                lambda table: table.to_state_for("p0@bench", {"p0@bench", "p1@bench"}),
+            )
+        )
+    cases.append(
+        ("build_earnings_updates", _settled_table, lambda table: table.build_earnings_updates())
+    )
+    return cases
+
+
+def measure(prepare: Callable[[int], Any], op: Callable[[Any], Any], iterations: int, seed: int) -> Dict[str, float]:
+    """Mean time per call, plus mean tracemalloc peak / retained bytes per call."""
+    best = float("inf")
+    for _ in range(3):
+        elapsed = 0.0
+        for index in range(iterations):
+            state = prepare(seed + index)
+            start = time.perf_counter()
+            op(state)
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed)
+    samples = min(iterations, 50)
+    peak_total = 0
+    retained_total = 0
+    tracemalloc.start()
+    try:
+        for index in range(samples):
+            state = prepare(seed + index)
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = op(state)
+            current, peak = tracemalloc.get_traced_memory()
+            del result
+            peak_total += peak - before
+            retained_total += current - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "us_per_op": round(best / iterations * 1e6, 3),
+        "peak_bytes": round(peak_total / samples),
+        "retained_bytes": round(retained_total / samples),
+    }
+
+
+def run_suite(iterations: int, seed: int, only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, prepare, op in _suite_cases():
+        if only and only not in name:
+            continue
+        results[name] = measure(prepare, op, iterations, seed)
+    return results
+
+
+def _change(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def print_suite(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'operation':<28}{'us/op':>10}{'':>7}{'peak B':>10}{'':>7}{'retained B':>12}")
+    for name, result in results.items():
+        previous = baseline.get(name, {})
+        print(
+            f"{name:<28}"
+            f"{result['us_per_op']:>10.2f}{_change(result['us_per_op'], previous.get('us_per_op')):>7}"
+            f"{result['peak_bytes']:>10}{_change(result['peak_bytes'], previous.get('peak_bytes')):>7}"
+            f"{result['retained_bytes']:>12}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="report the best of N runs")
+    parser.add_argument("--iterations", type=int, default=300, help="calls per suite operation")
+    parser.add_argument("--only", default=None, help="run suite operations whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON baseline to compare against")
+    parser.add_argument("--save", action="store_true", help="write results to --baseline")
+    args = parser.parse_args()
+    baseline: Dict[str, Dict[str, float]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    if args.only:
+        results = run_suite(args.iterations, args.seed, args.only)
+        print_suite(results, baseline)
+        if args.save:
+            _save_baseline(args.baseline, {**baseline, **results})
+        return
+    actions, elapsed = min(
+        (bench_actions(args.hands, args.players, args.seed) for _ in range(args.repeat)),
+        key=lambda result: result[1],
+    )
+    print(
+        f"record_action: {actions} actions in {elapsed:.3f}s "
+        f"-> {actions / elapsed:,.0f} actions/s"
+    )
+    queries, elapsed = min(
+        (
+            bench_seat_queries(args.players, args.seed, args.hands * 10)
+            for _ in range(args.repeat)
+        ),
+        key=lambda result: result[1],
+    )
+    print(
+        f"seat-set queries: {queries} calls in {elapsed:.3f}s "
+        f"-> {queries / elapsed:,.0f} calls/s"
+    )
+    bare, instrumented = bench_metrics_overhead(args.players, args.seed, 2000, args.repeat)
+    print(
+        f"action message: {bare * 1e6:.1f}us bare, {instrumented * 1e6:.1f}us with metrics/tracing "
+        f"-> {(instrumented - bare) / bare:+.2%} overhead"
+    )
+    print()
+    results = run_suite(args.iterations, args.seed, None)
+    print_suite(results, baseline)
+    if args.save:
+        _save_baseline(args.baseline, results)
+
+
+def _save_baseline(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+    print(f"saved baseline: {path}")
+
+
+if __name__ == "__main__":
+    main()
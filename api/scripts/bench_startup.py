@@ -0,0 +1,152 @@
+"""
+Cold-start benchmark for the API.
+
+Measures, over several fresh interpreter processes:
+
+- import time of `src.main` (what every Cloud Run cold start pays before the
+  port is bound), plus the modules with the largest self time (`-X importtime`);
+- time from spawning `uvicorn src.main:app` to the first successful `GET /`,
+  which is what a reconnecting player waits for after a scale-from-zero.
+
+`--budget` turns the run into a check: the exit status is 1 when the median
+time to first response exceeds it.
+
+    cd api
+    python scripts/bench_startup.py --runs 5
+    python scripts/bench_startup.py --runs 3 --budget 1.5 --top 0
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+_API_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import src.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET],
+        cwd=_API_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def heaviest_imports(top: int) -> List[Tuple[int, str]]:
+    """(self time in microseconds, module) of the slowest imports under `src.main`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=_API_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows: List[Tuple[int, str]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def measure_first_response(timeout: float) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=_API_ROOT,
+        env={"SESSION_SECRET": "bench-startup", **os.environ},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            elapsed = time.perf_counter() - started
+            if elapsed > timeout:
+                raise RuntimeError(f"no response from {url} within {timeout:.0f}s")
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with status {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {"min": min(values), "median": statistics.median(values), "max": max(values)}
+
+
+def _format(label: str, values: List[float]) -> str:
+    stats = _summary(values)
+    return (
+        f"{label}: median {stats['median'] * 1000:.0f}ms "
+        f"(min {stats['min'] * 1000:.0f}ms, max {stats['max'] * 1000:.0f}ms, n={len(values)})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark API import time and time to first response.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="list this many slowest imports (0 = skip)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for the first response")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="fail when the median time to first response exceeds this many seconds",
+    )
+    args = parser.parse_args()
+
+    import_times = [measure_import() for _ in range(args.runs)]
+    print(_format("import src.main", import_times))
+    if args.top:
+        print("slowest imports (self time):")
+        for self_us, name in heaviest_imports(args.top):
+            print(f"  {self_us / 1000:8.1f}ms  {name}")
+
+    first_response = [measure_first_response(args.timeout) for _ in range(args.runs)]
+    print(_format("spawn -> first GET /", first_response))
+
+    budget: Optional[float] = args.budget
+    if budget is not None:
+        median = statistics.median(first_response)
+        if median > budget:
+            print(f"over budget: {median * 1000:.0f}ms > {budget * 1000:.0f}ms")
+            sys.exit(1)
+        print(f"within budget ({budget * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+WebSocket load test for `/ws/game`.
+
+Starts the app on a local uvicorn server (or targets `--url`), opens
+`--clients` simulated browsers that speak the real protocol (`joinTable`,
+`reserveSeat`, `startHand`, `action`, `nextHandGaugeComplete`) and plays full
+hands. Reports action -> `tableState` latency percentiles (measured on the
+acting client, until the first state that reflects its action) and the
+frames / bytes per second received by all clients.
+
+The server hosts a single table, so the first `max_players` clients take seats
+and the rest join as observers (they still receive every broadcast and must
+confirm the settlement gauge, like real spectators). With the in-process
+server, clients and server share one event loop, so latency includes client
+work; use `--url` against a separately started server to separate them.
+Each client connects with a session token signed by the in-process server,
+or with `--session-secret` (default `SESSION_SECRET`) for `--url`.
+
+    cd api
+    python scripts/loadtest.py --clients 6 --hands 200
+    python scripts/loadtest.py --clients 50 --duration 30 --runout-delay 0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import websockets
+
+_API_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _API_ROOT not in sys.path:
+    sys.path.insert(0, _API_ROOT)
+
+BETTING_STREETS = ("preflop", "flop", "turn", "river")
+
+
+@dataclass
+class LoadStats:
+    latencies: List[float] = field(default_factory=list)
+    frames: int = 0
+    bytes: int = 0
+    actions: int = 0
+    errors: int = 0
+    hands: int = 0
+    elapsed: float = 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+def _turn_token(state: dict) -> Tuple[int, str, int]:
+    # Changes whenever the server applies an action, so a stale broadcast that
+    # still shows our turn is never mistaken for a new decision point.
+    return (state["hand_number"], state["street"], len(state["action_history"]))
+
+
+def _choose_action(state: dict, seat: dict, rng: random.Random) -> dict:
+    to_call = max(0, state["current_bet"] - seat["street_commit"])
+    roll = rng.random()
+    if to_call == 0:
+        max_total = seat["stack"] + seat["street_commit"]
+        if roll < 0.1 and state["current_bet"] == 0 and max_total > state["big_blind"] * 2:
+            return {"action": "bet", "amount": state["big_blind"] * 2}
+        return {"action": "check"}
+    if roll < 0.2:
+        return {"action": "fold"}
+    return {"action": "call"}
+
+
+class SimulatedClient:
+    def __init__(
+        self,
+        index: int,
+        url: str,
+        seat_index: Optional[int],
+        stats: LoadStats,
+        stop: asyncio.Event,
+        rng: random.Random,
+        start_when_seated: int = 0,
+        token: Optional[str] = None,
+    ) -> None:
+        self.email = f"load{index}@loadtest"
+        self.name = f"load{index}"
+        self.url = f"{url}?token={token}" if token else url
+        self.seat_index = seat_index
+        self.stats = stats
+        self.stop = stop
+        self.rng = rng
+        self.acted_token: Optional[Tuple[int, str, int]] = None
+        self.sent_at: Optional[float] = None
+        self.gauge_sent_for = 0
+        # The first client starts the game once this many seats are taken.
+        self.start_when_seated = start_when_seated
+
+    async def run(self) -> None:
+        async with websockets.connect(self.url, max_size=None) as ws:
+            await self._send(ws, "joinTable", {"email": self.email, "name": self.name})
+            if self.seat_index is not None:
+                await self._send(
+                    ws,
+                    "reserveSeat",
+                    {"email": self.email, "name": self.name, "seat_index": self.seat_index},
+                )
+            receiver = asyncio.create_task(self._receive(ws))
+            await self.stop.wait()
+            receiver.cancel()
+            try:
+                await receiver
+            except (asyncio.CancelledError, websockets.ConnectionClosed):
+                pass
+
+    async def _send(self, ws, message_type: str, payload: dict) -> None:
+        await ws.send(json.dumps({"type": message_type, "payload": payload}))
+
+    async def _receive(self, ws) -> None:
+        async for raw in ws:
+            self.stats.frames += 1
+            self.stats.bytes += len(raw.encode() if isinstance(raw, str) else raw)
+            message = json.loads(raw)
+            message_type = message.get("type")
+            if message_type == "error":
+                self.stats.errors += 1
+                continue
+            if message_type not in ("tableState", "handState"):
+                continue
+            await self._on_state(ws, message["payload"])
+
+    async def _on_state(self, ws, state: dict) -> None:
+        if self.start_when_seated and state["street"] == "waiting":
+            if sum(1 for seat in state["seats"] if seat.get("email")) >= self.start_when_seated:
+                self.start_when_seated = 0
+                await self._send(ws, "startHand", {"save_stats": False})
+            return
+        token = _turn_token(state)
+        if self.sent_at is not None and token != self.acted_token:
+            self.stats.latencies.append(time.perf_counter() - self.sent_at)
+            self.sent_at = None
+        if state["street"] == "settlement":
+            if state["hand_number"] > self.gauge_sent_for:
+                self.gauge_sent_for = state["hand_number"]
+                if self.seat_index == 0:
+                    self.stats.hands += 1
+                await self._send(ws, "nextHandGaugeComplete", {"email": self.email})
+            return
+        if (
+            self.seat_index is None
+            or state["street"] not in BETTING_STREETS
+            or state["current_turn_seat"] != self.seat_index
+            or token == self.acted_token
+        ):
+            return
+        seat = state["seats"][self.seat_index]
+        if seat.get("email") != self.email:
+            return
+        decision = _choose_action(state, seat, self.rng)
+        self.acted_token = token
+        self.sent_at = time.perf_counter()
+        self.stats.actions += 1
+        await self._send(ws, "action", {"email": self.email, **decision})
+
+
+async def _watch(stats: LoadStats, stop: asyncio.Event, hands: int, duration: float) -> None:
+    deadline = time.perf_counter() + duration
+    while not stop.is_set():
+        if stats.hands >= hands or time.perf_counter() >= deadline:
+            stop.set()
+            return
+        await asyncio.sleep(0.05)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_local_server(hand_delay: float, runout_delay: float):
+    import uvicorn
+
+    # The in-process server enforces sessions, which needs a signing key.
+    os.environ.setdefault("SESSION_SECRET", "loadtest")
+    from src import main
+
+    main.HAND_DELAY_SECONDS = hand_delay
+    main.RUNOUT_DELAY_SECONDS = runout_delay
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning", ws_max_size=1 << 24)
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task, f"ws://127.0.0.1:{port}/ws/game", main.table.max_players, main.session_tokens
+
+
+async def run_load(args: argparse.Namespace) -> LoadStats:
+    server = server_task = None
+    max_players = args.max_players
+    url = args.url
+    tokens = None
+    if url is None:
+        server, server_task, url, max_players, tokens = await _start_local_server(
+            args.hand_delay, args.runout_delay
+        )
+    elif args.session_secret:
+        from src.session_tokens import SessionTokens
+
+        tokens = SessionTokens(secret=args.session_secret)
+    stats = LoadStats()
+    stop = asyncio.Event()
+    rng = random.Random(args.seed)
+    seats_to_fill = min(args.clients, max_players)
+    clients = [
+        SimulatedClient(
+            index,
+            url,
+            index if index < max_players else None,
+            stats,
+            stop,
+            random.Random(rng.random()),
+            seats_to_fill if index == 0 else 0,
+            tokens.issue(f"load{index}@loadtest") if tokens else None,
+        )
+        for index in range(args.clients)
+    ]
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    started = time.perf_counter()
+    await _watch(stats, stop, args.hands, args.duration)
+    stats.elapsed = time.perf_counter() - started
+    if server is not None:
+        # Clients hang up together; the server's disconnect broadcasts then race
+        # closing sockets. That is teardown noise, not a load result.
+        logging.getLogger("uvicorn.error").setLevel(logging.CRITICAL)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if server is not None:
+        server.should_exit = True
+        await server_task
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the /ws/game WebSocket endpoint.")
+    parser.add_argument("--clients", type=int, default=6)
+    parser.add_argument("--hands", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=60.0, help="stop after this many seconds")
+    parser.add_argument("--url", default=None, help="target a running server instead of starting one")
+    parser.add_argument("--max-players", type=int, default=6, help="seats at the target table (--url)")
+    parser.add_argument("--hand-delay", type=float, default=0.0)
+    parser.add_argument("--runout-delay", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--session-secret",
+        default=os.getenv("SESSION_SECRET"),
+        help="sign client session tokens for --url (the server's SESSION_SECRET)",
+    )
+    args = parser.parse_args()
+    if args.clients < 2:
+        parser.error("--clients must be at least 2")
+
+    stats = asyncio.run(run_load(args))
+    elapsed = stats.elapsed or 1e-9
+    print(
+        f"{args.clients} clients, {stats.hands} hands, {stats.actions} actions "
+        f"in {elapsed:.2f}s ({stats.errors} errors)"
+    )
+    print(
+        "action -> tableState latency: "
+        f"p50={stats.percentile(50) * 1000:.2f}ms "
+        f"p95={stats.percentile(95) * 1000:.2f}ms "
+        f"p99={stats.percentile(99) * 1000:.2f}ms "
+        f"(n={len(stats.latencies)})"
+    )
+    print(
+        f"received: {stats.frames / elapsed:,.0f} frames/s, "
+        f"{stats.bytes / elapsed / 1024:,.1f} KiB/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
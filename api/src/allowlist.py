@@ -3,8 +3,9 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import time
 from dataclasses import dataclass
-from typing import Any, Iterable, List
+from typing import Any, FrozenSet, Iterable, List, Optional
 
 
 def _is_cloud_run() -> bool:
@@ -23,27 +24,78 @@ def _extract_emails(payload: Any) -> List[str]:
 
 @dataclass
 class AllowListStore:
+    """
+    Allowed login emails, held in memory as a normalized frozenset.
+
+    - The first call loads the list; after that `get_allowed_emails` never
+      waits on I/O. Once `refresh_seconds` have passed it returns the current
+      set and starts a background refresh.
+    - Locally a refresh is one `stat`; the file is only re-read when its mtime
+      changed. Firestore re-reads `allows/allowlist` (the shared AsyncClient
+      has no snapshot listeners, so the TTL is the change detection).
+    - A failed refresh keeps the previous list.
+    """
+
     local_path: str | None = None
+    refresh_seconds: float | None = None
 
     def __post_init__(self) -> None:
         self._use_firestore = _is_cloud_run()
+        if self.refresh_seconds is None:
+            self.refresh_seconds = 60.0 if self._use_firestore else 2.0
+        self._emails: Optional[FrozenSet[str]] = None
+        self._mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+        self.reloads = 0
         self._local_path = self.local_path or os.path.abspath(
             os.path.join(os.path.dirname(__file__), "..", "data", "allows.json")
         )
         self._firestore_client = None
         if self._use_firestore:
-            from google.cloud import firestore
+            from . import firestore_client
+
+            # クライアントは earnings と共有する AsyncClient（firestore_client）
+            self._firestore_client = firestore_client
+
+    async def get_allowed_emails(self) -> FrozenSet[str]:
+        if self._emails is None:
+            await self.refresh()
+        elif time.monotonic() - self._checked_at >= self.refresh_seconds and (
+            self._refreshing is None or self._refreshing.done()
+        ):
+            self._refreshing = asyncio.get_running_loop().create_task(self._refresh_in_background())
+        return self._emails
 
-            # デフォルトは "(default)"。別名で作成したDBは FIRESTORE_DATABASE で指定
-            database_id = os.getenv("FIRESTORE_DATABASE", "dragonspoker-game")
-            self._firestore_client = firestore.Client(database=database_id)
+    async def is_allowed(self, email: str | None) -> bool:
+        # 許可リストが空なら全員許可（従来どおり）
+        emails = await self.get_allowed_emails()
+        return not emails or bool(email and email.strip().lower() in emails)
 
-    async def get_allowed_emails(self) -> set[str]:
+    async def refresh(self) -> None:
+        self._checked_at = time.monotonic()
         if self._use_firestore:
-            emails = await asyncio.to_thread(self._get_firestore_emails)
+            emails = await self._get_firestore_emails()
         else:
+            mtime = await asyncio.to_thread(self._local_mtime)
+            if self._emails is not None and mtime == self._mtime:
+                return
             emails = await asyncio.to_thread(self._get_local_emails)
-        return {email.strip().lower() for email in emails if email and email.strip()}
+            self._mtime = mtime
+        self._emails = frozenset(email.strip().lower() for email in emails if email and email.strip())
+        self.reloads += 1
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as exc:
+            print(f"allowlist refresh failed: {exc}")
+
+    def _local_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self._local_path).st_mtime_ns
+        except OSError:
+            return None
 
     def _get_local_emails(self) -> List[str]:
         if not os.path.exists(self._local_path):
@@ -54,9 +106,11 @@ class AllowListStore:
         except (OSError, json.JSONDecodeError):
             return []
 
-    def _get_firestore_emails(self) -> List[str]:
+    async def _get_firestore_emails(self) -> List[str]:
         assert self._firestore_client is not None
-        doc = self._firestore_client.collection("allows").document("allowlist").get()
+        client = self._firestore_client.get_client()
+        async with self._firestore_client.limit():
+            doc = await client.collection("allows").document("allowlist").get()
         if not doc.exists:
             return []
         return _extract_emails(doc.to_dict() or {})
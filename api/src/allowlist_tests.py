@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+_SRC_ROOT = os.path.dirname(__file__)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from allowlist import AllowListStore  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _write(path: str, emails, mtime_ns: int) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({"emails": emails}, handle)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+async def _cached_until_the_file_changes() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "allows.json")
+        _write(path, [" A@Example.com ", ""], 1_000_000_000)
+        store = AllowListStore(local_path=path, refresh_seconds=0.0)
+        _assert_equal(await store.get_allowed_emails(), frozenset({"a@example.com"}))
+        _assert_equal(await store.is_allowed("a@EXAMPLE.com"), True)
+        _assert_equal(await store.is_allowed("b@example.com"), False)
+        await asyncio.sleep(0.01)
+        # Same mtime: the background check does not re-read the file.
+        _assert_equal(store.reloads, 1)
+        _write(path, ["b@example.com"], 2_000_000_000)
+        await store.get_allowed_emails()
+        await asyncio.sleep(0.01)
+        _assert_equal(store.reloads, 2)
+        _assert_equal(await store.is_allowed("b@example.com"), True)
+        _assert_equal(await store.is_allowed("a@example.com"), False)
+
+
+async def _empty_list_allows_everyone() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AllowListStore(local_path=os.path.join(tmp, "missing.json"))
+        _assert_equal(await store.is_allowed("anyone@example.com"), True)
+
+
+def run() -> None:
+    asyncio.run(_cached_until_the_file_changes())
+    asyncio.run(_empty_list_allows_everyone())
+
+
+if __name__ == "__main__":
+    run()
+    print("allowlist_tests: ok")
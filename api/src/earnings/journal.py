@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from .store import DEFAULT_STATS, EarningsUpdate
+
+STAT_FIELDS = tuple(DEFAULT_STATS)
+
+
+class EarningsJournal:
+    """
+    Local earnings storage: a snapshot file plus an append-only delta journal.
+
+    - Totals live in memory; `apply` appends one JSON line per batch to the
+      journal, so a hand costs O(players in it) instead of rewriting every user.
+    - Every `compact_every` batches the aggregate is written to a temp file and
+      `os.replace`d over the snapshot, then the journal is truncated.
+    - A batch written with a `day` also adds to that day's bucket per player;
+      week/month rollups are kept in memory with the days and saved by the
+      next compaction (they can always be rebuilt from the days).
+    - Journal lines carry a sequence number and the snapshot records the last
+      one it includes, so a crash between replace and truncate never double
+      counts. A torn trailing line (crash mid-append) is dropped on load.
+    """
+
+    def __init__(self, snapshot_path: str, compact_every: int = 500, fsync: bool = True) -> None:
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.users: Dict[str, Dict[str, int]] = {}
+        self.buckets: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.seq = 0
+        self.journal_batches = 0
+        self.loaded = False
+
+    def load(self) -> None:
+        self.users = {}
+        self.buckets = {}
+        self.seq = 0
+        self.journal_batches = 0
+        snapshot = self._read_snapshot()
+        for email, stats in snapshot.get("users", {}).items():
+            self.users[email] = {field: int(stats.get(field, 0)) for field in STAT_FIELDS}
+        for email, buckets in snapshot.get("buckets", {}).items():
+            self.buckets[email] = {
+                bucket: {field: int(stats.get(field, 0)) for field in STAT_FIELDS}
+                for bucket, stats in buckets.items()
+            }
+        self.seq = int(snapshot.get("seq", 0))
+        self._replay_journal()
+        self.loaded = True
+        if self.journal_batches >= self.compact_every:
+            self.compact()
+
+    def get(self, email: str) -> Dict[str, int]:
+        return dict(self.users.get(email, DEFAULT_STATS))
+
+    def get_buckets(self, email: str, buckets: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        stored = self.buckets.get(email, {})
+        return {bucket: dict(stored[bucket]) for bucket in buckets if bucket in stored}
+
+    def set_buckets(self, email: str, buckets: Dict[str, Dict[str, int]]) -> None:
+        stored = self.buckets.setdefault(email, {})
+        for bucket, stats in buckets.items():
+            stored[bucket] = {field: int(stats.get(field, 0)) for field in STAT_FIELDS}
+
+    def apply(self, updates: Iterable[EarningsUpdate], day: Optional[str] = None) -> None:
+        batch: List[Dict] = [
+            {"email": u["email"], **{field: int(u[field]) for field in STAT_FIELDS}}
+            for u in updates
+            if u.get("email")
+        ]
+        if not batch:
+            return
+        entry: Dict = {"seq": self.seq + 1, "updates": batch}
+        if day:
+            entry["day"] = day
+        line = json.dumps(entry, ensure_ascii=False)
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        self.seq += 1
+        self.journal_batches += 1
+        self._add(batch, day)
+        if self.journal_batches >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        directory = os.path.dirname(self.snapshot_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".earnings-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(
+                    {"seq": self.seq, "users": self.users, "buckets": self.buckets},
+                    handle,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+                handle.flush()
+                if self.fsync:
+                    os.fsync(handle.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # The snapshot now covers every journal line, so truncation is safe.
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self.journal_batches = 0
+
+    def _add(self, batch: Iterable[Dict], day: Optional[str] = None) -> None:
+        for update in batch:
+            targets = [self.users.setdefault(update["email"], dict(DEFAULT_STATS))]
+            if day:
+                buckets = self.buckets.setdefault(update["email"], {})
+                targets.append(buckets.setdefault(day, dict(DEFAULT_STATS)))
+            for stats in targets:
+                for field in STAT_FIELDS:
+                    stats[field] += int(update.get(field, 0))
+
+    def _read_snapshot(self) -> Dict:
+        if not os.path.exists(self.snapshot_path):
+            return {"users": {}}
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as handle:
+                return json.load(handle) or {"users": {}}
+        except (OSError, json.JSONDecodeError):
+            return {"users": {}}
+
+    def _replay_journal(self) -> None:
+        if not os.path.exists(self.journal_path):
+            return
+        good_bytes = 0
+        with open(self.journal_path, "rb") as handle:
+            for raw in handle:
+                try:
+                    entry = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if not raw.endswith(b"\n"):
+                    break
+                good_bytes += len(raw)
+                seq = int(entry.get("seq", 0))
+                if seq <= self.seq:
+                    continue
+                self._add(entry.get("updates", []), entry.get("day"))
+                self.seq = seq
+                self.journal_batches += 1
+        if good_bytes != os.path.getsize(self.journal_path):
+            # Drop the torn tail so later appends start on a clean line.
+            with open(self.journal_path, "r+b") as handle:
+                handle.truncate(good_bytes)
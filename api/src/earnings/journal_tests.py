@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from earnings.journal import EarningsJournal  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _update(email: str, chips: int) -> dict:
+    return {
+        "email": email,
+        "hands": 1,
+        "chips_delta": chips,
+        "hands_69_92": 0,
+        "chips_delta_69_92": 0,
+    }
+
+
+def _reopen(path: str, compact_every: int = 100) -> EarningsJournal:
+    journal = EarningsJournal(path, compact_every=compact_every, fsync=False)
+    journal.load()
+    return journal
+
+
+def _journal_survives_restart_and_torn_tail() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "earnings.json")
+        journal = _reopen(path)
+        journal.apply([_update("a@example.com", 10), _update("b@example.com", -10)])
+        journal.apply([_update("a@example.com", 5)])
+        # Crash mid-append: half a line at the end of the journal.
+        with open(journal.journal_path, "a", encoding="utf-8") as handle:
+            handle.write('{"seq": 3, "updates": [{"email": "a@exa')
+        journal = _reopen(path)
+        _assert_equal(journal.get("a@example.com")["chips_delta"], 15)
+        _assert_equal(journal.get("a@example.com")["hands"], 2)
+        _assert_equal(journal.get("b@example.com")["chips_delta"], -10)
+        _assert_equal(journal.get("nobody@example.com")["hands"], 0)
+        journal.apply([_update("a@example.com", 1)])
+        _assert_equal(_reopen(path).get("a@example.com")["chips_delta"], 16)
+
+
+def _compaction_writes_snapshot_and_never_double_counts() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "earnings.json")
+        journal = _reopen(path, compact_every=3)
+        for _ in range(3):
+            journal.apply([_update("a@example.com", 2)])
+        with open(path, "r", encoding="utf-8") as handle:
+            snapshot = json.load(handle)
+        _assert_equal(snapshot["users"]["a@example.com"]["chips_delta"], 6)
+        _assert_equal(os.path.getsize(journal.journal_path), 0)
+        journal.apply([_update("a@example.com", 2)])
+        journal_lines = open(journal.journal_path, encoding="utf-8").read()
+        # Crash after the snapshot replace but before the journal truncate.
+        journal.compact()
+        with open(journal.journal_path, "w", encoding="utf-8") as handle:
+            handle.write(journal_lines)
+        _assert_equal(_reopen(path).get("a@example.com")["chips_delta"], 8)
+        _assert_equal([name for name in os.listdir(tmp) if name.endswith(".tmp")], [])
+
+
+def _legacy_snapshot_is_loaded() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "earnings.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"users": {"a@example.com": {"hands": 4, "chips_delta": 40}}}, handle)
+        journal = _reopen(path)
+        journal.apply([_update("a@example.com", 1)])
+        _assert_equal(_reopen(path).get("a@example.com")["chips_delta"], 41)
+        _assert_equal(_reopen(path).get("a@example.com")["hands_69_92"], 0)
+
+
+def run() -> None:
+    _journal_survives_restart_and_torn_tail()
+    _compaction_writes_snapshot_and_never_double_counts()
+    _legacy_snapshot_is_loaded()
+
+
+if __name__ == "__main__":
+    run()
+    print("journal_tests: ok")
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .store import DEFAULT_STATS
+
+LEADERBOARD_COLUMNS = tuple(DEFAULT_STATS)
+
+
+class Leaderboard:
+    """
+    Players ranked by every stats column, kept sorted as totals change.
+
+    - `update` takes a player's new totals and moves them in each column's
+      sorted index (binary search), so a hand costs O(log n) searches per
+      player and `page` is a slice: O(page size) however many users exist.
+    - Ties rank by email so pages are stable.
+    - `top` is what gets persisted for backends that cannot be listed cheaply
+      (Firestore): only tracked players are ranked, and anyone outside it
+      rejoins the board the next time they play a hand.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[str, Dict[str, int]] = {column: {} for column in LEADERBOARD_COLUMNS}
+        self._order: Dict[str, List[Tuple[int, str]]] = {column: [] for column in LEADERBOARD_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self._values[LEADERBOARD_COLUMNS[0]])
+
+    def update(self, email: str, stats: Mapping[str, int]) -> None:
+        for column in LEADERBOARD_COLUMNS:
+            values = self._values[column]
+            order = self._order[column]
+            value = int(stats.get(column, 0))
+            previous = values.get(email)
+            if previous == value:
+                continue
+            if previous is not None:
+                del order[bisect_left(order, (-previous, email))]
+            values[email] = value
+            insort(order, (-value, email))
+
+    def totals(self, email: str) -> Optional[Dict[str, int]]:
+        """`email`'s value in every column, or None unless it is ranked in all of them."""
+        found: Dict[str, int] = {}
+        for column in LEADERBOARD_COLUMNS:
+            value = self._values[column].get(email)
+            if value is None:
+                return None
+            found[column] = value
+        return found
+
+    def update_many(self, totals: Mapping[str, Mapping[str, int]]) -> None:
+        for email, stats in totals.items():
+            self.update(email, stats)
+
+    def page(self, column: str, offset: int = 0, limit: int = 20) -> List[Dict]:
+        order = self._order_for(column)
+        return [
+            {"rank": offset + i + 1, "email": email, "value": -negated}
+            for i, (negated, email) in enumerate(order[offset : offset + limit])
+        ]
+
+    def top(self, column: str, count: int) -> List[Dict]:
+        return [{"email": entry["email"], "value": entry["value"]} for entry in self.page(column, 0, count)]
+
+    def load_top(self, column: str, entries: Iterable[Mapping]) -> None:
+        order = self._order_for(column)
+        values = self._values[column]
+        for entry in entries:
+            email = entry.get("email")
+            if not email or email in values:
+                continue
+            value = int(entry.get("value", 0))
+            values[email] = value
+            insort(order, (-value, email))
+
+    def _order_for(self, column: str) -> List[Tuple[int, str]]:
+        order = self._order.get(column)
+        if order is None:
+            raise ValueError(f"Unknown leaderboard column: {column}")
+        return order
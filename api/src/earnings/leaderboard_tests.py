@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from earnings.leaderboard import Leaderboard  # noqa: E402
+from earnings.store import EarningsStore  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _update(email: str, chips: int) -> dict:
+    return {
+        "email": email,
+        "hands": 1,
+        "chips_delta": chips,
+        "hands_69_92": 0,
+        "chips_delta_69_92": 0,
+    }
+
+
+def _board_matches_full_sort_under_random_updates() -> None:
+    rng = random.Random(7)
+    board = Leaderboard()
+    totals = {}
+    for _ in range(2000):
+        email = f"p{rng.randrange(50)}@example.com"
+        stats = totals.setdefault(email, {"hands": 0, "chips_delta": 0})
+        stats["hands"] += 1
+        stats["chips_delta"] += rng.randint(-100, 100)
+        board.update(email, stats)
+    expected = sorted(totals.items(), key=lambda item: (-item[1]["chips_delta"], item[0]))
+    page = board.page("chips_delta", 10, 5)
+    _assert_equal([entry["email"] for entry in page], [email for email, _ in expected[10:15]])
+    _assert_equal(page[0]["rank"], 11)
+    _assert_equal(page[0]["value"], expected[10][1]["chips_delta"])
+    _assert_equal(len(board), 50)
+    try:
+        board.page("nope")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown column should be rejected")
+
+
+async def _store_keeps_leaderboard_current() -> None:
+    for backend in ("local", "sqlite"):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {
+                "local_path": os.path.join(tmp, "earnings.json"),
+                "sqlite_path": os.path.join(tmp, "earnings.sqlite3"),
+            }
+            store = EarningsStore(backend=backend, leaderboard_persist_size=2, **paths)
+            await store.apply_updates([_update("a@example.com", 10), _update("b@example.com", -10)])
+            await store.apply_updates([_update("b@example.com", 30), _update("c@example.com", 5)])
+            entries = await store.leaderboard_page("chips_delta")
+            # A top-N board: c is ranked but outside the top 2.
+            _assert_equal(
+                [(e["email"], e["value"]) for e in entries],
+                [("b@example.com", 20), ("a@example.com", 10)],
+            )
+            _assert_equal(await store.leaderboard_page("chips_delta", 2), [])
+            store.close()
+            # A fresh process seeds the board from storage.
+            reopened = EarningsStore(backend=backend, **paths)
+            entries = await reopened.leaderboard_page("hands", 0, 1)
+            _assert_equal(entries, [{"rank": 1, "email": "b@example.com", "value": 2}])
+            reopened.close()
+
+
+async def _leaderboard_refresh_does_not_read_back() -> None:
+    for backend in ("local", "sqlite"):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EarningsStore(
+                backend=backend,
+                local_path=os.path.join(tmp, "earnings.json"),
+                sqlite_path=os.path.join(tmp, "earnings.sqlite3"),
+                cache_size=0,
+            )
+            await store.apply_updates([_update("a@example.com", 10)])  # seeds the board
+
+            async def no_reads(emails):
+                raise AssertionError(f"unexpected read of {emails}")
+
+            store._read_many = no_reads
+            await store.apply_updates([_update("a@example.com", 5), _update("d@example.com", -3)])
+            entries = await store.leaderboard_page("chips_delta")
+            _assert_equal(
+                [(e["email"], e["value"]) for e in entries],
+                [("a@example.com", 15), ("d@example.com", -3)],
+            )
+            _assert_equal((store.cache_hits, store.cache_misses), (0, 0))
+            _assert_equal(await store.save_leaderboard(), False)  # only Firestore persists the top
+            store.close()
+
+
+def run() -> None:
+    _board_matches_full_sort_under_random_updates()
+    asyncio.run(_store_keeps_leaderboard_current())
+    asyncio.run(_leaderboard_refresh_does_not_read_back())
+
+
+if __name__ == "__main__":
+    run()
+    print("leaderboard_tests: ok")
@@ -0,0 +1,89 @@
+"""
+Calendar buckets for per-player earnings.
+
+Every write adds to the player's day bucket; closed ISO weeks and calendar
+months are rolled up from their days once (in the background, or on the first
+range query that needs them) and stored as their own buckets. The key formats
+never collide, so all three live side by side:
+
+    day   2026-10-19
+    week  2026-W43
+    month 2026-10
+"""
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta
+from typing import List
+from zoneinfo import ZoneInfo
+
+# 日付の区切りは日本時間（EARNINGS_TIMEZONE で変更可）
+EARNINGS_TIMEZONE = ZoneInfo(os.getenv("EARNINGS_TIMEZONE", "Asia/Tokyo"))
+
+
+def today() -> date:
+    return datetime.now(EARNINGS_TIMEZONE).date()
+
+
+def day_key(day: date) -> str:
+    return day.isoformat()
+
+
+def week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(day: date) -> str:
+    return f"{day.year}-{day.month:02d}"
+
+
+def is_rollup(bucket: str) -> bool:
+    return len(bucket) != 10
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def rollup_days(bucket: str) -> List[str]:
+    """Day keys a week or month bucket is made of."""
+    if "-W" in bucket:
+        year, week = bucket.split("-W")
+        first = date.fromisocalendar(int(year), int(week), 1)
+        return [day_key(first + timedelta(days=i)) for i in range(7)]
+    year, month = bucket.split("-")
+    first = date(int(year), int(month), 1)
+    count = (_next_month(first) - first).days
+    return [day_key(first + timedelta(days=i)) for i in range(count)]
+
+
+def rollup_closed(bucket: str, current: date) -> bool:
+    """True once every day of the week/month is before `current`."""
+    return rollup_days(bucket)[-1] < day_key(current)
+
+
+def plan_range(start: date, end: date, current: date) -> List[str]:
+    """
+    Fewest buckets covering [start, end]: closed months, then closed weeks,
+    then single days for the edges and the still-open week.
+    """
+    if end < start:
+        raise ValueError("end must not be before start")
+    buckets: List[str] = []
+    day = start
+    while day <= end:
+        month_end = _next_month(day) - timedelta(days=1)
+        if day.day == 1 and month_end <= end and month_end < current:
+            buckets.append(month_key(day))
+            day = month_end + timedelta(days=1)
+            continue
+        week_end = day + timedelta(days=6)
+        if day.weekday() == 0 and week_end <= end and week_end < current:
+            buckets.append(week_key(day))
+            day = week_end + timedelta(days=1)
+            continue
+        buckets.append(day_key(day))
+        day += timedelta(days=1)
+    return buckets
+
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from earnings import rollups  # noqa: E402
+from earnings.store import EarningsStore  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _update(email: str, chips: int) -> dict:
+    return {
+        "email": email,
+        "hands": 1,
+        "chips_delta": chips,
+        "hands_69_92": 0,
+        "chips_delta_69_92": 0,
+    }
+
+
+def _plan_uses_closed_months_and_weeks() -> None:
+    plan = rollups.plan_range(date(2026, 8, 1), date(2026, 10, 19), current=date(2026, 10, 19))
+    _assert_equal(
+        plan,
+        ["2026-08", "2026-09", "2026-10-01", "2026-10-02", "2026-10-03", "2026-10-04",
+         "2026-W41", "2026-W42", "2026-10-19"],
+    )
+    # The current month and week stay on days until they close.
+    _assert_equal(
+        rollups.plan_range(date(2026, 10, 12), date(2026, 10, 18), current=date(2026, 10, 15)),
+        [f"2026-10-{day}" for day in range(12, 19)],
+    )
+    _assert_equal(len(rollups.rollup_days("2026-02")), 28)
+    _assert_equal(rollups.rollup_days("2026-W42")[0], "2026-10-12")
+    try:
+        rollups.plan_range(date(2026, 10, 2), date(2026, 10, 1), current=date(2026, 10, 19))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("reversed range should be rejected")
+
+
+async def _range_reads_rollups_for_every_backend() -> None:
+    real_today = rollups.today
+    try:
+        for backend in ("local", "sqlite"):
+            with tempfile.TemporaryDirectory() as tmp:
+                store = EarningsStore(
+                    backend=backend,
+                    local_path=os.path.join(tmp, "earnings.json"),
+                    sqlite_path=os.path.join(tmp, "earnings.sqlite3"),
+                )
+                for day, chips in ((date(2026, 9, 2), 10), (date(2026, 9, 30), -3), (date(2026, 10, 13), 7)):
+                    rollups.today = lambda day=day: day
+                    await store.apply_updates([_update("a@example.com", chips)])
+                    await store.apply_updates([_update("a@example.com", chips)])
+                rollups.today = lambda: date(2026, 10, 19)
+                # W36, W40, September and W42 have closed; October is still open.
+                _assert_equal(await store.compact_rollups(), 4)
+                _assert_equal(list(store._open_rollups), ["2026-10"])
+                _assert_equal(
+                    (await store._read_buckets("a@example.com", ["2026-09"]))["2026-09"]["chips_delta"],
+                    14,
+                )
+                stats, buckets = await store.get_range("a@example.com", date(2026, 8, 1), date(2026, 10, 19))
+                _assert_equal((stats["hands"], stats["chips_delta"]), (6, 28))
+                _assert_equal(len(buckets), 9)
+                stats, _ = await store.get_range("a@example.com", date(2026, 9, 30), date(2026, 10, 12))
+                _assert_equal((stats["hands"], stats["chips_delta"]), (2, -6))
+                store.close()
+    finally:
+        rollups.today = real_today
+
+
+def run() -> None:
+    _plan_uses_closed_months_and_weeks()
+    asyncio.run(_range_reads_rollups_for_every_backend())
+
+
+if __name__ == "__main__":
+    run()
+    print("rollups_tests: ok")
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .store import DEFAULT_STATS, EarningsUpdate
+
+STAT_FIELDS = tuple(DEFAULT_STATS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS earnings (
+    email TEXT PRIMARY KEY,
+    hands INTEGER NOT NULL DEFAULT 0,
+    chips_delta INTEGER NOT NULL DEFAULT 0,
+    hands_69_92 INTEGER NOT NULL DEFAULT 0,
+    chips_delta_69_92 INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+_BUCKET_SCHEMA = """
+CREATE TABLE IF NOT EXISTS earnings_buckets (
+    email TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    hands INTEGER NOT NULL DEFAULT 0,
+    chips_delta INTEGER NOT NULL DEFAULT 0,
+    hands_69_92 INTEGER NOT NULL DEFAULT 0,
+    chips_delta_69_92 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (email, bucket)
+) WITHOUT ROWID
+"""
+_INSERT = "INSERT OR IGNORE INTO earnings (email) VALUES (?)"
+_UPDATE = (
+    "UPDATE earnings SET "
+    + ", ".join(f"{field} = {field} + ?" for field in STAT_FIELDS)
+    + ", updated_at = CURRENT_TIMESTAMP WHERE email = ?"
+)
+_SELECT = "SELECT " + ", ".join(STAT_FIELDS) + " FROM earnings WHERE email = ?"
+_INSERT_BUCKET = "INSERT OR IGNORE INTO earnings_buckets (email, bucket) VALUES (?, ?)"
+_UPDATE_BUCKET = (
+    "UPDATE earnings_buckets SET "
+    + ", ".join(f"{field} = {field} + ?" for field in STAT_FIELDS)
+    + " WHERE email = ? AND bucket = ?"
+)
+_REPLACE_BUCKET = (
+    "INSERT OR REPLACE INTO earnings_buckets (email, bucket, "
+    + ", ".join(STAT_FIELDS)
+    + ") VALUES (?, ?, "
+    + ", ".join("?" for _ in STAT_FIELDS)
+    + ")"
+)
+
+# (updates, day bucket or None, rollups to store as {email: {bucket: stats}}, done)
+_Job = Tuple[List[EarningsUpdate], Optional[str], Dict[str, Dict[str, Dict[str, int]]], Future]
+
+
+class SqliteEarnings:
+    """
+    Earnings rows in SQLite (WAL mode), one row per email.
+
+    - All writes go through one connection owned by a writer thread. Batches
+      that queue up while a transaction commits are written together in the
+      next one (`x = x + ?` per field), so commits stay cheap under load.
+    - Readers use their own per-thread connections; with WAL they never wait
+      on the writer.
+    """
+
+    def __init__(self, path: str, max_batches_per_commit: int = 256) -> None:
+        self.path = path
+        self.max_batches_per_commit = max_batches_per_commit
+        self.commits = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._readers = threading.local()
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._writer_ready = threading.Event()
+        self._writer_error: Optional[BaseException] = None
+        self._writer = threading.Thread(target=self._write_loop, name="earnings-sqlite", daemon=True)
+        self._writer.start()
+        self._writer_ready.wait()
+        if self._writer_error is not None:
+            raise self._writer_error
+
+    async def apply_updates(self, updates: Iterable[EarningsUpdate], day: Optional[str] = None) -> None:
+        await asyncio.wrap_future(self.submit(updates, day))
+
+    def submit(self, updates: Iterable[EarningsUpdate], day: Optional[str] = None) -> Future:
+        batch = [u for u in updates if u.get("email")]
+        return self._enqueue(batch, day, {})
+
+    async def set_buckets(self, email: str, buckets: Dict[str, Dict[str, int]]) -> None:
+        await asyncio.wrap_future(self._enqueue([], None, {email: buckets}))
+
+    async def get_buckets(self, email: str, buckets: List[str]) -> Dict[str, Dict[str, int]]:
+        return await asyncio.to_thread(self.read_buckets, email, buckets)
+
+    def read_buckets(self, email: str, buckets: List[str]) -> Dict[str, Dict[str, int]]:
+        if not buckets:
+            return {}
+        placeholders = ", ".join("?" for _ in buckets)
+        rows = self._reader().execute(
+            f"SELECT bucket, {', '.join(STAT_FIELDS)} FROM earnings_buckets "
+            f"WHERE email = ? AND bucket IN ({placeholders})",
+            [email, *buckets],
+        )
+        return {
+            bucket: {field: int(value) for field, value in zip(STAT_FIELDS, values)}
+            for bucket, *values in rows
+        }
+
+    def _enqueue(
+        self,
+        batch: List[EarningsUpdate],
+        day: Optional[str],
+        rollups: Dict[str, Dict[str, Dict[str, int]]],
+    ) -> Future:
+        done: Future = Future()
+        if not batch and not rollups:
+            done.set_result(None)
+            return done
+        if not self._writer.is_alive():
+            raise RuntimeError("earnings sqlite writer is closed")
+        self._jobs.put((batch, day, rollups, done))
+        return done
+
+    async def get(self, email: str) -> Dict[str, int]:
+        return await asyncio.to_thread(self.read, email)
+
+    def read(self, email: str) -> Dict[str, int]:
+        row = self._reader().execute(_SELECT, (email,)).fetchone()
+        if row is None:
+            return dict(DEFAULT_STATS)
+        return {field: int(value) for field, value in zip(STAT_FIELDS, row)}
+
+    async def get_many(self, emails: List[str]) -> Dict[str, Dict[str, int]]:
+        return await asyncio.to_thread(self.read_many, emails)
+
+    def read_many(self, emails: List[str]) -> Dict[str, Dict[str, int]]:
+        found = {email: dict(DEFAULT_STATS) for email in emails}
+        if not emails:
+            return found
+        placeholders = ", ".join("?" for _ in emails)
+        rows = self._reader().execute(
+            f"SELECT email, {', '.join(STAT_FIELDS)} FROM earnings WHERE email IN ({placeholders})",
+            list(emails),
+        )
+        for email, *values in rows:
+            found[email] = {field: int(value) for field, value in zip(STAT_FIELDS, values)}
+        return found
+
+    def read_all(self) -> Dict[str, Dict[str, int]]:
+        rows = self._reader().execute(f"SELECT email, {', '.join(STAT_FIELDS)} FROM earnings")
+        return {
+            email: {field: int(value) for field, value in zip(STAT_FIELDS, values)}
+            for email, *values in rows
+        }
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._jobs.put(None)
+            self._writer.join()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only = ON")
+            self._readers.conn = conn
+        return conn
+
+    def _write_loop(self) -> None:
+        try:
+            conn = self._connect()
+            conn.execute("PRAGMA journal_mode = WAL")
+            # WAL + NORMAL: a power loss may drop the last commits, but never
+            # corrupts the database.
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(_SCHEMA)
+            conn.execute(_BUCKET_SCHEMA)
+        except BaseException as exc:
+            self._writer_error = exc
+            self._writer_ready.set()
+            return
+        self._writer_ready.set()
+        stopping = False
+        while not stopping:
+            jobs = [self._jobs.get()]
+            while len(jobs) < self.max_batches_per_commit:
+                try:
+                    jobs.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            if None in jobs:
+                stopping = True
+                jobs = [job for job in jobs if job is not None]
+            if jobs:
+                self._commit(conn, jobs)
+        conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, jobs: List[_Job]) -> None:
+        updates = [update for batch, _, _, _ in jobs for update in batch]
+        day_updates = [(update, day) for batch, day, _, _ in jobs if day for update in batch]
+        rollups = [
+            (email, bucket, stats)
+            for _, _, job_rollups, _ in jobs
+            for email, buckets in job_rollups.items()
+            for bucket, stats in buckets.items()
+        ]
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_INSERT, [(u["email"],) for u in updates])
+            conn.executemany(
+                _UPDATE,
+                [tuple(int(u[field]) for field in STAT_FIELDS) + (u["email"],) for u in updates],
+            )
+            conn.executemany(_INSERT_BUCKET, [(u["email"], day) for u, day in day_updates])
+            conn.executemany(
+                _UPDATE_BUCKET,
+                [
+                    tuple(int(u[field]) for field in STAT_FIELDS) + (u["email"], day)
+                    for u, day in day_updates
+                ],
+            )
+            conn.executemany(
+                _REPLACE_BUCKET,
+                [
+                    (email, bucket, *(int(stats.get(field, 0)) for field in STAT_FIELDS))
+                    for email, bucket, stats in rollups
+                ],
+            )
+            conn.execute("COMMIT")
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for *_, done in jobs:
+                done.set_exception(exc)
+            return
+        self.commits += 1
+        for *_, done in jobs:
+            done.set_result(None)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from earnings.store import EarningsStore  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _update(email: str, chips: int) -> dict:
+    return {
+        "email": email,
+        "hands": 1,
+        "chips_delta": chips,
+        "hands_69_92": 1,
+        "chips_delta_69_92": chips,
+    }
+
+
+async def _concurrent_batches_add_up() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "earnings.sqlite3")
+        store = EarningsStore(backend="sqlite", sqlite_path=path)
+        hands = [
+            store.apply_updates([_update("a@example.com", 3), _update("b@example.com", -3)])
+            for _ in range(200)
+        ]
+        await asyncio.gather(*hands, store.get("a@example.com"))
+        _assert_equal(
+            await store.get("a@example.com"),
+            {"hands": 200, "chips_delta": 600, "hands_69_92": 200, "chips_delta_69_92": 600},
+        )
+        _assert_equal((await store.get("nobody@example.com"))["hands"], 0)
+        if store._sqlite.commits >= 200:
+            raise AssertionError("queued batches were not grouped into shared commits")
+        store.close()
+        reopened = EarningsStore(backend="sqlite", sqlite_path=path)
+        _assert_equal((await reopened.get("b@example.com"))["chips_delta"], -600)
+        reopened.close()
+
+
+def _unknown_backend_is_rejected() -> None:
+    try:
+        EarningsStore(backend="nope")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown backend should be rejected")
+
+
+def run() -> None:
+    asyncio.run(_concurrent_batches_add_up())
+    _unknown_backend_is_rejected()
+
+
+if __name__ == "__main__":
+    run()
+    print("sqlite_backend_tests: ok")
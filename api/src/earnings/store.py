@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, TypedDict
+from datetime import date
+from typing import TYPE_CHECKING, Dict, Iterable, List, NotRequired, Set, Tuple, TypedDict
+
+from . import rollups
+
+if TYPE_CHECKING:
+    from .leaderboard import Leaderboard
 
 
 class EarningsUpdate(TypedDict):
@@ -13,6 +20,8 @@ class EarningsUpdate(TypedDict):
     chips_delta: int
     hands_69_92: int
     chips_delta_69_92: int
+    # EARNINGS_TIMEZONE day the hand settled (`rollups.day_key`); today if absent.
+    day: NotRequired[str]
 
 
 DEFAULT_STATS = {
@@ -27,117 +36,449 @@ def _is_cloud_run() -> bool:
     return bool(os.getenv("K_SERVICE") or os.getenv("K_REVISION"))
 
 
+EARNINGS_BACKENDS = ("firestore", "local", "sqlite")
+
+
+def _default_backend() -> str:
+    backend = os.getenv("EARNINGS_BACKEND", "").strip().lower()
+    if not backend:
+        return "firestore" if _is_cloud_run() else "local"
+    if backend not in EARNINGS_BACKENDS:
+        raise ValueError(f"Unknown EARNINGS_BACKEND: {backend}")
+    return backend
+
+
+def _stats_from_doc(doc) -> Dict[str, int]:
+    if not doc.exists:
+        return dict(DEFAULT_STATS)
+    data = doc.to_dict() or {}
+    return {
+        "hands": int(data.get("hands", 0)),
+        "chips_delta": int(data.get("chips_delta", 0)),
+        "hands_69_92": int(data.get("hands_69_92", 0)),
+        "chips_delta_69_92": int(data.get("chips_delta_69_92", 0)),
+    }
+
+
+def _sum_stats(items: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    total = dict(DEFAULT_STATS)
+    for item in items:
+        for field in DEFAULT_STATS:
+            total[field] += int(item.get(field, 0))
+    return total
+
+
 @dataclass
 class EarningsStore:
     local_path: str | None = None
+    backend: str | None = None
+    sqlite_path: str | None = None
+    # Read-through LRU of per-email stats. Writes from this process update cached
+    # entries in place; Firestore entries also expire after `firestore_cache_ttl`
+    # because other instances write the same documents.
+    cache_size: int = 1024
+    firestore_cache_ttl: float = 30.0
+    # Ranks served per leaderboard column: a top-N board on every backend, since
+    # Firestore only persists these N (saved by `save_leaderboard`, on a timer
+    # and at shutdown) and other players rejoin it when they next play.
+    leaderboard_persist_size: int = 200
 
     def __post_init__(self) -> None:
         self._lock = asyncio.Lock()
-        self._use_firestore = _is_cloud_run()
-        self._local_path = self.local_path or os.path.abspath(
-            os.path.join(os.path.dirname(__file__), "..", "..", "data", "earnings.json")
-        )
+        self._cache: "OrderedDict[str, Tuple[Dict[str, int], float]]" = OrderedDict()
+        self._write_generation = 0
+        self._writes_in_flight = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._leaderboard: Leaderboard | None = None
+        self._leaderboard_lock = asyncio.Lock()
+        self._leaderboard_dirty = False
+        # Week/month buckets written to since startup, rolled up once they close.
+        self._open_rollups: Dict[str, Set[str]] = {}
+        self.backend = self.backend or _default_backend()
+        if self.backend not in EARNINGS_BACKENDS:
+            raise ValueError(f"Unknown earnings backend: {self.backend}")
+        self._use_firestore = self.backend == "firestore"
+        data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data"))
+        self._local_path = self.local_path or os.path.join(data_dir, "earnings.json")
         self._firestore_client = None
+        self._journal = None
+        self._sqlite = None
+        if self.backend == "sqlite":
+            from .sqlite_backend import SqliteEarnings
+
+            # セルフホスト向け: SQLite(WAL)。パスは EARNINGS_SQLITE_PATH で変更可
+            self._sqlite = SqliteEarnings(
+                self.sqlite_path
+                or os.getenv("EARNINGS_SQLITE_PATH")
+                or os.path.join(data_dir, "earnings.sqlite3")
+            )
+        elif self.backend == "local":
+            from .journal import EarningsJournal
+
+            # ローカルは追記型ジャーナル + 定期コンパクション（毎ハンド全体を書き直さない）
+            self._journal = EarningsJournal(self._local_path)
         if self._use_firestore:
-            from google.cloud import firestore
+            from .. import firestore_client
 
-            self._firestore = firestore
-            # デフォルトは "(default)"。別名で作成したDBは FIRESTORE_DATABASE で指定
-            database_id = os.getenv("FIRESTORE_DATABASE", "dragonspoker-game")
-            self._firestore_client = firestore.Client(database=database_id)
+            # クライアントは allowlist と共有する AsyncClient（firestore_client）
+            # google.cloud.firestore の import とクライアント生成は初回使用時まで遅らせる
+            self._firestore_client = firestore_client
+
+    @property
+    def _firestore(self):
+        return self._firestore_client.module()
 
     async def get(self, email: str) -> Dict[str, int]:
-        if self._use_firestore:
-            return await asyncio.to_thread(self._get_firestore, email)
-        async with self._lock:
-            return await asyncio.to_thread(self._get_local, email)
+        cached = self._cache.get(email)
+        if cached is not None:
+            stats, loaded_at = cached
+            if not self._use_firestore or time.monotonic() - loaded_at < self.firestore_cache_ttl:
+                self._cache.move_to_end(email)
+                self.cache_hits += 1
+                return dict(stats)
+            del self._cache[email]
+        self.cache_misses += 1
+        token = self._cache_token()
+        stats = await self._read(email)
+        if self._cache_token_valid(token):
+            self._remember(email, stats)
+        return stats
+
+    def _cache_token(self) -> int | None:
+        # While a write is in flight a read may or may not include it, and the
+        # write will add its deltas to cached entries when it finishes: never
+        # cache such a read. The same goes for writes that start mid-read.
+        return None if self._writes_in_flight else self._write_generation
+
+    def _cache_token_valid(self, token: int | None) -> bool:
+        return token is not None and token == self._write_generation
+
+    def _remember(self, email: str, stats: Dict[str, int]) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[email] = (dict(stats), time.monotonic())
+        self._cache.move_to_end(email)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def get_many(self, emails: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Stats for several emails with at most one storage round trip for the misses."""
+        found: Dict[str, Dict[str, int]] = {}
+        missing: List[str] = []
+        now = time.monotonic()
+        for email in dict.fromkeys(emails):
+            cached = self._cache.get(email)
+            if cached is not None and (
+                not self._use_firestore or now - cached[1] < self.firestore_cache_ttl
+            ):
+                self._cache.move_to_end(email)
+                self.cache_hits += 1
+                found[email] = dict(cached[0])
+            else:
+                missing.append(email)
+        if not missing:
+            return found
+        self.cache_misses += len(missing)
+        token = self._cache_token()
+        loaded = await self._read_many(missing)
+        cacheable = self._cache_token_valid(token)
+        for email in missing:
+            stats = loaded.get(email, dict(DEFAULT_STATS))
+            found[email] = stats
+            if cacheable:
+                self._remember(email, stats)
+        return found
 
     async def apply_updates(self, updates: Iterable[EarningsUpdate]) -> None:
         updates_list = [u for u in updates if u.get("email")]
         if not updates_list:
             return
+        board_ready = self._leaderboard is not None
+        # Each delta goes to the day it was stamped with, not the day it is written.
+        by_day: Dict[str, List[EarningsUpdate]] = {}
+        today_key = rollups.day_key(rollups.today())
+        for update in updates_list:
+            by_day.setdefault(update.get("day") or today_key, []).append(update)
+        for day, group in by_day.items():
+            settled = date.fromisoformat(day)
+            for bucket in (rollups.week_key(settled), rollups.month_key(settled)):
+                self._open_rollups.setdefault(bucket, set()).update(u["email"] for u in group)
+        # See `_cache_token`: no read overlapping this write gets cached.
+        self._write_generation += 1
+        self._writes_in_flight += 1
+        try:
+            for day, group in by_day.items():
+                await self._write(group, day)
+        except BaseException:
+            for update in updates_list:
+                self._cache.pop(update["email"], None)
+            raise
+        finally:
+            self._writes_in_flight -= 1
+            self._write_generation += 1
+        for update in updates_list:
+            cached = self._cache.get(update["email"])
+            if cached is not None:
+                for field in DEFAULT_STATS:
+                    cached[0][field] += int(update[field])
+        try:
+            await self._update_leaderboard(updates_list, board_ready)
+        except Exception as exc:
+            # 書き込み自体は成功しているので、ランキング更新の失敗で再送させない
+            print(f"leaderboard update failed: {exc}")
+
+    async def get_range(self, email: str, start: date, end: date) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Stats for `email` from `start` to `end` (inclusive, EARNINGS_TIMEZONE days)
+        and the buckets that were read: closed months/weeks plus edge days.
+        """
+        plan = rollups.plan_range(start, end, rollups.today())
+        found = await self._read_buckets(email, plan)
+        missing = [bucket for bucket in plan if rollups.is_rollup(bucket) and bucket not in found]
+        if missing:
+            found.update(await self._roll_up(email, missing))
+        return _sum_stats(found.get(bucket, DEFAULT_STATS) for bucket in plan), plan
+
+    async def compact_rollups(self) -> int:
+        """Roll up weeks/months that closed since they were written to; returns rollups stored."""
+        current = rollups.today()
+        stored = 0
+        for bucket in [b for b in self._open_rollups if rollups.rollup_closed(b, current)]:
+            for email in self._open_rollups.pop(bucket):
+                await self._roll_up(email, [bucket])
+                stored += 1
+        return stored
+
+    async def _roll_up(self, email: str, buckets: List[str]) -> Dict[str, Dict[str, int]]:
+        # 閉じた週・月を日別バケットから集計して保存する（以降はこの1件を読むだけ）
+        days = {bucket: rollups.rollup_days(bucket) for bucket in buckets}
+        found = await self._read_buckets(email, [day for keys in days.values() for day in keys])
+        totals = {
+            bucket: _sum_stats(found.get(day, DEFAULT_STATS) for day in keys)
+            for bucket, keys in days.items()
+        }
+        await self._write_rollups(email, totals)
+        return totals
+
+    async def _read_buckets(self, email: str, buckets: List[str]) -> Dict[str, Dict[str, int]]:
+        if self._sqlite is not None:
+            return await self._sqlite.get_buckets(email, buckets)
         if self._use_firestore:
-            await asyncio.to_thread(self._apply_updates_firestore, updates_list)
-            return
+            return await self._get_buckets_firestore(email, buckets)
         async with self._lock:
-            await asyncio.to_thread(self._apply_updates_local, updates_list)
-
-    def _get_local(self, email: str) -> Dict[str, int]:
-        data = self._read_local_data()
-        users = data.get("users", {})
-        stats = users.get(email, {})
-        return {
-            "hands": int(stats.get("hands", 0)),
-            "chips_delta": int(stats.get("chips_delta", 0)),
-            "hands_69_92": int(stats.get("hands_69_92", 0)),
-            "chips_delta_69_92": int(stats.get("chips_delta_69_92", 0)),
-        }
+            if not self._journal.loaded:
+                await asyncio.to_thread(self._journal.load)
+            return self._journal.get_buckets(email, buckets)
 
-    def _apply_updates_local(self, updates: List[EarningsUpdate]) -> None:
-        data = self._read_local_data()
-        users = data.setdefault("users", {})
-        for update in updates:
-            email = update["email"]
-            stats = users.setdefault(email, dict(DEFAULT_STATS))
-            stats["hands"] = int(stats.get("hands", 0)) + int(update["hands"])
-            stats["chips_delta"] = int(stats.get("chips_delta", 0)) + int(
-                update["chips_delta"]
-            )
-            stats["hands_69_92"] = int(stats.get("hands_69_92", 0)) + int(
-                update["hands_69_92"]
-            )
-            stats["chips_delta_69_92"] = int(stats.get("chips_delta_69_92", 0)) + int(
-                update["chips_delta_69_92"]
-            )
-        self._write_local_data(data)
+    async def _write_rollups(self, email: str, buckets: Dict[str, Dict[str, int]]) -> None:
+        if self._sqlite is not None:
+            await self._sqlite.set_buckets(email, buckets)
+        elif self._use_firestore:
+            await self._set_buckets_firestore(email, buckets)
+        else:
+            async with self._lock:
+                self._journal.set_buckets(email, buckets)
 
-    def _read_local_data(self) -> Dict:
-        if not os.path.exists(self._local_path):
-            return {"users": {}}
+    async def leaderboard_page(self, column: str, offset: int = 0, limit: int = 20) -> List[Dict]:
+        """One page of {rank, email, value} within the top `leaderboard_persist_size` of `column`."""
+        board = await self._ensure_leaderboard()
+        limit = max(0, min(limit, self.leaderboard_persist_size - offset))
+        return board.page(column, offset, limit)
+
+    async def save_leaderboard(self) -> bool:
+        """Persist the top of the board if it changed since the last save (Firestore only)."""
+        if not self._use_firestore or not self._leaderboard_dirty or self._leaderboard is None:
+            return False
+        self._leaderboard_dirty = False
         try:
-            with open(self._local_path, "r", encoding="utf-8") as handle:
-                return json.load(handle) or {"users": {}}
-        except (OSError, json.JSONDecodeError):
-            return {"users": {}}
-
-    def _write_local_data(self, data: Dict) -> None:
-        os.makedirs(os.path.dirname(self._local_path), exist_ok=True)
-        with open(self._local_path, "w", encoding="utf-8") as handle:
-            json.dump(data, handle, ensure_ascii=False, indent=2)
-
-    def _get_firestore(self, email: str) -> Dict[str, int]:
-        assert self._firestore_client is not None
-        doc = (
-            self._firestore_client.collection("earnings").document(email).get()
-        )
-        if not doc.exists:
-            return dict(DEFAULT_STATS)
-        data = doc.to_dict() or {}
-        return {
-            "hands": int(data.get("hands", 0)),
-            "chips_delta": int(data.get("chips_delta", 0)),
-            "hands_69_92": int(data.get("hands_69_92", 0)),
-            "chips_delta_69_92": int(data.get("chips_delta_69_92", 0)),
+            await self._save_leaderboard_firestore(self._leaderboard)
+        except BaseException:
+            self._leaderboard_dirty = True
+            raise
+        return True
+
+    async def _update_leaderboard(self, updates_list: List[EarningsUpdate], board_ready: bool) -> None:
+        # New totals come from what this process already knows (fresh cache
+        # entries, which the write just updated, or the board plus the deltas);
+        # only the rest is read back, without touching the cache counters.
+        board = await self._ensure_leaderboard()
+        deltas: Dict[str, Dict[str, int]] = {}
+        for update in updates_list:
+            delta = deltas.setdefault(update["email"], dict(DEFAULT_STATS))
+            for field in DEFAULT_STATS:
+                delta[field] += int(update[field])
+        totals: Dict[str, Dict[str, int]] = {}
+        missing: List[str] = []
+        now = time.monotonic()
+        for email, delta in deltas.items():
+            cached = self._cache.get(email)
+            if cached is not None and (
+                not self._use_firestore or now - cached[1] < self.firestore_cache_ttl
+            ):
+                totals[email] = dict(cached[0])
+            elif board_ready and not self._use_firestore:
+                # Local/SQLite: this process is the only writer and the board was
+                # seeded from every user before the write, so untracked means zero.
+                previous = board.totals(email) or DEFAULT_STATS
+                totals[email] = {field: previous[field] + delta[field] for field in DEFAULT_STATS}
+            else:
+                missing.append(email)
+        if missing:
+            loaded = await self._read_many(missing)
+            for email in missing:
+                totals[email] = loaded.get(email, dict(DEFAULT_STATS))
+        board.update_many(totals)
+        if self._use_firestore:
+            self._leaderboard_dirty = True
+
+    async def _ensure_leaderboard(self) -> Leaderboard:
+        if self._leaderboard is not None:
+            return self._leaderboard
+        async with self._leaderboard_lock:
+            if self._leaderboard is None:
+                from .leaderboard import Leaderboard
+
+                board = Leaderboard()
+                await self._seed_leaderboard(board)
+                self._leaderboard = board
+        return self._leaderboard
+
+    async def _seed_leaderboard(self, board: Leaderboard) -> None:
+        # 起動後に一度だけ: ローカル/SQLite は全件から、Firestore は保存済みの上位だけから作る
+        if self._sqlite is not None:
+            board.update_many(await asyncio.to_thread(self._sqlite.read_all))
+            return
+        if self._use_firestore:
+            client = self._firestore_client.get_client()
+            async with self._firestore_client.limit():
+                doc = await client.collection("leaderboards").document("top").get()
+            columns = (doc.to_dict() or {}).get("columns", {}) if doc.exists else {}
+            for column, entries in columns.items():
+                try:
+                    board.load_top(column, entries)
+                except ValueError:
+                    continue
+            return
+        async with self._lock:
+            if not self._journal.loaded:
+                await asyncio.to_thread(self._journal.load)
+            board.update_many(self._journal.users)
+
+    async def _read(self, email: str) -> Dict[str, int]:
+        if self._sqlite is not None:
+            return await self._sqlite.get(email)
+        if self._use_firestore:
+            return await self._get_firestore(email)
+        async with self._lock:
+            if not self._journal.loaded:
+                await asyncio.to_thread(self._journal.load)
+            return self._journal.get(email)
+
+    async def _read_many(self, emails: List[str]) -> Dict[str, Dict[str, int]]:
+        if self._sqlite is not None:
+            return await self._sqlite.get_many(emails)
+        if self._use_firestore:
+            return await self._get_many_firestore(emails)
+        async with self._lock:
+            if not self._journal.loaded:
+                await asyncio.to_thread(self._journal.load)
+            return {email: self._journal.get(email) for email in emails}
+
+    async def _write(self, updates_list: List[EarningsUpdate], day: str) -> None:
+        if self._sqlite is not None:
+            await self._sqlite.apply_updates(updates_list, day)
+            return
+        if self._use_firestore:
+            await self._apply_updates_firestore(updates_list, day)
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._apply_updates_local, updates_list, day)
+
+    async def warm_up(self) -> None:
+        """Pay first-use costs (Firestore import and client, journal replay) up front."""
+        if self._use_firestore:
+            await asyncio.to_thread(self._firestore_client.module)
+            self._firestore_client.get_client()
+        elif self._journal is not None:
+            async with self._lock:
+                if not self._journal.loaded:
+                    await asyncio.to_thread(self._journal.load)
+
+    def close(self) -> None:
+        if self._sqlite is not None:
+            self._sqlite.close()
+
+    async def _save_leaderboard_firestore(self, board: Leaderboard) -> None:
+        from .leaderboard import LEADERBOARD_COLUMNS
+
+        client = self._firestore_client.get_client()
+        columns = {
+            column: board.top(column, self.leaderboard_persist_size)
+            for column in LEADERBOARD_COLUMNS
         }
+        async with self._firestore_client.limit():
+            await client.collection("leaderboards").document("top").set(
+                {"columns": columns, "updated_at": self._firestore.SERVER_TIMESTAMP}
+            )
+
+    def _apply_updates_local(self, updates: List[EarningsUpdate], day: str) -> None:
+        if not self._journal.loaded:
+            self._journal.load()
+        self._journal.apply(updates, day)
+
+    async def _get_firestore(self, email: str) -> Dict[str, int]:
+        client = self._firestore_client.get_client()
+        async with self._firestore_client.limit():
+            doc = await client.collection("earnings").document(email).get()
+        return _stats_from_doc(doc)
+
+    async def _get_many_firestore(self, emails: List[str]) -> Dict[str, Dict[str, int]]:
+        client = self._firestore_client.get_client()
+        refs = [client.collection("earnings").document(email) for email in emails]
+        found: Dict[str, Dict[str, int]] = {}
+        async with self._firestore_client.limit():
+            async for doc in client.get_all(refs):
+                found[doc.id] = _stats_from_doc(doc)
+        return found
 
-    def _apply_updates_firestore(self, updates: List[EarningsUpdate]) -> None:
-        assert self._firestore_client is not None
-        batch = self._firestore_client.batch()
+    async def _apply_updates_firestore(self, updates: List[EarningsUpdate], day: str) -> None:
+        client = self._firestore_client.get_client()
+        batch = client.batch()
         for update in updates:
-            doc = self._firestore_client.collection("earnings").document(
-                update["email"]
-            )
-            batch.set(
-                doc,
-                {
-                    "hands": self._firestore.Increment(update["hands"]),
-                    "chips_delta": self._firestore.Increment(update["chips_delta"]),
-                    "hands_69_92": self._firestore.Increment(update["hands_69_92"]),
-                    "chips_delta_69_92": self._firestore.Increment(
-                        update["chips_delta_69_92"]
-                    ),
-                    "updated_at": self._firestore.SERVER_TIMESTAMP,
-                },
-                merge=True,
-            )
-        batch.commit()
+            doc = client.collection("earnings").document(update["email"])
+            increments = {
+                "hands": self._firestore.Increment(update["hands"]),
+                "chips_delta": self._firestore.Increment(update["chips_delta"]),
+                "hands_69_92": self._firestore.Increment(update["hands_69_92"]),
+                "chips_delta_69_92": self._firestore.Increment(
+                    update["chips_delta_69_92"]
+                ),
+                "updated_at": self._firestore.SERVER_TIMESTAMP,
+            }
+            batch.set(doc, increments, merge=True)
+            # 日別バケット: earnings/{email}/buckets/{YYYY-MM-DD}
+            batch.set(doc.collection("buckets").document(day), increments, merge=True)
+        async with self._firestore_client.limit():
+            await batch.commit()
+
+    async def _get_buckets_firestore(self, email: str, buckets: List[str]) -> Dict[str, Dict[str, int]]:
+        if not buckets:
+            return {}
+        client = self._firestore_client.get_client()
+        parent = client.collection("earnings").document(email).collection("buckets")
+        found: Dict[str, Dict[str, int]] = {}
+        async with self._firestore_client.limit():
+            async for doc in client.get_all([parent.document(bucket) for bucket in buckets]):
+                if doc.exists:
+                    found[doc.id] = _stats_from_doc(doc)
+        return found
+
+    async def _set_buckets_firestore(self, email: str, buckets: Dict[str, Dict[str, int]]) -> None:
+        client = self._firestore_client.get_client()
+        parent = client.collection("earnings").document(email).collection("buckets")
+        batch = client.batch()
+        for bucket, stats in buckets.items():
+            batch.set(parent.document(bucket), {**stats, "updated_at": self._firestore.SERVER_TIMESTAMP})
+        async with self._firestore_client.limit():
+            await batch.commit()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from earnings.store import EarningsStore  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _update(email: str, chips: int) -> dict:
+    return {
+        "email": email,
+        "hands": 1,
+        "chips_delta": chips,
+        "hands_69_92": 0,
+        "chips_delta_69_92": 0,
+    }
+
+
+async def _cache_serves_reads_and_follows_writes() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EarningsStore(local_path=os.path.join(tmp, "earnings.json"), backend="local", cache_size=2)
+        await store.apply_updates([_update("a@example.com", 5)])
+        # Refreshing the leaderboard leaves the cache and its counters alone.
+        await store.get("a@example.com")
+        await store.get("a@example.com")
+        _assert_equal((store.cache_hits, store.cache_misses), (1, 1))
+        # Cached entries are updated in place by writes, not re-read.
+        await store.apply_updates([_update("a@example.com", 7)])
+        _assert_equal((await store.get("a@example.com"))["chips_delta"], 12)
+        _assert_equal(store.cache_misses, 1)
+        # LRU: b and c push a out.
+        await store.get("b@example.com")
+        await store.get("c@example.com")
+        _assert_equal(list(store._cache), ["b@example.com", "c@example.com"])
+        _assert_equal((await store.get("a@example.com"))["hands"], 2)
+        _assert_equal(store.cache_misses, 4)
+
+
+async def _read_overlapping_a_write_is_not_cached() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EarningsStore(local_path=os.path.join(tmp, "earnings.json"), backend="local")
+        await asyncio.gather(
+            store.get("a@example.com"),
+            store.apply_updates([_update("a@example.com", 3)]),
+        )
+        _assert_equal((await store.get("a@example.com"))["chips_delta"], 3)
+
+
+async def _get_many_reads_misses_once() -> None:
+    for backend in ("local", "sqlite"):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EarningsStore(
+                local_path=os.path.join(tmp, "earnings.json"),
+                sqlite_path=os.path.join(tmp, "earnings.sqlite3"),
+                backend=backend,
+            )
+            await store.apply_updates([_update("a@example.com", 4), _update("b@example.com", -4)])
+            await store.get("a@example.com")
+            found = await store.get_many(["a@example.com", "b@example.com", "c@example.com", "a@example.com"])
+            _assert_equal(sorted(found), ["a@example.com", "b@example.com", "c@example.com"])
+            _assert_equal(found["b@example.com"]["chips_delta"], -4)
+            _assert_equal(found["c@example.com"]["hands"], 0)
+            _assert_equal((store.cache_hits, store.cache_misses), (1, 3))
+            _assert_equal((await store.get("b@example.com"))["chips_delta"], -4)
+            _assert_equal(store.cache_hits, 2)
+            store.close()
+
+
+async def _updates_land_in_their_stamped_day() -> None:
+    for backend in ("local", "sqlite"):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EarningsStore(
+                local_path=os.path.join(tmp, "earnings.json"),
+                sqlite_path=os.path.join(tmp, "earnings.sqlite3"),
+                backend=backend,
+            )
+            # A batch flushed after midnight still carries the previous day's hands.
+            await store.apply_updates(
+                [
+                    {**_update("a@example.com", 5), "day": "2024-03-31"},
+                    {**_update("a@example.com", 7), "day": "2024-04-01"},
+                ]
+            )
+            march, _ = await store.get_range("a@example.com", date(2024, 3, 1), date(2024, 3, 31))
+            april, _ = await store.get_range("a@example.com", date(2024, 4, 1), date(2024, 4, 30))
+            _assert_equal((march["chips_delta"], april["chips_delta"]), (5, 7))
+            _assert_equal((await store.get("a@example.com"))["chips_delta"], 12)
+            store.close()
+
+
+def run() -> None:
+    asyncio.run(_cache_serves_reads_and_follows_writes())
+    asyncio.run(_read_overlapping_a_write_is_not_cached())
+    asyncio.run(_get_many_reads_misses_once())
+    asyncio.run(_updates_land_in_their_stamped_day())
+
+
+if __name__ == "__main__":
+    run()
+    print("store_tests: ok")
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable, Optional, Protocol, Tuple
+
+from . import rollups
+from .store import DEFAULT_STATS, EarningsUpdate
+
+STAT_FIELDS = tuple(DEFAULT_STATS)
+
+
+class EarningsSink(Protocol):
+    async def apply_updates(self, updates: Iterable[EarningsUpdate]) -> None: ...
+
+
+PendingKey = Tuple[str, str]
+
+
+def _merge(target: Dict[PendingKey, EarningsUpdate], update: EarningsUpdate) -> None:
+    key = (update["email"], update["day"])
+    merged = target.get(key)
+    if merged is None:
+        target[key] = {
+            "email": update["email"],
+            "day": update["day"],
+            **{field: int(update[field]) for field in STAT_FIELDS},
+        }
+        return
+    for field in STAT_FIELDS:
+        merged[field] += int(update[field])
+
+
+class EarningsWriteBehind:
+    """
+    Write-behind queue in front of `EarningsStore.apply_updates`.
+
+    - `submit` never waits on storage. It stamps each delta with the day it
+      settled, so a flush or retry after midnight still lands in the right day,
+      week and month, and merges deltas per email and day (across hands and
+      tables) into one pending update each.
+    - A background task flushes every `flush_interval` seconds, as soon as
+      `max_pending` emails are waiting, and on `close()`.
+    - A failed flush puts its batch back (merged with anything newer) and is
+      retried with backoff, so every delta is written at least once. A write
+      that fails after the store applied it can therefore be counted twice.
+    - `pending_for` exposes unflushed deltas so reads can include them.
+    """
+
+    def __init__(
+        self,
+        store: EarningsSink,
+        flush_interval: float = 2.0,
+        max_pending: int = 200,
+        max_retry_delay: float = 60.0,
+    ) -> None:
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retry_delay = max_retry_delay
+        self.failures = 0
+        self.flushed_batches = 0
+        self._pending: Dict[PendingKey, EarningsUpdate] = {}
+        self._inflight: Dict[PendingKey, EarningsUpdate] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, updates: Iterable[EarningsUpdate]) -> None:
+        today_key = rollups.day_key(rollups.today())
+        for update in updates:
+            if update.get("email"):
+                _merge(self._pending, {**update, "day": update.get("day") or today_key})
+        if not self._pending:
+            return
+        self._ensure_running()
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+
+    def pending_count(self) -> int:
+        """Players with deltas not yet written (queued or being flushed)."""
+        return len({email for email, _day in self._pending.keys() | self._inflight.keys()})
+
+    def pending_for(self, email: str, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, int]:
+        """
+        Deltas for `email` that are not in the store yet (queued or being written),
+        optionally only those stamped with a day key in [`start`, `end`].
+        """
+        totals = dict(DEFAULT_STATS)
+        for source in (self._inflight, self._pending):
+            for (pending_email, day), update in source.items():
+                if pending_email != email or (start and day < start) or (end and day > end):
+                    continue
+                for field in STAT_FIELDS:
+                    totals[field] += update[field]
+        return totals
+
+    async def flush(self) -> bool:
+        """Write everything queued so far; returns False if the store failed."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return True
+            self._inflight, self._pending = self._pending, {}
+            try:
+                await self.store.apply_updates(list(self._inflight.values()))
+            except Exception as exc:
+                self.failures += 1
+                print(f"earnings flush failed ({len(self._inflight)} pending): {exc}")
+                for update in self._inflight.values():
+                    _merge(self._pending, update)
+                return False
+            finally:
+                self._inflight = {}
+            self.flushed_batches += 1
+            return True
+
+    async def close(self, attempts: int = 3) -> None:
+        """Stop the background task and flush what is left (bounded retries)."""
+        self._closing = True
+        if self._task is not None:
+            self._wake.set()
+            await self._task
+            self._task = None
+        for attempt in range(attempts):
+            if await self.flush():
+                return
+            await asyncio.sleep(min(self.flush_interval * 2**attempt, self.max_retry_delay))
+        if self._pending:
+            print(f"earnings not persisted at shutdown: {sorted({email for email, _day in self._pending})}")
+
+    def _ensure_running(self) -> None:
+        if self._closing:
+            return
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        consecutive_failures = 0
+        while not self._closing:
+            delay = self.flush_interval
+            if consecutive_failures:
+                delay = min(self.flush_interval * 2**consecutive_failures, self.max_retry_delay)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._closing:
+                return
+            if await self.flush():
+                consecutive_failures = 0
+            else:
+                consecutive_failures += 1
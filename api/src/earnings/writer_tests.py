@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from earnings.writer import EarningsWriteBehind  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _update(email: str, chips: int) -> dict:
+    return {
+        "email": email,
+        "hands": 1,
+        "chips_delta": chips,
+        "hands_69_92": 0,
+        "chips_delta_69_92": 0,
+    }
+
+
+class _RecordingStore:
+    def __init__(self, fail_times: int = 0) -> None:
+        self.fail_times = fail_times
+        self.batches = []
+        self.totals = {}
+
+    async def apply_updates(self, updates) -> None:
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("store unavailable")
+        batch = list(updates)
+        self.batches.append(batch)
+        for update in batch:
+            stats = self.totals.setdefault(update["email"], {"hands": 0, "chips_delta": 0})
+            stats["hands"] += update["hands"]
+            stats["chips_delta"] += update["chips_delta"]
+
+
+async def _merges_per_email_and_flushes_on_close() -> None:
+    store = _RecordingStore()
+    writer = EarningsWriteBehind(store, flush_interval=60.0)
+    writer.submit([_update("a@example.com", 10), _update("b@example.com", -10)])
+    writer.submit([_update("a@example.com", -4), _update("b@example.com", 4)])
+    _assert_equal(len(writer), 2)
+    _assert_equal(writer.pending_for("a@example.com")["chips_delta"], 6)
+    _assert_equal(store.batches, [])
+    await writer.close()
+    _assert_equal(len(store.batches), 1)
+    _assert_equal(store.totals["a@example.com"], {"hands": 2, "chips_delta": 6})
+    _assert_equal(store.totals["b@example.com"], {"hands": 2, "chips_delta": -6})
+
+
+async def _deltas_keep_the_day_they_settled() -> None:
+    store = _RecordingStore()
+    writer = EarningsWriteBehind(store, flush_interval=60.0)
+    writer.submit([{**_update("a@example.com", 3), "day": "2024-03-31"}])
+    writer.submit([{**_update("a@example.com", 4), "day": "2024-04-01"}, _update("b@example.com", 1)])
+    writer.submit([{**_update("a@example.com", 5), "day": "2024-04-01"}])
+    # One pending update per email and day; b is stamped with today at submit.
+    _assert_equal(len(writer), 3)
+    _assert_equal(writer.pending_count(), 2)
+    _assert_equal(writer.pending_for("a@example.com")["chips_delta"], 12)
+    _assert_equal(writer.pending_for("a@example.com", "2024-04-01", "2024-04-30")["chips_delta"], 9)
+    await writer.close()
+    days = {(update["email"], update["day"]): update["chips_delta"] for update in store.batches[0]}
+    _assert_equal(days[("a@example.com", "2024-03-31")], 3)
+    _assert_equal(days[("a@example.com", "2024-04-01")], 9)
+    _assert_equal(len(days), 3)
+
+
+async def _size_threshold_triggers_flush() -> None:
+    store = _RecordingStore()
+    writer = EarningsWriteBehind(store, flush_interval=60.0, max_pending=2)
+    writer.submit([_update("a@example.com", 1)])
+    await asyncio.sleep(0.01)
+    _assert_equal(store.batches, [])
+    writer.submit([_update("b@example.com", 1)])
+    await asyncio.sleep(0.01)
+    _assert_equal(len(store.batches), 1)
+    _assert_equal(len(writer), 0)
+    await writer.close()
+
+
+async def _failed_flush_is_retried_without_losing_deltas() -> None:
+    store = _RecordingStore(fail_times=2)
+    writer = EarningsWriteBehind(store, flush_interval=0.01, max_retry_delay=0.02)
+    writer.submit([_update("a@example.com", 5)])
+    await asyncio.sleep(0.015)
+    # Deltas submitted while the store is failing merge into the retried batch.
+    writer.submit([_update("a@example.com", 5)])
+    for _ in range(50):
+        if store.batches:
+            break
+        await asyncio.sleep(0.01)
+    _assert_equal(writer.failures, 2)
+    _assert_equal(store.totals["a@example.com"], {"hands": 2, "chips_delta": 10})
+    _assert_equal(writer.pending_for("a@example.com")["chips_delta"], 0)
+    await writer.close()
+
+
+def run() -> None:
+    asyncio.run(_merges_per_email_and_flushes_on_close())
+    asyncio.run(_deltas_keep_the_day_they_settled())
+    asyncio.run(_size_threshold_triggers_flush())
+    asyncio.run(_failed_flush_is_retried_without_losing_deltas())
+
+
+if __name__ == "__main__":
+    run()
+    print("writer_tests: ok")
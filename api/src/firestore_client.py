@@ -0,0 +1,56 @@
+"""
+Process-wide Firestore `AsyncClient` shared by the earnings and allowlist stores.
+
+One client (one gRPC channel) is created on first use inside the running event
+loop and reused; every call goes through `limit()` so bursts of logins and
+settlements queue here instead of piling up on the channel.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+from typing import Any, Optional
+
+_client: Optional[Any] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def database_id() -> str:
+    # デフォルトは "(default)"。別名で作成したDBは FIRESTORE_DATABASE で指定
+    return os.getenv("FIRESTORE_DATABASE", "dragonspoker-game")
+
+
+def max_concurrency() -> int:
+    return max(1, int(os.getenv("FIRESTORE_MAX_CONCURRENCY", "32")))
+
+
+def module() -> Any:
+    """`google.cloud.firestore`, imported on first use (it is slow to import)."""
+    from google.cloud import firestore
+
+    return firestore
+
+
+def get_client() -> Any:
+    global _client
+    if _client is None:
+        _client = module().AsyncClient(database=database_id())
+    return _client
+
+
+def limit() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(max_concurrency())
+    return _semaphore
+
+
+async def close() -> None:
+    global _client, _semaphore
+    client, _client, _semaphore = _client, None, None
+    if client is None:
+        return
+    result = client.close()
+    if inspect.isawaitable(result):
+        await result
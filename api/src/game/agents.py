@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Optional, Protocol, Tuple
+
+from .manager import GameTable
+from .models import ActionType, Street
+
+
+@dataclass(frozen=True)
+class SeatView:
+    """Read-only snapshot of the table from one seat's point of view."""
+
+    seat_index: int
+    email: str
+    hand_number: int
+    street: Street
+    hole_cards: Tuple[str, ...]
+    board: Tuple[str, ...]
+    position: Optional[str]
+    pot: int
+    stack: int
+    street_commit: int
+    current_bet: int
+    min_raise: int
+    big_blind: int
+    to_call: int
+    raise_blocked: bool
+    players_in_hand: int
+
+    @property
+    def max_total(self) -> int:
+        """Largest street total this seat can reach (i.e. all-in)."""
+        return self.stack + self.street_commit
+
+
+@dataclass(frozen=True)
+class Decision:
+    action: ActionType
+    amount: Optional[int] = None
+
+
+class Agent(Protocol):
+    def decide(self, view: SeatView) -> Decision: ...
+
+
+def seat_view(table: GameTable, seat_index: int) -> SeatView:
+    seat = table.seats[seat_index]
+    commit = table.street_contribs[seat_index]
+    positions = table._seat_positions()
+    return SeatView(
+        seat_index=seat_index,
+        email=seat.email or "",
+        hand_number=table.hand_number,
+        street=table.street,
+        hole_cards=tuple(seat.hole_cards or ()),
+        board=tuple(table._visible_board()),
+        position=positions.get(seat_index),
+        pot=table.pot,
+        stack=table.stacks[seat_index],
+        street_commit=commit,
+        current_bet=table.current_bet,
+        min_raise=table.min_raise,
+        big_blind=table.big_blind,
+        to_call=max(0, table.current_bet - commit),
+        raise_blocked=bool(table.raise_blocked_mask >> seat_index & 1),
+        players_in_hand=table._in_hand_mask().bit_count(),
+    )
+
+
+def check_or_fold(view: SeatView) -> Decision:
+    return Decision(ActionType.check if view.to_call == 0 else ActionType.fold)
+
+
+class CheckFoldAgent:
+    """Same behaviour as the server's auto-play for disconnected players."""
+
+    def decide(self, view: SeatView) -> Decision:
+        return check_or_fold(view)
+
+
+class CallingStationAgent:
+    def decide(self, view: SeatView) -> Decision:
+        if view.to_call == 0:
+            return Decision(ActionType.check)
+        return Decision(ActionType.call)
+
+
+class RandomAgent:
+    """Plays random (legal) actions; useful for covering odd betting sequences."""
+
+    def __init__(self, rng: Optional[random.Random] = None, aggression: float = 0.15) -> None:
+        self.rng = rng or random.Random()
+        self.aggression = aggression
+
+    def decide(self, view: SeatView) -> Decision:
+        roll = self.rng.random()
+        if roll < self.aggression / 5:
+            return Decision(ActionType.all_in)
+        if roll < self.aggression:
+            if view.current_bet == 0:
+                return Decision(ActionType.bet, min(view.max_total, view.big_blind * 2))
+            target = view.current_bet + view.min_raise
+            if not view.raise_blocked and target < view.max_total:
+                return Decision(ActionType.raise_, target)
+        if view.to_call == 0:
+            return Decision(ActionType.check)
+        if roll > 0.7:
+            return Decision(ActionType.fold)
+        return Decision(ActionType.call)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from .agents import (
+    Agent,
+    CallingStationAgent,
+    CheckFoldAgent,
+    Decision,
+    RandomAgent,
+    SeatView,
+    check_or_fold,
+    seat_view,
+)
+from .manager import GameTable
+from .models import ActionPayload
+
+BOT_STRATEGIES: Dict[str, Callable[[], Agent]] = {
+    "call": CallingStationAgent,
+    "checkfold": CheckFoldAgent,
+    "random": RandomAgent,
+}
+
+
+class BotController:
+    """
+    Drives `GameTable.bot_seats` with strategy objects (`agents.Agent`).
+
+    - A strategy only ever sees a frozen `SeatView`, so it can think on a worker
+      thread while the event loop keeps serving sockets.
+    - Every decision runs under `decision_timeout`; a late or failing strategy
+      (or an illegal decision) falls back to check/fold, like auto-play.
+    - A timed-out worker cannot be interrupted; its result is simply dropped.
+    """
+
+    def __init__(self, decision_timeout: float = 2.0, max_workers: int = 4) -> None:
+        if decision_timeout <= 0:
+            raise ValueError("decision_timeout must be positive")
+        self.decision_timeout = decision_timeout
+        self.agents: Dict[int, Agent] = {}
+        self.timeouts = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bot")
+
+    def add(self, table: GameTable, seat_index: int, strategy: str, name: Optional[str] = None) -> None:
+        factory = BOT_STRATEGIES.get(strategy)
+        if factory is None:
+            raise ValueError(f"Unknown bot strategy: {strategy}")
+        table.add_bot(name or f"Bot {seat_index + 1}", seat_index)
+        self.agents[seat_index] = factory()
+
+    def remove(self, table: GameTable, seat_index: int) -> None:
+        table.remove_bot(seat_index)
+        self.agents.pop(seat_index, None)
+
+    async def take_turn(self, table: GameTable) -> Optional[ActionPayload]:
+        """
+        Play one action for the bot to act, if any, and return what was applied.
+
+        The table may change while the strategy thinks (reset, leave, ...); the
+        decision is dropped unless the same seat is still to act in the same hand.
+        """
+        seat_index = table.bot_to_act()
+        if seat_index is None:
+            return None
+        agent = self.agents.get(seat_index)
+        view = seat_view(table, seat_index)
+        decision = await self._decide(agent, view) if agent else check_or_fold(view)
+        if (
+            table.bot_to_act() != seat_index
+            or table.hand_number != view.hand_number
+            or table.street != view.street
+            or table.seats[seat_index].email != view.email
+        ):
+            return None
+        payload = ActionPayload(email=view.email, action=decision.action, amount=decision.amount)
+        try:
+            table.record_action(payload)
+        except ValueError:
+            fallback = check_or_fold(view)
+            payload = ActionPayload(email=view.email, action=fallback.action)
+            table.record_action(payload)
+        return payload
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _decide(self, agent: Agent, view: SeatView) -> Decision:
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor, agent.decide, view),
+                self.decision_timeout,
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except Exception as exc:
+            print(f"bot decision failed: {exc}")
+        return check_or_fold(view)
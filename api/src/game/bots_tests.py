@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from game.agents import Decision, SeatView  # noqa: E402
+from game.bots import BotController  # noqa: E402
+from game.manager import GameTable  # noqa: E402
+from game.models import ActionPayload, ActionType, Street  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+class _SlowRaiser:
+    def __init__(self, release: threading.Event) -> None:
+        self.release = release
+
+    def decide(self, view: SeatView) -> Decision:
+        self.release.wait(1.0)
+        return Decision(ActionType.all_in)
+
+
+async def _bots_play_until_a_human_is_to_act() -> None:
+    bots = BotController(decision_timeout=1.0)
+    table = GameTable(table_id="t1")
+    table.reserve_seat("a@example.com", "A", 0)
+    bots.add(table, 1, "call")
+    bots.add(table, 2, "call")
+    table.start_new_hand()
+    # 3-handed, BTN is seat 1: bot BTN calls, bot SB calls, then the human BB is up.
+    applied = []
+    while (data := await bots.take_turn(table)) is not None:
+        applied.append(data.action)
+    _assert_equal(applied, [ActionType.call, ActionType.call])
+    _assert_equal(table.current_turn_seat, 0)
+    table.record_action(ActionPayload(email="a@example.com", action=ActionType.check))
+    _assert_equal(table.street, Street.flop)
+    _assert_equal(table.bot_to_act(), 2)
+    bots.close()
+
+
+async def _late_decision_falls_back_to_check_fold() -> None:
+    bots = BotController(decision_timeout=0.05)
+    table = GameTable(table_id="t1")
+    table.reserve_seat("a@example.com", "A", 0)
+    bots.add(table, 1, "call")
+    release = threading.Event()
+    bots.agents[1] = _SlowRaiser(release)
+    table.start_new_hand()
+    # Heads-up, the bot is BTN/SB and acts first; it times out facing the big blind.
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    data = await bots.take_turn(table)
+    ticking.cancel()
+    release.set()
+    _assert_equal(data.action, ActionType.fold)
+    _assert_equal(bots.timeouts, 1)
+    _assert_equal(table.street, Street.settlement)
+    # The event loop kept running while the bot was thinking.
+    if ticks < 2:
+        raise AssertionError(f"event loop stalled during bot decision ({ticks} ticks)")
+    bots.close()
+
+
+def _remove_bot_frees_seat() -> None:
+    bots = BotController()
+    table = GameTable(table_id="t1")
+    bots.add(table, 3, "random")
+    _assert_equal(table.to_state().seats[3].is_bot, True)
+    bots.remove(table, 3)
+    _assert_equal(table.seats[3].email, None)
+    _assert_equal(table.bot_seats, set())
+    try:
+        bots.add(table, 3, "nope")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown strategy should be rejected")
+    bots.close()
+
+
+def run() -> None:
+    asyncio.run(_bots_play_until_a_human_is_to_act())
+    asyncio.run(_late_decision_falls_back_to_check_fold())
+    _remove_bot_frees_seat()
+
+
+if __name__ == "__main__":
+    run()
+    print("bots_tests: ok")
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+import json
 import random
+from functools import lru_cache
 from itertools import combinations
 from typing import Dict, List, Optional, Set, Tuple
 
 from fastapi import WebSocket
 
-from .models import ActionPayload, ActionRecord, ActionType, SeatState, Street, TableState
+from .models import (
+    ActionPayload,
+    ActionRecord,
+    ActionType,
+    LegalActions,
+    PreAction,
+    PreActionKind,
+    SeatState,
+    Street,
+    TableState,
+)
+from .pots import PotLedger
 
 
 POSITIONS_6MAX = ["BTN", "SB", "BB", "UTG", "HJ", "CO"]
 
 # Positions are assigned from BTN clockwise, depending on the number of players
-# participating in the current hand (i.e. excluding `pending_join_seats`).
+# participating in the current hand (i.e. excluding `pending_join_mask`).
 POSITIONS_BY_PLAYER_COUNT = {
     2: ["BTN", "BB"],  # heads-up: BTN posts SB, other posts BB
     3: ["BTN", "SB", "BB"],
@@ -99,6 +112,96 @@ def _best_hand_rank(cards: List[str]) -> Tuple[int, List[int]]:
     return best
 
 
+@lru_cache(maxsize=None)
+def _seat_tables(
+    max_players: int,
+) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    """
+    Precomputed lookups for seat bitmasks (bit i == seat i), shared per table size.
+
+    - `seats_in[mask]`: ascending seat indices set in `mask`.
+    - `next_in[start][mask]`: first seat in `mask` clockwise after `start`
+      (wrapping around to `start` itself), or -1 when `mask` is empty.
+    """
+    size = 1 << max_players
+    seats_in = tuple(
+        tuple(index for index in range(max_players) if mask >> index & 1)
+        for mask in range(size)
+    )
+    next_in: List[Tuple[int, ...]] = []
+    for start in range(max_players):
+        order = [(start + offset) % max_players for offset in range(1, max_players + 1)]
+        row = [-1] * size
+        for mask in range(1, size):
+            for seat_index in order:
+                if mask >> seat_index & 1:
+                    row[mask] = seat_index
+                    break
+        next_in.append(tuple(row))
+    return seats_in, tuple(next_in)
+
+
+class TableSeat:
+    """
+    Mutable seat record owned by `GameTable`.
+
+    `stack` and `street_commit` are views over the table's preallocated per-seat
+    arrays (`GameTable.stacks` / `GameTable.street_contribs`), so resets and the
+    betting code work on the arrays directly without copying into the seat.
+    Public payloads are built as `SeatState` models in `to_state_for`.
+    """
+
+    __slots__ = (
+        "seat_index",
+        "email",
+        "name",
+        "last_action",
+        "hole_cards",
+        "is_ready",
+        "is_folded",
+        "is_all_in",
+        "raise_blocked",
+        "_stacks",
+        "_street_contribs",
+    )
+
+    def __init__(self, seat_index: int, stacks: List[int], street_contribs: List[int]) -> None:
+        self.seat_index = seat_index
+        self.email: Optional[str] = None
+        self.name: Optional[str] = None
+        self.last_action: Optional[str] = None
+        self.hole_cards: Optional[List[str]] = None
+        self.is_ready = False
+        self.is_folded = False
+        self.is_all_in = False
+        self.raise_blocked = False
+        self._stacks = stacks
+        self._street_contribs = street_contribs
+
+    @property
+    def stack(self) -> int:
+        return self._stacks[self.seat_index]
+
+    @stack.setter
+    def stack(self, value: int) -> None:
+        self._stacks[self.seat_index] = value
+
+    @property
+    def street_commit(self) -> int:
+        return self._street_contribs[self.seat_index]
+
+
+class QueuedPreAction:
+    """A seat's pre-action; `street_only` ones are dropped when the street ends."""
+
+    __slots__ = ("kind", "amount", "street_only")
+
+    def __init__(self, kind: PreActionKind, amount: Optional[int], street_only: bool) -> None:
+        self.kind = kind
+        self.amount = amount
+        self.street_only = street_only
+
+
 class GameTable:
     def __init__(
         self,
@@ -109,8 +212,11 @@ class GameTable:
         buy_in_bb: int = 100,
         cashout_threshold_bb: int = 200,
         cashout_amount_bb: int = 100,
+        rng: Optional[random.Random] = None,
     ) -> None:
         self.table_id = table_id
+        # Deck shuffling source; headless simulations pass a seeded instance.
+        self._rng = rng or random
         self.small_blind = small_blind
         self.big_blind = big_blind
         self.max_players = max_players
@@ -118,8 +224,15 @@ class GameTable:
         self.cashout_threshold = cashout_threshold_bb * big_blind
         self.cashout_amount = cashout_amount_bb * big_blind
         self.auto_topup_amount = 300
-        self.seats: List[SeatState] = [
-            SeatState(seat_index=index) for index in range(max_players)
+        # Preallocated per-seat arrays; street/hand resets zero them in place.
+        # Commit arrays are owned by the pot ledger so it sees every chip movement.
+        self.pots = PotLedger(max_players)
+        self.stacks: List[int] = [0] * max_players
+        self.street_contribs: List[int] = self.pots.street_contribs
+        self.hand_contribs: List[int] = self.pots.hand_contribs
+        self.seats: List[TableSeat] = [
+            TableSeat(index, self.stacks, self.street_contribs)
+            for index in range(max_players)
         ]
         self.street = Street.waiting
         self.pot = 0
@@ -130,16 +243,21 @@ class GameTable:
         self.hand_number = 0
         self.current_bet = 0
         self.min_raise = self.big_blind
-        self.street_contribs: Dict[int, int] = {index: 0 for index in range(max_players)}
-        self.hand_contribs: Dict[int, int] = {index: 0 for index in range(max_players)}
-        self.folded_seats: Set[int] = set()
-        self.all_in_seats: Set[int] = set()
-        self.acted_seats: Set[int] = set()
-        self.raise_blocked_seats: Set[int] = set()
+        # Per-action seat sets are kept as bitmasks (bit i == seat i).
+        self._seats_in, self._next_in = _seat_tables(max_players)
+        self.occupied_mask = 0
+        self.folded_mask = 0
+        self.all_in_mask = 0
+        self.acted_mask = 0
+        self.raise_blocked_mask = 0
+        self.pending_join_mask = 0
         self.pending_leave_seats: Set[int] = set()
         self.leave_after_hand_seats: Set[int] = set()
-        self.pending_join_seats: Set[int] = set()
         self.auto_play_seats: Set[int] = set()
+        # Seats driven by a bot strategy (see `bots.BotController`).
+        self.bot_seats: Set[int] = set()
+        # Pre-actions queued by seats waiting for their turn (fired in `_advance_turn_or_street`).
+        self.pre_actions: Dict[int, QueuedPreAction] = {}
         self.big_blind_seat: Optional[int] = None
         self.pending_payouts: Dict[int, int] = {}
         self.save_earnings = False
@@ -191,20 +309,16 @@ class GameTable:
         self.pending_manual_topup_seats.clear()
 
     def _seat_positions(self) -> Dict[int, str]:
-        # Important: during a hand, seats in `pending_join_seats` must not receive
+        # Important: during a hand, seats in `pending_join_mask` must not receive
         # positions until the next hand.
-        eligible = {
-            seat_index
-            for seat_index in self._occupied_seat_indices()
-            if seat_index not in self.pending_join_seats
-        }
+        eligible = self.occupied_mask & ~self.pending_join_mask
         if not eligible:
             return {}
 
         dealer_order_in_hand: List[int] = []
         for offset in range(self.max_players):
             seat_index = (self.dealer_seat + offset) % self.max_players
-            if seat_index in eligible:
+            if eligible >> seat_index & 1:
                 dealer_order_in_hand.append(seat_index)
 
         count = len(dealer_order_in_hand)
@@ -221,75 +335,70 @@ class GameTable:
         return positions
 
     def _occupied_seat_indices(self) -> List[int]:
-        return [seat.seat_index for seat in self.seats if seat.email]
+        return list(self._seats_in[self.occupied_mask])
+
+    def _in_hand_mask(self) -> int:
+        return self.occupied_mask & ~(self.pending_join_mask | self.folded_mask)
+
+    def _active_mask(self) -> int:
+        # `all_in_mask` also covers seats that reached a zero stack (see `_mark_all_in`
+        # and `_reset_hand_state`), so this matches "not all-in-like".
+        return self._in_hand_mask() & ~self.all_in_mask
 
     def _active_seat_indices(self) -> List[int]:
-        return [
-            seat.seat_index
-            for seat in self.seats
-            if seat.email
-            and seat.seat_index not in self.pending_join_seats
-            and seat.seat_index not in self.folded_seats
-            and not self._is_all_in_like(seat.seat_index)
-        ]
+        return list(self._seats_in[self._active_mask()])
 
     def _in_hand_seat_indices(self) -> List[int]:
-        return [
-            seat.seat_index
-            for seat in self.seats
-            if seat.email
-            and seat.seat_index not in self.pending_join_seats
-            and seat.seat_index not in self.folded_seats
-        ]
+        return list(self._seats_in[self._in_hand_mask()])
 
     def _is_all_in_like(self, seat_index: int) -> bool:
-        seat = self.seats[seat_index]
-        return (
-            seat_index in self.all_in_seats
-            or seat.is_all_in
-            or seat.stack == 0
-        )
+        return bool(self.all_in_mask >> seat_index & 1) or self.stacks[seat_index] == 0
+
+    def _mark_all_in(self, seat: TableSeat) -> None:
+        self.all_in_mask |= 1 << seat.seat_index
+        seat.is_all_in = True
 
     def _next_occupied_seat(self, start_index: int) -> Optional[int]:
-        for offset in range(1, self.max_players + 1):
-            seat_index = (start_index + offset) % self.max_players
-            if self.seats[seat_index].email:
-                return seat_index
-        return None
+        seat_index = self._next_in[start_index][self.occupied_mask]
+        return None if seat_index < 0 else seat_index
 
     def _next_active_seat(self, start_index: int) -> Optional[int]:
-        for offset in range(1, self.max_players + 1):
-            seat_index = (start_index + offset) % self.max_players
-            if (
-                self.seats[seat_index].email
-                and seat_index not in self.pending_join_seats
-                and seat_index not in self.folded_seats
-                and not self._is_all_in_like(seat_index)
-            ):
-                return seat_index
-        return None
+        seat_index = self._next_in[start_index][self._active_mask()]
+        return None if seat_index < 0 else seat_index
 
     def _reset_street_state(self) -> None:
         self.current_bet = 0
         self.min_raise = self.big_blind
-        self.street_contribs = {index: 0 for index in range(self.max_players)}
-        self.acted_seats = set()
-        self.raise_blocked_seats = set()
+        self.pots.open_street()
+        self.acted_mask = 0
+        self.raise_blocked_mask = 0
+        if self.pre_actions:
+            for seat_index, queued in list(self.pre_actions.items()):
+                if queued.street_only:
+                    del self.pre_actions[seat_index]
 
     def _reset_hand_state(self) -> None:
         self.pot = 0
         self.board = []
         self.action_history = []
-        self.folded_seats = set()
-        self.all_in_seats = set()
-        self.hand_contribs = {index: 0 for index in range(self.max_players)}
+        self.folded_mask = 0
+        # Seats that start a hand without chips behave as all-in from the outset.
+        self.all_in_mask = 0
+        for seat_index in self._seats_in[self.occupied_mask]:
+            if self.stacks[seat_index] == 0:
+                self.all_in_mask |= 1 << seat_index
+        self.pots.reset()
         self.big_blind_seat = None
+        self.pre_actions.clear()
         self._reset_street_state()
 
-    def _clear_seat(self, seat: SeatState) -> None:
+    def _clear_seat(self, seat: TableSeat) -> None:
         self.auto_play_seats.discard(seat.seat_index)
+        self.bot_seats.discard(seat.seat_index)
+        self.pre_actions.pop(seat.seat_index, None)
         self.pending_manual_topup_seats.discard(seat.seat_index)
         self.hand_start_stack_by_seat_index.pop(seat.seat_index, None)
+        self.occupied_mask &= ~(1 << seat.seat_index)
         seat.email = None
         seat.name = None
         seat.stack = 0
@@ -298,7 +407,7 @@ class GameTable:
         seat.is_ready = False
         seat.is_folded = False
         seat.is_all_in = False
-        seat.street_commit = 0
+        self.street_contribs[seat.seat_index] = 0
 
     def apply_pending_payouts(self) -> None:
         if not self.pending_payouts:
@@ -327,13 +436,22 @@ class GameTable:
                     )
                 )
 
+    def complete_settlement(self) -> None:
+        """Pay out the settled hand and release seats that asked to leave."""
+        self.apply_pending_payouts()
+        self._finalize_pending_leaves()
+        self._finalize_leave_after_hand()
+
     def build_earnings_updates(self) -> List[Dict[str, int | str]]:
+        """Per-player results of the settled hand; bot seats are not recorded."""
         updates: List[Dict[str, int | str]] = []
         for seat in self.seats:
             if not seat.email or not seat.hole_cards or len(seat.hole_cards) != 2:
                 continue
+            if seat.seat_index in self.bot_seats:
+                continue
             payout = self.pending_payouts.get(seat.seat_index, 0)
-            contrib = self.hand_contribs.get(seat.seat_index, 0)
+            contrib = self.hand_contribs[seat.seat_index]
             delta = payout - contrib
             is_special = self._is_69_92_hand(seat.hole_cards)
             updates.append(
@@ -373,12 +491,9 @@ class GameTable:
             self.leave_after_hand_seats.discard(seat_index)
 
     def _clear_pending_joins(self) -> None:
-        if not self.pending_join_seats:
-            return
-        for seat_index in list(self.pending_join_seats):
-            self.pending_join_seats.discard(seat_index)
+        self.pending_join_mask = 0
 
-    def find_seat(self, email: str) -> Optional[SeatState]:
+    def find_seat(self, email: str) -> Optional[TableSeat]:
         return self._find_seat(email)
 
     def _all_pending_leaves(self) -> bool:
@@ -404,7 +519,7 @@ class GameTable:
                     safety += 1
                     continue
             seat_index = self.current_turn_seat
-            if seat_index in self.folded_seats or seat_index in self.all_in_seats:
+            if (self.folded_mask | self.all_in_mask) >> seat_index & 1:
                 next_seat = self._next_active_seat(seat_index)
                 if next_seat is None:
                     self._advance_turn_or_street()
@@ -417,7 +532,7 @@ class GameTable:
                 self.current_turn_seat = self._next_active_seat(seat_index)
                 safety += 1
                 continue
-            player_commit = self.street_contribs.get(seat_index, 0)
+            player_commit = self.street_contribs[seat_index]
             to_call = max(0, self.current_bet - player_commit)
             action = ActionType.check if to_call == 0 else ActionType.fold
             self.record_action(ActionPayload(email=seat.email, action=action))
@@ -425,7 +540,7 @@ class GameTable:
 
     def _build_deck(self) -> List[str]:
         deck = [f"{rank}{suit}" for suit in SUITS for rank in RANKS]
-        random.shuffle(deck)
+        self._rng.shuffle(deck)
         return deck
 
     def _sort_hole_cards(self, cards: List[str]) -> List[str]:
@@ -467,139 +582,6 @@ class GameTable:
             order.append(seat_index)
         return order
 
-    def _build_pot_amounts(self, contribs: Dict[int, int]) -> List[int]:
-        """
-        Build main/side pot amounts from per-seat total contributions.
-
-        Notes:
-        - Includes folded players' contributions in the pot size.
-        - Returns amounts only (eligibility is handled separately for payout).
-        """
-        # Side pots should only be split when eligibility differs (i.e. all-in / insufficient stack),
-        # not merely because someone folded without matching the current bet.
-        #
-        # We therefore derive "cap levels" only from seats still in the hand, and compute pot segment
-        # sizes by summing contributions from *all* seats into those segments.
-        contributions = {seat_index: amount for seat_index, amount in contribs.items() if amount > 0}
-        if not contributions:
-            return []
-        in_hand = set(self._in_hand_seat_indices())
-        if not in_hand:
-            return []
-        cap_levels = sorted(
-            {
-                contributions.get(seat_index, 0)
-                for seat_index in in_hand
-                if contributions.get(seat_index, 0) > 0
-            }
-        )
-        if not cap_levels:
-            # No "cap" among eligible seats (e.g. only folded chips are in the
-            # already-settled part for UI). In that case there is a single pot.
-            return [sum(contributions.values())]
-        amounts: List[int] = []
-        previous = 0
-        for level in cap_levels:
-            pot_amount = 0
-            for amount in contributions.values():
-                pot_amount += max(0, min(amount, level) - previous)
-            if pot_amount > 0:
-                amounts.append(pot_amount)
-            previous = level
-        # Add any "dead money" above the largest eligible cap (e.g. folded commits
-        # moved into the pot while the street is still in progress). This does not
-        # create a side pot; it's simply added to the highest pot segment.
-        remainder = 0
-        for amount in contributions.values():
-            remainder += max(0, amount - previous)
-        if remainder > 0:
-            if amounts:
-                amounts[-1] += remainder
-            else:
-                amounts.append(remainder)
-        return amounts
-
-    def _contribs_excluding_current_street(self) -> Dict[int, int]:
-        """
-        For UI display: pot totals excluding the current street's in-progress bets.
-
-        During betting streets, `street_contribs` represents the amounts committed
-        in the current street (per seat), and `hand_contribs` is per-hand totals.
-        """
-        if self.street in (Street.preflop, Street.flop, Street.turn, Street.river):
-            street_in_progress = self.current_turn_seat is not None
-            contribs: Dict[int, int] = {}
-            for seat_index in range(self.max_players):
-                total = self.hand_contribs.get(seat_index, 0)
-                # Once a seat folds, its current-street commitment should be considered
-                # "in the pot" for the remainder of the street (i.e. no longer treated as
-                # in-progress on the table UI).
-                treat_folded_commit_as_in_pot = (
-                    street_in_progress and seat_index in self.folded_seats
-                )
-                current_street = (
-                    0
-                    if treat_folded_commit_as_in_pot
-                    else self.street_contribs.get(seat_index, 0)
-                )
-                contribs[seat_index] = max(0, total - current_street)
-            return contribs
-        return dict(self.hand_contribs)
-
-    def _build_side_pots(self) -> List[Tuple[int, List[int]]]:
-        contributions = {
-            seat_index: amount
-            for seat_index, amount in self.hand_contribs.items()
-            if amount > 0
-        }
-        if not contributions:
-            return []
-        in_hand = set(self._in_hand_seat_indices())
-        if not in_hand:
-            return []
-
-        # Cap levels are determined only by still-eligible seats (not folded).
-        cap_levels = sorted(
-            {
-                contributions.get(seat_index, 0)
-                for seat_index in in_hand
-                if contributions.get(seat_index, 0) > 0
-            }
-        )
-        if not cap_levels:
-            # No cap among eligible seats -> single pot, all in-hand seats eligible.
-            return [(sum(contributions.values()), sorted(in_hand))]
-
-        pots: List[Tuple[int, List[int]]] = []
-        previous = 0
-        for level in cap_levels:
-            pot_amount = 0
-            for amount in contributions.values():
-                pot_amount += max(0, min(amount, level) - previous)
-
-            eligible = sorted(
-                [
-                    seat_index
-                    for seat_index in in_hand
-                    if contributions.get(seat_index, 0) >= level
-                ]
-            )
-            if pot_amount > 0 and eligible:
-                pots.append((pot_amount, eligible))
-            previous = level
-        # Same as `_build_pot_amounts`: add dead money above max eligible cap to the
-        # last pot (all remaining in-hand seats are eligible for it).
-        remainder = 0
-        for amount in contributions.values():
-            remainder += max(0, amount - previous)
-        if remainder > 0:
-            if pots:
-                last_amount, last_eligible = pots[-1]
-                pots[-1] = (last_amount + remainder, last_eligible)
-            else:
-                pots.append((remainder, sorted(in_hand)))
-        return pots
-
     def _settle_pots(self) -> None:
         in_hand = self._in_hand_seat_indices()
         if len(in_hand) == 1:
@@ -633,7 +615,7 @@ class GameTable:
             "CO": 4,
             "BTN": 5,
         }
-        for amount, eligible in self._build_side_pots():
+        for amount, eligible in self.pots.pots(self._in_hand_mask(), self.folded_mask):
             if amount <= 0 or not eligible:
                 continue
             best_rank = max(ranks[seat] for seat in eligible)
@@ -664,13 +646,13 @@ class GameTable:
         self.pot = 0
         self.street = Street.settlement
 
-    def _find_seat(self, email: str) -> Optional[SeatState]:
+    def _find_seat(self, email: str) -> Optional[TableSeat]:
         for seat in self.seats:
             if seat.email == email:
                 return seat
         return None
 
-    def join_player(self, email: str, name: str) -> SeatState:
+    def join_player(self, email: str, name: str) -> TableSeat:
         existing = self._find_seat(email)
         if existing:
             if existing.seat_index in self.pending_leave_seats:
@@ -683,13 +665,14 @@ class GameTable:
 
         for seat in self.seats:
             if seat.email is None:
+                self.occupied_mask |= 1 << seat.seat_index
                 seat.email = email
                 seat.name = name
                 seat.stack = self.buy_in
                 seat.is_ready = False
                 seat.is_folded = False
                 seat.is_all_in = False
-                seat.street_commit = 0
+                self.street_contribs[seat.seat_index] = 0
                 self.action_history.append(
                     ActionRecord(
                         actor_email=email,
@@ -701,7 +684,7 @@ class GameTable:
                 return seat
         raise ValueError("Table is full")
 
-    def reserve_seat(self, email: str, name: str, seat_index: int) -> SeatState:
+    def reserve_seat(self, email: str, name: str, seat_index: int) -> TableSeat:
         if seat_index < 0 or seat_index >= self.max_players:
             raise ValueError("Invalid seat index")
         existing = self._find_seat(email)
@@ -711,34 +694,54 @@ class GameTable:
         if seat.email and seat.email != email:
             raise ValueError("Seat already occupied")
         if seat.email is None:
+            self.occupied_mask |= 1 << seat_index
             seat.email = email
             seat.name = name
             seat.stack = self.buy_in
             seat.is_ready = False
             seat.is_folded = False
             seat.is_all_in = False
-            seat.street_commit = 0
+            self.street_contribs[seat_index] = 0
             seat.last_action = None
             seat.hole_cards = None
         if self.street in (Street.preflop, Street.flop, Street.turn, Street.river):
-            self.pending_join_seats.add(seat_index)
+            self.pending_join_mask |= 1 << seat_index
         return seat
 
+    def add_bot(self, name: str, seat_index: int) -> TableSeat:
+        seat = self.reserve_seat(f"bot{seat_index}@{self.table_id}.bots", name, seat_index)
+        self.bot_seats.add(seat_index)
+        return seat
+
+    def remove_bot(self, seat_index: int) -> None:
+        if seat_index not in self.bot_seats:
+            raise ValueError("Seat is not a bot")
+        email = self.seats[seat_index].email
+        if email:
+            self.leave_player(email)
+
+    def bot_to_act(self) -> Optional[int]:
+        """Seat index of the bot whose turn it is, if any."""
+        if self.street not in (Street.preflop, Street.flop, Street.turn, Street.river):
+            return None
+        if self.current_turn_seat in self.bot_seats:
+            return self.current_turn_seat
+        return None
+
     def leave_player(self, email: str) -> None:
         seat = self._find_seat(email)
         if not seat:
             return
         self.auto_play_seats.discard(seat.seat_index)
         in_active_hand = (
-            seat.seat_index not in self.folded_seats
-            and seat.seat_index not in self.pending_join_seats
+            not (self.folded_mask | self.pending_join_mask) >> seat.seat_index & 1
             and seat.email
             and self.street
             in (Street.preflop, Street.flop, Street.turn, Street.river)
         )
         was_current_turn = self.current_turn_seat == seat.seat_index
         if in_active_hand:
-            self.folded_seats.add(seat.seat_index)
+            self.folded_mask |= 1 << seat.seat_index
             seat.is_folded = True
             seat.last_action = "fold"
             self._record_action(seat, "fold", detail="leave")
@@ -801,7 +804,6 @@ class GameTable:
                 seat.is_ready = False
                 seat.is_folded = False
                 seat.is_all_in = False
-                seat.street_commit = 0
             return
         next_dealer = self._next_occupied_seat(self.dealer_seat)
         if next_dealer is not None:
@@ -817,7 +819,6 @@ class GameTable:
             seat.is_ready = False
             seat.is_folded = False
             seat.is_all_in = False
-            seat.street_commit = 0
         self.action_history.append(
             ActionRecord(
                 action="hand_start",
@@ -838,21 +839,20 @@ class GameTable:
         self.apply_auto_play()
 
     def reset(self) -> None:
+        self.stacks[:] = (self.buy_in,) * self.max_players
         for seat in self.seats:
-            seat.stack = self.buy_in
             seat.last_action = None
             seat.hole_cards = None
             seat.is_ready = False
             seat.is_folded = False
             seat.is_all_in = False
-            seat.street_commit = 0
             seat.raise_blocked = False
         self.auto_play_seats = set()
         self.street = Street.waiting
         self._reset_hand_state()
         self.pending_leave_seats = set()
         self.leave_after_hand_seats = set()
-        self.pending_join_seats = set()
+        self.pending_join_mask = 0
         self.pending_payouts = {}
         self.pending_manual_topup_seats = set()
         self.hand_start_stack_by_seat_index = {}
@@ -874,7 +874,7 @@ class GameTable:
             self._post_blind(sb_index, self.small_blind, "post_sb")
             self._post_blind(bb_index, self.big_blind, "post_bb")
             self.big_blind_seat = bb_index
-            self.current_bet = max(self.street_contribs.values())
+            self.current_bet = max(self.street_contribs)
             self.min_raise = self.big_blind
             self.current_turn_seat = self._next_active_seat(bb_index)
             return
@@ -891,21 +891,19 @@ class GameTable:
         self._post_blind(bb_index, self.big_blind, "post_bb")
         self.big_blind_seat = bb_index
 
-        self.current_bet = max(self.street_contribs.values())
+        self.current_bet = max(self.street_contribs)
         self.min_raise = self.big_blind
         self.current_turn_seat = self._next_active_seat(bb_index)
 
     def _post_blind(self, seat_index: int, amount: int, action: str) -> None:
         seat = self.seats[seat_index]
-        actual = min(amount, seat.stack)
-        seat.stack -= actual
-        if seat.stack == 0:
-            self.all_in_seats.add(seat_index)
-            seat.is_all_in = True
+        stacks = self.stacks
+        actual = min(amount, stacks[seat_index])
+        stacks[seat_index] -= actual
+        if stacks[seat_index] == 0:
+            self._mark_all_in(seat)
         self.pot += actual
-        self.street_contribs[seat_index] += actual
-        self.hand_contribs[seat_index] += actual
-        seat.street_commit = self.street_contribs[seat_index]
+        self.pots.add(seat_index, actual)
         self.action_history.append(
             ActionRecord(
                 actor_email=seat.email,
@@ -919,137 +917,243 @@ class GameTable:
     def apply_auto_cashout(self) -> None:
         return
 
+    def legal_actions(self, seat_index: int) -> Optional[LegalActions]:
+        """
+        Actions offered to `seat_index` if it is the seat to act, else None.
+
+        Mirrors the checks in `record_action`; bet/raise (and the all-in button that
+        stands in for them) are only offered while another seat can still respond.
+        """
+        if self.street not in (Street.preflop, Street.flop, Street.turn, Street.river):
+            return None
+        if seat_index != self.current_turn_seat or not self._active_mask() >> seat_index & 1:
+            return None
+        stack = self.stacks[seat_index]
+        commit = self.street_contribs[seat_index]
+        to_call = max(0, self.current_bet - commit)
+        call_amount = min(to_call, stack)
+        max_total = stack + commit
+        raise_reopened = not self.raise_blocked_mask >> seat_index & 1
+        others_can_respond = bool(self._active_mask() & ~(1 << seat_index))
+        can_bet = self.current_bet == 0 and others_can_respond
+        can_raise = (
+            self.current_bet > 0
+            and raise_reopened
+            and max_total > self.current_bet
+            and others_can_respond
+        )
+        raw_min = self.big_blind if self.current_bet == 0 else self.current_bet + self.min_raise
+        return LegalActions(
+            seat_index=seat_index,
+            to_call=to_call,
+            call_amount=call_amount,
+            can_check=to_call == 0,
+            can_call=to_call > 0 and call_amount > 0,
+            can_bet=can_bet,
+            can_raise=can_raise,
+            can_all_in=can_bet or can_raise,
+            raise_reopened=raise_reopened,
+            min_total=min(raw_min, max_total),
+            max_total=max_total,
+        )
+
+    def set_pre_action(
+        self,
+        email: str,
+        kind: Optional[PreActionKind],
+        amount: Optional[int] = None,
+    ) -> Optional[ActionPayload]:
+        """
+        Queue (or clear, with `kind=None`) a pre-action for the seat of `email`.
+
+        - check_fold: check when free, otherwise fold. Stays queued for the hand;
+          once it has checked it only lasts until the end of that street.
+        - call_any: check or call whatever is bet, once, on this street.
+        - call: call `amount` (the current bet) once; dropped if the bet changes.
+
+        If the turn already reached the seat, the pre-action is applied right away
+        and the applied action is returned.
+        """
+        seat = self._find_seat(email)
+        if not seat:
+            raise ValueError("Player not seated")
+        seat_index = seat.seat_index
+        if kind is None:
+            self.pre_actions.pop(seat_index, None)
+            return None
+        if self.street not in (Street.preflop, Street.flop, Street.turn, Street.river):
+            raise ValueError("No hand in progress")
+        if not self._active_mask() >> seat_index & 1:
+            raise ValueError("Player cannot act")
+        if kind == PreActionKind.call:
+            if self.current_bet - self.street_contribs[seat_index] <= 0:
+                raise ValueError("Nothing to call")
+            if amount is not None and amount != self.current_bet:
+                raise ValueError("Bet has changed")
+            amount = self.current_bet
+        else:
+            amount = None
+        self.pre_actions[seat_index] = QueuedPreAction(
+            kind, amount, street_only=kind != PreActionKind.check_fold
+        )
+        if seat_index != self.current_turn_seat:
+            return None
+        applied = self._fire_pre_action()
+        # Same as a direct `record_action`: play on past disconnected seats.
+        self.apply_auto_play()
+        return applied
+
+    def pre_action_for(self, seat_index: int) -> Optional[PreAction]:
+        queued = self.pre_actions.get(seat_index)
+        if queued is None:
+            return None
+        return PreAction(kind=queued.kind, amount=queued.amount)
+
+    def _fire_pre_action(self) -> Optional[ActionPayload]:
+        # A "call X" is only good for the bet it was made against.
+        for seat_index, queued in list(self.pre_actions.items()):
+            if queued.kind == PreActionKind.call and queued.amount != self.current_bet:
+                del self.pre_actions[seat_index]
+        seat_index = self.current_turn_seat
+        queued = self.pre_actions.get(seat_index) if seat_index is not None else None
+        if queued is None:
+            return None
+        to_call = max(0, self.current_bet - self.street_contribs[seat_index])
+        if queued.kind == PreActionKind.check_fold:
+            action = ActionType.check if to_call == 0 else ActionType.fold
+            if to_call == 0:
+                # Keep folding to a bet later on this street; gone next street.
+                queued.street_only = True
+            else:
+                del self.pre_actions[seat_index]
+        else:
+            action = ActionType.check if to_call == 0 else ActionType.call
+            del self.pre_actions[seat_index]
+        payload = ActionPayload(email=self.seats[seat_index].email, action=action)
+        self.record_action(payload, skip_auto_play=True)
+        return payload
+
     def record_action(self, payload: ActionPayload, *, skip_auto_play: bool = False) -> None:
         seat = self._find_seat(payload.email)
         if not seat:
             raise ValueError("Player not seated")
         if seat.seat_index != self.current_turn_seat:
             raise ValueError("Not your turn")
-        if seat.seat_index in self.folded_seats:
+        index = seat.seat_index
+        seat_bit = 1 << index
+        if self.folded_mask & seat_bit:
             raise ValueError("Player folded")
-        if seat.seat_index in self.all_in_seats:
+        if self.all_in_mask & seat_bit:
             raise ValueError("Player all-in")
 
-        player_commit = self.street_contribs.get(seat.seat_index, 0)
+        stacks = self.stacks
+        street_contribs = self.street_contribs
+        pots = self.pots
+        player_commit = street_contribs[index]
         to_call = max(0, self.current_bet - player_commit)
         amount = payload.amount or 0
         action = payload.action
-        
+
         if action == ActionType.fold:
-            self.folded_seats.add(seat.seat_index)
+            self.folded_mask |= seat_bit
             seat.is_folded = True
             seat.last_action = "fold"
-            self.acted_seats.add(seat.seat_index)
+            self.acted_mask |= seat_bit
             self._record_action(seat, "fold")
         elif action == ActionType.check:
             if to_call != 0:
                 raise ValueError("Cannot check when facing a bet")
             seat.last_action = "check"
-            self.acted_seats.add(seat.seat_index)
+            self.acted_mask |= seat_bit
             self._record_action(seat, "check")
         elif action == ActionType.call:
             if to_call == 0:
                 raise ValueError("Nothing to call")
             # stackが少ない場合はstack分
-            call_amount = min(to_call, seat.stack)
+            call_amount = min(to_call, stacks[index])
             if call_amount <= 0:
                 raise ValueError("Insufficient stack")
             # 既にベット済みの分はstackから引かず、未払い分だけ引く
-            seat.stack -= call_amount
+            stacks[index] -= call_amount
             self.pot += call_amount
-            self.hand_contribs[seat.seat_index] += call_amount
             # table上の表示(commit)は実際のto_call分を表示する
-            self.street_contribs[seat.seat_index] = player_commit + call_amount
-            seat.street_commit = self.current_bet  # 画面上は(current_bet)を表示
-            if call_amount < to_call or seat.stack == 0:
-                self.all_in_seats.add(seat.seat_index)
-                seat.is_all_in = True
+            pots.add(index, call_amount)
+            if call_amount < to_call or stacks[index] == 0:
+                self._mark_all_in(seat)
             seat.last_action = "call"
-            self.acted_seats.add(seat.seat_index)
-            self._record_action(seat, "call", self.street_contribs[seat.seat_index])
+            self.acted_mask |= seat_bit
+            self._record_action(seat, "call", street_contribs[index])
         elif action == ActionType.bet:
             if self.current_bet != 0:
                 raise ValueError("Cannot bet when there is a bet already")
             if amount <= 0:
                 raise ValueError("Bet amount required")
-            bet_amount = min(amount, seat.stack)
-            seat.stack -= bet_amount
+            bet_amount = min(amount, stacks[index])
+            stacks[index] -= bet_amount
             self.pot += bet_amount
-            self.street_contribs[seat.seat_index] += bet_amount
-            self.hand_contribs[seat.seat_index] += bet_amount
-            seat.street_commit = self.street_contribs[seat.seat_index]
-            if seat.stack == 0:
-                self.all_in_seats.add(seat.seat_index)
-                seat.is_all_in = True
-            self.current_bet = self.street_contribs[seat.seat_index]
+            pots.add(index, bet_amount)
+            if stacks[index] == 0:
+                self._mark_all_in(seat)
+            self.current_bet = street_contribs[index]
             self.min_raise = max(self.big_blind, self.current_bet)
-            self.raise_blocked_seats = set()
-            self.acted_seats = {seat.seat_index}
+            self.raise_blocked_mask = 0
+            self.acted_mask = seat_bit
             seat.last_action = "bet"
             self._record_action(seat, "bet", bet_amount)
         elif action == ActionType.raise_:
             if self.current_bet == 0:
                 raise ValueError("Cannot raise without a bet")
-            if seat.seat_index in self.raise_blocked_seats:
+            if self.raise_blocked_mask & seat_bit:
                 raise ValueError("Raise not reopened")
             if amount <= self.current_bet:
                 raise ValueError("Raise amount too small")
             new_total = amount
             add_amount = new_total - player_commit
-            if add_amount > seat.stack:
+            if add_amount > stacks[index]:
                 raise ValueError("Insufficient stack")
             previous_bet = self.current_bet
             required_total = previous_bet + self.min_raise
-            prior_acted = set(self.acted_seats)
-            if new_total < required_total and add_amount != seat.stack:
+            prior_acted = self.acted_mask
+            if new_total < required_total and add_amount != stacks[index]:
                 raise ValueError("Raise below minimum")
-            seat.stack -= add_amount
+            stacks[index] -= add_amount
             self.pot += add_amount
-            self.street_contribs[seat.seat_index] = new_total
-            self.hand_contribs[seat.seat_index] += add_amount
-            seat.street_commit = new_total
-            if seat.stack == 0:
-                self.all_in_seats.add(seat.seat_index)
-                seat.is_all_in = True
+            pots.add(index, add_amount)
+            if stacks[index] == 0:
+                self._mark_all_in(seat)
             is_full_raise = new_total >= required_total
             self.current_bet = new_total
             if is_full_raise:
                 self.min_raise = new_total - previous_bet
-                self.raise_blocked_seats = set()
+                self.raise_blocked_mask = 0
             else:
-                self.raise_blocked_seats = prior_acted
-            self.acted_seats = {seat.seat_index}
+                self.raise_blocked_mask = prior_acted
+            self.acted_mask = seat_bit
             seat.last_action = "raise"
             self._record_action(
                 seat,
                 "raise",
-                self.street_contribs[seat.seat_index],
+                street_contribs[index],
             )
         elif action == ActionType.all_in:
-            if seat.stack == 0:
+            if stacks[index] == 0:
                 raise ValueError("Player has no stack")
-            all_in_amount = seat.stack + player_commit
-            seat.stack = 0
+            all_in_amount = stacks[index] + player_commit
+            stacks[index] = 0
             previous_bet = self.current_bet
             required_total = previous_bet + self.min_raise
-            prior_acted = set(self.acted_seats)
+            prior_acted = self.acted_mask
             self.pot += all_in_amount - player_commit
-            self.street_contribs[seat.seat_index] = all_in_amount
-            self.hand_contribs[seat.seat_index] += all_in_amount - player_commit
-            self.all_in_seats.add(seat.seat_index)
+            pots.add(index, all_in_amount - player_commit)
+            self._mark_all_in(seat)
             self.current_bet = max(self.current_bet, all_in_amount)
-            seat.is_all_in = True
-            seat.street_commit = self.street_contribs[seat.seat_index]
-            
-
-            
             is_full_raise = all_in_amount >= required_total
             if is_full_raise:
                 self.min_raise = all_in_amount - previous_bet
-                self.raise_blocked_seats = set()
+                self.raise_blocked_mask = 0
             else:
-                self.raise_blocked_seats = prior_acted
-            self.acted_seats = {seat.seat_index}
+                self.raise_blocked_mask = prior_acted
+            self.acted_mask = seat_bit
             seat.last_action = "all-in"
             self._record_action(
                 seat,
@@ -1089,7 +1193,7 @@ class GameTable:
             if safety > self.max_players * 4:
                 return
             seat_index = self.current_turn_seat
-            if seat_index in self.folded_seats or seat_index in self.all_in_seats:
+            if (self.folded_mask | self.all_in_mask) >> seat_index & 1:
                 self._advance_turn_or_street()
                 safety += 1
                 continue
@@ -1098,7 +1202,7 @@ class GameTable:
                 self._advance_turn_or_street()
                 safety += 1
                 continue
-            player_commit = self.street_contribs.get(seat_index, 0)
+            player_commit = self.street_contribs[seat_index]
             to_call = max(0, self.current_bet - player_commit)
             action = ActionType.check if to_call == 0 else ActionType.fold
             self.record_action(
@@ -1126,7 +1230,7 @@ class GameTable:
         return True
 
     def _record_action(
-        self, seat: SeatState, action: str, amount: Optional[int] = None, detail: Optional[str] = None
+        self, seat: TableSeat, action: str, amount: Optional[int] = None, detail: Optional[str] = None
     ) -> None:
         self.action_history.append(
             ActionRecord(
@@ -1140,7 +1244,7 @@ class GameTable:
         )
 
     def _hand_over(self) -> bool:
-        return len(self._in_hand_seat_indices()) <= 1
+        return self._in_hand_mask().bit_count() <= 1
 
     def should_auto_runout(self) -> bool:
         if self.street not in (Street.preflop, Street.flop, Street.turn, Street.river):
@@ -1149,14 +1253,12 @@ class GameTable:
             return False
         if not self._street_complete():
             return False
-        in_hand = self._in_hand_seat_indices()
+        in_hand = self._in_hand_mask()
         if not in_hand:
             return False
-        active = [seat for seat in in_hand if not self._is_all_in_like(seat)]
-        all_in_like = [seat for seat in in_hand if self._is_all_in_like(seat)]
-        if not all_in_like:
+        if not in_hand & self.all_in_mask:
             return False
-        return len(active) <= 1
+        return (in_hand & ~self.all_in_mask).bit_count() <= 1
 
     def advance_auto_runout(self) -> bool:
         if not self.should_auto_runout():
@@ -1165,29 +1267,25 @@ class GameTable:
         return True
 
     def _street_complete(self) -> bool:
-        active = self._active_seat_indices()
+        active = self._active_mask()
         if not active:
             return True
-        if len(active) == 1:
-            seat_index = active[0]
-            player_commit = self.street_contribs.get(seat_index, 0)
+        if active & (active - 1) == 0:
+            seat_index = active.bit_length() - 1
+            player_commit = self.street_contribs[seat_index]
             if self.current_bet == 0 or player_commit == self.current_bet:
                 return True
         if self.current_bet == 0:
-            return all(seat_index in self.acted_seats for seat_index in active)
+            return active & ~self.acted_mask == 0
         if (
             self.street == Street.preflop
             and self.current_bet == self.big_blind
             and self.big_blind_seat is not None
-            and self.big_blind_seat in self._in_hand_seat_indices()
-            and self.big_blind_seat not in self.all_in_seats
-            and self.big_blind_seat not in self.acted_seats
+            and (active & ~self.acted_mask) >> self.big_blind_seat & 1
         ):
             return False
-        for seat_index in self._in_hand_seat_indices():
-            if seat_index in self.all_in_seats:
-                continue
-            if self.street_contribs.get(seat_index, 0) != self.current_bet:
+        for seat_index in self._seats_in[active]:
+            if self.street_contribs[seat_index] != self.current_bet:
                 return False
         return True
 
@@ -1195,9 +1293,8 @@ class GameTable:
         if self.current_bet == 0:
             return
         contributions = {
-            seat_index: self.street_contribs.get(seat_index, 0)
-            for seat_index in range(self.max_players)
-            if self.seats[seat_index].email
+            seat_index: self.street_contribs[seat_index]
+            for seat_index in self._seats_in[self.occupied_mask]
         }
         if not contributions:
             return
@@ -1215,17 +1312,10 @@ class GameTable:
         if refund <= 0:
             return
         seat_index = max_seats[0]
-        seat = self.seats[seat_index]
-        seat.stack += refund
+        self.stacks[seat_index] += refund
         self.pot -= refund
-        self.hand_contribs[seat_index] = max(
-            0, self.hand_contribs.get(seat_index, 0) - refund
-        )
-        self.street_contribs[seat_index] = max(
-            0, self.street_contribs.get(seat_index, 0) - refund
-        )
-        seat.street_commit = self.street_contribs[seat_index]
-        self.current_bet = max(self.street_contribs.values(), default=0)
+        self.pots.refund(seat_index, refund)
+        self.current_bet = max(self.street_contribs, default=0)
         # Note: refunding uncalled bet affects stacks/pot, but we don't need to
         # include a refund record in the action history.
 
@@ -1233,6 +1323,7 @@ class GameTable:
         if self._hand_over():
             self._refund_uncalled_bet()
             self.street = Street.settlement
+            self.pots.close_street()
             self.current_turn_seat = None
             self.action_history.append(
                 ActionRecord(action="hand_end", street=self.street)
@@ -1245,9 +1336,11 @@ class GameTable:
                 self._advance_street(auto_runout=True)
             else:
                 self._advance_street()
-            return
-        next_seat = self._next_active_seat(self.current_turn_seat or 0)
-        self.current_turn_seat = next_seat
+        else:
+            next_seat = self._next_active_seat(self.current_turn_seat or 0)
+            self.current_turn_seat = next_seat
+        if self.pre_actions:
+            self._fire_pre_action()
 
     def _advance_street(self, *, auto_runout: bool = False) -> None:
         if self.street == Street.preflop:
@@ -1258,6 +1351,7 @@ class GameTable:
             self.street = Street.river
         elif self.street == Street.river:
             self.street = Street.showdown
+            self.pots.close_street()
             self.current_turn_seat = None
             self.action_history.append(
                 ActionRecord(action="showdown", street=self.street)
@@ -1266,6 +1360,7 @@ class GameTable:
             return
         else:
             self.street = Street.showdown
+            self.pots.close_street()
             self.current_turn_seat = None
             return
         self._reset_street_state()
@@ -1309,25 +1404,27 @@ class GameTable:
         seats = []
         connected = connected_emails or set()
         for seat in self.seats:
+            is_bot = seat.seat_index in self.bot_seats
             is_connected = True
-            if seat.email and connected_emails is not None:
+            if seat.email and connected_emails is not None and not is_bot:
                 is_connected = seat.email in connected
             seats.append(
                 SeatState(
                     seat_index=seat.seat_index,
                     email=seat.email,
                     name=seat.name,
-                    stack=seat.stack,
+                    stack=self.stacks[seat.seat_index],
                     hand_start_stack=self.hand_start_stack_by_seat_index.get(seat.seat_index),
                     position=positions.get(seat.seat_index),
                     last_action=seat.last_action,
                     hole_cards=seat.hole_cards,
                     is_connected=is_connected,
                     is_ready=seat.is_ready,
-                    is_folded=seat.seat_index in self.folded_seats,
+                    is_folded=bool(self.folded_mask >> seat.seat_index & 1),
                     is_all_in=self._is_all_in_like(seat.seat_index),
-                    street_commit=self.street_contribs.get(seat.seat_index, 0),
-                    raise_blocked=seat.seat_index in self.raise_blocked_seats,
+                    street_commit=self.street_contribs[seat.seat_index],
+                    raise_blocked=bool(self.raise_blocked_mask >> seat.seat_index & 1),
+                    is_bot=is_bot,
                 )
             )
         return TableState(
@@ -1338,8 +1435,8 @@ class GameTable:
             dealer_seat=self.dealer_seat,
             street=self.street,
             pot=self.pot,
-            pot_breakdown_excl_current_street=self._build_pot_amounts(
-                self._contribs_excluding_current_street()
+            pot_breakdown_excl_current_street=self.pots.amounts(
+                self._in_hand_mask(), self.folded_mask
             ),
             current_bet=self.current_bet,
             min_raise=self.min_raise,
@@ -1399,8 +1496,9 @@ class GameTable:
         connected = connected_emails or set()
         seats: List[SeatState] = []
         for seat in self.seats:
+            is_bot = seat.seat_index in self.bot_seats
             is_connected = True
-            if seat.email and connected_emails is not None:
+            if seat.email and connected_emails is not None and not is_bot:
                 is_connected = seat.email in connected
 
             hole_cards_out: Optional[List[str]] = None
@@ -1409,7 +1507,7 @@ class GameTable:
                 if viewer_email and seat.email == viewer_email:
                     hole_cards_out = seat.hole_cards
                 # Show actual cards during showdown (only non-folded seats)
-                elif (has_showdown or auto_runout) and seat.seat_index not in self.folded_seats:
+                elif (has_showdown or auto_runout) and not self.folded_mask >> seat.seat_index & 1:
                     hole_cards_out = seat.hole_cards
                 # Show actual cards if explicitly revealed in uncontested settlement
                 elif self.street == Street.settlement and seat.email and seat.email in revealed_ids:
@@ -1423,20 +1521,27 @@ class GameTable:
                     seat_index=seat.seat_index,
                     email=seat.email,
                     name=seat.name,
-                    stack=seat.stack,
+                    stack=self.stacks[seat.seat_index],
                     hand_start_stack=self.hand_start_stack_by_seat_index.get(seat.seat_index),
                     position=positions.get(seat.seat_index),
                     last_action=seat.last_action,
                     hole_cards=hole_cards_out,
                     is_connected=is_connected,
                     is_ready=seat.is_ready,
-                    is_folded=seat.seat_index in self.folded_seats,
+                    is_folded=bool(self.folded_mask >> seat.seat_index & 1),
                     is_all_in=self._is_all_in_like(seat.seat_index),
-                    street_commit=self.street_contribs.get(seat.seat_index, 0),
-                    raise_blocked=seat.seat_index in self.raise_blocked_seats,
+                    street_commit=self.street_contribs[seat.seat_index],
+                    raise_blocked=bool(self.raise_blocked_mask >> seat.seat_index & 1),
+                    is_bot=is_bot,
                 )
             )
 
+        legal_actions = None
+        viewer_seat = self._find_seat(viewer_email) if viewer_email else None
+        if viewer_seat is not None and viewer_seat.seat_index == self.current_turn_seat:
+            legal_actions = self.legal_actions(viewer_seat.seat_index)
+        pre_action = self.pre_action_for(viewer_seat.seat_index) if viewer_seat else None
+
         return TableState(
             table_id=self.table_id,
             small_blind=self.small_blind,
@@ -1445,8 +1550,8 @@ class GameTable:
             dealer_seat=self.dealer_seat,
             street=self.street,
             pot=self.pot,
-            pot_breakdown_excl_current_street=self._build_pot_amounts(
-                self._contribs_excluding_current_street()
+            pot_breakdown_excl_current_street=self.pots.amounts(
+                self._in_hand_mask(), self.folded_mask
             ),
             current_bet=self.current_bet,
             min_raise=self.min_raise,
@@ -1454,16 +1559,28 @@ class GameTable:
             seats=seats,
             action_history=sanitized_action_history,
             current_turn_seat=self.current_turn_seat,
+            legal_actions=legal_actions,
+            pre_action=pre_action,
             hand_number=self.hand_number,
             save_earnings=self.save_earnings,
         )
 
 
+def _encode_message(message: dict) -> str:
+    # Same encoding as Starlette's send_json, done here so the size is known.
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
 class ConnectionManager:
     def __init__(self) -> None:
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         self.socket_players: Dict[WebSocket, str] = {}
         self.socket_tables: Dict[WebSocket, str] = {}
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        # UTF-8 bytes per character of non-ASCII frames, re-measured every 32nd one.
+        self._utf8_ratio = 1.0
+        self._non_ascii_frames = 0
 
     async def connect(self, table_id: str, websocket: WebSocket) -> None:
         await websocket.accept()
@@ -1487,12 +1604,27 @@ class ConnectionManager:
         self.socket_tables.pop(websocket, None)
 
     async def broadcast(self, table_id: str, message: dict) -> None:
+        text = _encode_message(message)
         for connection in list(self.active_connections.get(table_id, set())):
             try:
-                await connection.send_json(message)
+                await self._send_text(connection, text)
             except Exception:
                 pass
 
     async def send(self, websocket: WebSocket, message: dict) -> None:
-        await websocket.send_json(message)
+        await self._send_text(websocket, _encode_message(message))
+
+    async def _send_text(self, websocket: WebSocket, text: str) -> None:
+        await websocket.send_text(text)
+        self.frames_sent += 1
+        # isascii() is O(1). Table states carry card suits, so they are rarely
+        # ASCII; encoding each one just to count it costs more than the whole
+        # metrics budget, so their size is estimated from a sampled ratio.
+        if text.isascii():
+            self.bytes_sent += len(text)
+            return
+        if self._non_ascii_frames % 32 == 0:
+            self._utf8_ratio = len(text.encode("utf-8")) / len(text)
+        self._non_ascii_frames += 1
+        self.bytes_sent += round(len(text) * self._utf8_ratio)
 
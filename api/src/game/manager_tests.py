@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+import random
+import sys
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from game.manager import GameTable  # noqa: E402
+from game.models import ActionPayload, ActionType, PreActionKind, Street  # noqa: E402
+from game.simulation import build_table  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _table(players: int) -> GameTable:
+    table = GameTable(table_id="test")
+    for seat_index in range(players):
+        table.reserve_seat(f"p{seat_index}", f"p{seat_index}", seat_index)
+    table.start_new_hand()
+    return table
+
+
+def _act(table: GameTable, action: ActionType, amount: int | None = None) -> None:
+    seat = table.seats[table.current_turn_seat]
+    table.record_action(ActionPayload(email=seat.email, action=action, amount=amount))
+
+
+def _big_blind_keeps_option() -> None:
+    # 3-handed: dealer=1 -> SB=2, BB=0, UTG=1.
+    table = _table(3)
+    _assert_equal((table.dealer_seat, table.big_blind_seat), (1, 0))
+    _act(table, ActionType.call)
+    _act(table, ActionType.call)
+    _assert_equal((table.street, table.current_turn_seat), (Street.preflop, 0))
+    _act(table, ActionType.check)
+    _assert_equal(table.street, Street.flop)
+    _assert_equal(table.current_turn_seat, 2)
+
+
+def _short_all_in_does_not_reopen() -> None:
+    table = _table(3)
+    table.seats[2].stack = 5  # SB: 1 posted, 5 behind
+    _act(table, ActionType.raise_, 9)  # UTG raises to 9
+    _act(table, ActionType.all_in)  # SB all-in for 6 total: not a raise at all
+    _act(table, ActionType.raise_, 20)  # BB re-raises (full)
+    _act(table, ActionType.call)  # UTG calls 20
+    _assert_equal(table.street, Street.flop)
+    _assert_equal(table.should_auto_runout(), False)
+
+    table = _table(3)
+    table.seats[0].stack = 9  # BB: 3 posted, 9 behind
+    _act(table, ActionType.raise_, 9)  # UTG raises to 9 (min raise 6)
+    _act(table, ActionType.call)  # SB calls 9
+    _act(table, ActionType.all_in)  # BB all-in to 12 < 15: short, does not reopen
+    _assert_equal(table._is_all_in_like(0), True)
+    _assert_equal(table.raise_blocked_mask, 0b110)
+    try:
+        _act(table, ActionType.raise_, 30)
+    except ValueError as exc:
+        _assert_equal(str(exc), "Raise not reopened")
+    else:
+        raise AssertionError("raise should not be reopened")
+    _act(table, ActionType.call)
+    _act(table, ActionType.call)
+    _assert_equal(table.street, Street.flop)
+
+
+def _side_pot_breakdown() -> None:
+    table = _table(3)
+    table.seats[1].stack = 20  # UTG short stack
+    _act(table, ActionType.all_in)  # UTG all-in for 20
+    _act(table, ActionType.call)  # SB calls 20
+    _act(table, ActionType.raise_, 60)  # BB raises to 60
+    _assert_equal(table.to_state_for("p0").pot_breakdown_excl_current_street, [])
+    _act(table, ActionType.fold)  # SB folds: its 20 is now settled dead money
+    # The hand runs out; SB's chips sit in the main pot, BB's uncalled 40 is refunded.
+    _assert_equal(table.to_state_for("p0").pot_breakdown_excl_current_street, [60])
+    _assert_equal(table.pots.pots(table._in_hand_mask(), table.folded_mask), [(60, [0, 1])])
+    while table.advance_auto_runout():
+        pass
+    _assert_equal(table.street, Street.settlement)
+    _assert_equal(sum(table.pending_payouts.values()), 60)
+
+
+def _fold_to_winner_settles() -> None:
+    table = _table(2)
+    _act(table, ActionType.fold)
+    _assert_equal(table.street, Street.settlement)
+    # BB's uncalled 2 chips are refunded; only SB's blind is won.
+    _assert_equal(sum(table.pending_payouts.values()), 2)
+    _assert_equal(table._hand_over(), True)
+
+
+def _legal_actions_for_acting_seat() -> None:
+    table = _table(3)
+    table.seats[0].stack = 9  # BB: 3 posted, 9 behind
+    legal = table.to_state_for("p1").legal_actions  # UTG facing the big blind
+    _assert_equal((legal.seat_index, legal.to_call, legal.can_check), (1, 3, False))
+    _assert_equal((legal.can_raise, legal.min_total, legal.max_total), (True, 6, 300))
+    _assert_equal(table.to_state_for("p0").legal_actions, None)
+    _act(table, ActionType.raise_, 9)
+    _act(table, ActionType.call)
+    legal = table.legal_actions(0)  # BB: all-in to 12 is the only "raise"
+    _assert_equal((legal.to_call, legal.min_total, legal.max_total), (6, 12, 12))
+    _act(table, ActionType.all_in)
+    legal = table.legal_actions(1)
+    _assert_equal((legal.raise_reopened, legal.can_raise, legal.can_all_in), (False, False, False))
+    _assert_equal((legal.can_call, legal.call_amount), (True, 3))
+
+    # Nobody left to respond: a bet is not offered, only the check.
+    table = _table(3)
+    _act(table, ActionType.call)
+    _act(table, ActionType.call)
+    _act(table, ActionType.check)
+    table.all_in_mask |= 0b011
+    legal = table.legal_actions(2)
+    _assert_equal((legal.can_check, legal.can_bet, legal.can_all_in), (True, False, False))
+
+
+def _offered_actions_are_accepted() -> None:
+    # Whatever the table offers must pass record_action's own checks.
+    rng = random.Random(7)
+    table = GameTable(table_id="test", rng=rng)
+    for seat_index in range(6):
+        table.reserve_seat(f"p{seat_index}", f"p{seat_index}", seat_index)
+    for _ in range(200):
+        table.start_new_hand()
+        while table.street in (Street.preflop, Street.flop, Street.turn, Street.river):
+            if table.current_turn_seat is None:
+                if not table.advance_auto_runout():
+                    break
+                continue
+            legal = table.legal_actions(table.current_turn_seat)
+            offered = [ActionType.fold]
+            offered += [ActionType.check] if legal.can_check else []
+            offered += [ActionType.call] if legal.can_call else []
+            offered += [ActionType.bet] if legal.can_bet else []
+            offered += [ActionType.raise_] if legal.can_raise else []
+            offered += [ActionType.all_in] if legal.can_all_in else []
+            action = rng.choice(offered)
+            amount = None
+            if action in (ActionType.bet, ActionType.raise_):
+                amount = rng.randint(legal.min_total, legal.max_total)
+            _act(table, action, amount)
+        while table.advance_auto_runout():
+            pass
+        table.complete_settlement()
+
+
+def _pre_actions_fire_on_turn() -> None:
+    # 3-handed: UTG=1, SB=2, BB=0. SB and BB queue before UTG acts.
+    table = _table(3)
+    table.set_pre_action("p2", PreActionKind.call_any)
+    table.set_pre_action("p0", PreActionKind.check_fold)
+    _act(table, ActionType.call)  # UTG limps: SB calls, BB checks, all in one go
+    _assert_equal(table.street, Street.flop)
+    _assert_equal([r.action for r in table.action_history[-4:-1]], ["call", "call", "check"])
+    # call_any is used up; check_fold, having checked, ended with the street.
+    _assert_equal(table.pre_actions, {})
+    table.set_pre_action("p0", PreActionKind.check_fold)
+    _act(table, ActionType.check)  # SB checks, BB auto-checks
+    _assert_equal(table.current_turn_seat, 1)
+    _act(table, ActionType.bet, 6)  # UTG bets: SB to act, BB still folds to a bet this street
+    _act(table, ActionType.call)
+    _assert_equal(table.street, Street.turn)
+    _assert_equal(table.folded_mask, 0b001)
+    _assert_equal(table.pre_actions, {})
+
+
+def _call_pre_action_dropped_when_bet_changes() -> None:
+    table = _table(3)
+    try:
+        table.set_pre_action("p0", PreActionKind.call, 3)  # BB: nothing to call yet
+    except ValueError as exc:
+        _assert_equal(str(exc), "Nothing to call")
+    else:
+        raise AssertionError("call pre-action needs a bet to call")
+    table.set_pre_action("p2", PreActionKind.call, 3)  # SB: call the big blind
+    _assert_equal(table.to_state_for("p2").pre_action.amount, 3)
+    _act(table, ActionType.raise_, 9)  # UTG raises: the queued call is stale
+    _assert_equal(table.current_turn_seat, 2)
+    _assert_equal(table.pre_actions, {})
+    _assert_equal(table.to_state_for("p2").pre_action, None)
+
+
+def _immediate_pre_action_plays_past_auto_play_seats() -> None:
+    # UTG=1 is already to act; SB=2 has disconnected and is on auto-play.
+    table = _table(3)
+    table.set_auto_play("p2", True)
+    applied = table.set_pre_action("p1", PreActionKind.call_any)
+    _assert_equal(applied.action, ActionType.call)
+    # SB auto-folds, so the turn lands on BB instead of stalling on seat 2.
+    _assert_equal(table.folded_mask, 0b100)
+    _assert_equal(table.current_turn_seat, 0)
+
+
+def _bots_are_left_out_of_earnings() -> None:
+    table = GameTable(table_id="test")
+    table.reserve_seat("p0", "p0", 0)
+    table.add_bot("bot", 1)
+    table.start_new_hand()
+    _act(table, ActionType.fold)  # heads-up: the bot is SB and folds to the human BB
+    _assert_equal(table.street, Street.settlement)
+    _assert_equal([update["email"] for update in table.build_earnings_updates()], ["p0"])
+
+
+def _headless_hands_conserve_chips() -> None:
+    for players, agent in ((2, "random"), (3, "call"), (6, "random")):
+        # strict runner raises on any chip-conservation / earnings mismatch
+        report = build_table(players, agent, seed=players).run(300)
+        _assert_equal(report.hands, 300)
+        _assert_equal(report.invariant_failures, 0)
+
+
+def run() -> None:
+    _big_blind_keeps_option()
+    _short_all_in_does_not_reopen()
+    _side_pot_breakdown()
+    _fold_to_winner_settles()
+    _legal_actions_for_acting_seat()
+    _offered_actions_are_accepted()
+    _pre_actions_fire_on_turn()
+    _call_pre_action_dropped_when_bet_changes()
+    _immediate_pre_action_plays_past_auto_play_seats()
+    _bots_are_left_out_of_earnings()
+    _headless_hands_conserve_chips()
+
+
+if __name__ == "__main__":
+    run()
+    print("manager_tests: ok")
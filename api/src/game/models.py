@@ -25,6 +25,12 @@ class ActionType(str, Enum):
     all_in = "all-in"
 
 
+class PreActionKind(str, Enum):
+    check_fold = "check_fold"
+    call_any = "call_any"
+    call = "call"
+
+
 class PlayerInfo(BaseModel):
     email: str
     name: str
@@ -47,6 +53,7 @@ class SeatState(BaseModel):
     is_all_in: bool = False
     street_commit: int = 0
     raise_blocked: bool = False
+    is_bot: bool = False
 
 
 class ActionRecord(BaseModel):
@@ -58,6 +65,33 @@ class ActionRecord(BaseModel):
     detail: Optional[str] = None
 
 
+class LegalActions(BaseModel):
+    """What the acting seat may do right now (sent only to that seat)."""
+
+    seat_index: int
+    to_call: int
+    # Chips a call actually puts in (short stacks call all-in).
+    call_amount: int
+    can_check: bool
+    can_call: bool
+    can_bet: bool
+    can_raise: bool
+    can_all_in: bool
+    # False after a short all-in: this seat may only call or fold.
+    raise_reopened: bool
+    # Street totals for bet/raise sizing: min_total is clamped to max_total (all-in).
+    min_total: int
+    max_total: int
+
+
+class PreAction(BaseModel):
+    """An action queued before the seat's turn (sent only to that seat)."""
+
+    kind: PreActionKind
+    # `call`: the bet being called; the pre-action is dropped once it changes.
+    amount: Optional[int] = None
+
+
 class TableState(BaseModel):
     table_id: str
     small_blind: int
@@ -75,6 +109,8 @@ class TableState(BaseModel):
     seats: List[SeatState] = Field(default_factory=list)
     action_history: List[ActionRecord] = Field(default_factory=list)
     current_turn_seat: Optional[int] = None
+    legal_actions: Optional[LegalActions] = None
+    pre_action: Optional[PreAction] = None
     hand_number: int = 0
     save_earnings: bool = False
 
@@ -96,6 +132,23 @@ class ReserveSeatPayload(BaseModel):
     seat_index: int
 
 
+class PreActionPayload(BaseModel):
+    email: str
+    # None clears the queued pre-action.
+    kind: Optional[PreActionKind] = None
+    amount: Optional[int] = None
+
+
+class AddBotPayload(BaseModel):
+    seat_index: int
+    strategy: str = "call"
+    name: Optional[str] = None
+
+
+class RemoveBotPayload(BaseModel):
+    seat_index: int
+
+
 class RevealHandPayload(BaseModel):
     email: str
 
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+Job = Callable[[], Awaitable[None]]
+
+
+class TablePipeline:
+    """
+    Background job queue owned by a table.
+
+    Slow table follow-ups (paced runout steps, settlement, the delayed next deal)
+    are submitted here instead of being awaited inside a player's receive loop,
+    so every socket keeps reading while they run.
+
+    - Jobs run one at a time in submission order, so they never interleave with
+      each other; each job re-checks the table state it acts on.
+    - `submit` returns immediately; the worker task only exists while jobs are
+      queued and is restarted by the next `submit`.
+    - A failing job is reported to the loop's exception handler and does not
+      stop the jobs behind it.
+    """
+
+    def __init__(self, name: str = "table") -> None:
+        self.name = name
+        self._queue: asyncio.Queue[Job] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, job: Job) -> None:
+        self._queue.put_nowait(job)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def drain(self) -> None:
+        """Wait until every job submitted so far has finished."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            try:
+                await job()
+            except asyncio.CancelledError:
+                self._queue.task_done()
+                raise
+            except Exception as exc:
+                loop.call_exception_handler(
+                    {"message": f"{self.name} pipeline job failed", "exception": exc}
+                )
+            self._queue.task_done()
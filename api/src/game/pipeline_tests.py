@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from typing import List
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from game.pipeline import TablePipeline  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+async def _jobs_run_in_order_off_the_caller() -> None:
+    pipeline = TablePipeline()
+    events: List[str] = []
+
+    async def slow(name: str) -> None:
+        await asyncio.sleep(0.05)
+        events.append(name)
+
+    pipeline.submit(lambda: slow("runout"))
+    pipeline.submit(lambda: slow("next hand"))
+    # submit() returns at once: the caller keeps serving its socket meanwhile.
+    events.append("caller")
+    _assert_equal(len(pipeline), 2)
+    await pipeline.drain()
+    _assert_equal(events, ["caller", "runout", "next hand"])
+    await pipeline.close()
+
+
+async def _failed_job_does_not_stop_the_queue() -> None:
+    loop = asyncio.get_running_loop()
+    reported: List[str] = []
+    loop.set_exception_handler(lambda _loop, context: reported.append(context["message"]))
+    pipeline = TablePipeline("t1")
+    events: List[str] = []
+
+    async def boom() -> None:
+        raise RuntimeError("boom")
+
+    async def after() -> None:
+        events.append("after")
+
+    pipeline.submit(boom)
+    pipeline.submit(after)
+    await pipeline.drain()
+    _assert_equal(events, ["after"])
+    _assert_equal(reported, ["t1 pipeline job failed"])
+    # The worker restarts on the next submit after going idle.
+    pipeline.submit(after)
+    await pipeline.drain()
+    _assert_equal(events, ["after", "after"])
+    await pipeline.close()
+
+
+def run() -> None:
+    asyncio.run(_jobs_run_in_order_off_the_caller())
+    asyncio.run(_failed_job_does_not_stop_the_queue())
+
+
+if __name__ == "__main__":
+    run()
+    print("pipeline_tests: ok")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+
+class PotLedger:
+    """
+    Per-hand chip ledger with a cached main/side pot breakdown.
+
+    Chips go in through `add` (blinds, calls, bets, raises, all-ins) and come back
+    through `refund` (uncalled bets). `hand_contribs` / `street_contribs` are the
+    per-seat arrays the table reads directly; they are zeroed in place.
+
+    Pots are split by what is already settled: everything committed on earlier
+    streets plus the current-street chips of folded seats (those can no longer be
+    raised or refunded). While a betting round is open, `add`/`refund` by a live
+    seat only move chips within the current street, so the settled pots do not
+    change and nothing is recomputed. The segments are rebuilt only when the
+    settled amounts or the set of eligible seats change (a fold, a street
+    boundary, a new hand, a seat leaving), and are read back in O(1) otherwise.
+    The same segments, with their eligible seats, are used for settlement.
+    """
+
+    def __init__(self, max_players: int) -> None:
+        self.max_players = max_players
+        self._zeros = (0,) * max_players
+        self.hand_contribs: List[int] = [0] * max_players
+        self.street_contribs: List[int] = [0] * max_players
+        self.street_open = False
+        self._version = 0
+        self._cache_key: Optional[Tuple[int, int, int]] = None
+        self._pots: List[Tuple[int, List[int]]] = []
+        self._amounts: List[int] = []
+
+    def reset(self) -> None:
+        self.hand_contribs[:] = self._zeros
+        self.street_contribs[:] = self._zeros
+        self.street_open = True
+        self._version += 1
+
+    def open_street(self) -> None:
+        """Start a new betting round: current-street commits become settled."""
+        self.street_contribs[:] = self._zeros
+        self.street_open = True
+        self._version += 1
+
+    def close_street(self) -> None:
+        """Betting is over for the hand (showdown/settlement); settle everything."""
+        self.street_open = False
+        self._version += 1
+
+    def add(self, seat_index: int, amount: int) -> None:
+        self.hand_contribs[seat_index] += amount
+        self.street_contribs[seat_index] += amount
+        if not self.street_open:
+            self._version += 1
+
+    def refund(self, seat_index: int, amount: int) -> None:
+        self.hand_contribs[seat_index] = max(0, self.hand_contribs[seat_index] - amount)
+        self.street_contribs[seat_index] = max(0, self.street_contribs[seat_index] - amount)
+        if not self.street_open:
+            self._version += 1
+
+    def amounts(self, in_hand_mask: int, folded_mask: int) -> List[int]:
+        """Settled pot sizes: [main_pot, side_pot_1, ...] (folded chips included)."""
+        self._refresh(in_hand_mask, folded_mask)
+        return list(self._amounts)
+
+    def pots(self, in_hand_mask: int, folded_mask: int) -> List[Tuple[int, List[int]]]:
+        """Settled pots with the (ascending) seat indices eligible to win each."""
+        self._refresh(in_hand_mask, folded_mask)
+        return [(amount, list(eligible)) for amount, eligible in self._pots]
+
+    def _refresh(self, in_hand_mask: int, folded_mask: int) -> None:
+        key = (self._version, in_hand_mask, folded_mask)
+        if key == self._cache_key:
+            return
+        self._cache_key = key
+        self._rebuild(in_hand_mask, folded_mask)
+
+    def _settled_contribs(self, folded_mask: int) -> List[int]:
+        if not self.street_open:
+            return list(self.hand_contribs)
+        # A folded seat's current-street chips are already dead money in the pot.
+        return [
+            total if folded_mask >> seat_index & 1 else max(0, total - street)
+            for seat_index, (total, street) in enumerate(
+                zip(self.hand_contribs, self.street_contribs)
+            )
+        ]
+
+    def _rebuild(self, in_hand_mask: int, folded_mask: int) -> None:
+        self._pots = []
+        self._amounts = []
+        settled = self._settled_contribs(folded_mask)
+        contributions = [amount for amount in settled if amount > 0]
+        if not contributions or not in_hand_mask:
+            return
+        in_hand = [
+            seat_index for seat_index in range(self.max_players) if in_hand_mask >> seat_index & 1
+        ]
+        # Side pots only split where eligibility differs (all-in / short stack), so
+        # cap levels come from seats still in the hand; every seat's chips (folded
+        # ones included) are summed into those segments.
+        cap_levels = sorted({settled[seat_index] for seat_index in in_hand if settled[seat_index] > 0})
+        if not cap_levels:
+            # No cap among eligible seats: a single pot, all in-hand seats eligible.
+            total = sum(contributions)
+            self._pots = [(total, in_hand)]
+            self._amounts = [total]
+            return
+        previous = 0
+        for level in cap_levels:
+            pot_amount = 0
+            for amount in contributions:
+                pot_amount += max(0, min(amount, level) - previous)
+            if pot_amount > 0:
+                eligible = [seat_index for seat_index in in_hand if settled[seat_index] >= level]
+                self._pots.append((pot_amount, eligible))
+                self._amounts.append(pot_amount)
+            previous = level
+        # Dead money above the largest eligible cap (e.g. folded commits) joins the
+        # highest pot segment instead of creating a new side pot.
+        remainder = 0
+        for amount in contributions:
+            remainder += max(0, amount - previous)
+        if remainder > 0:
+            if self._pots:
+                last_amount, last_eligible = self._pots[-1]
+                self._pots[-1] = (last_amount + remainder, last_eligible)
+                self._amounts[-1] += remainder
+            else:
+                self._pots.append((remainder, in_hand))
+                self._amounts.append(remainder)
@@ -0,0 +1,169 @@
+"""
+Headless GameTable driver.
+
+Runs hands back to back with pluggable agents: no sockets, no delays and no
+settlement-gauge handshake. Each hand is checked for chip conservation so the
+driver doubles as a regression harness for rule changes.
+
+    cd api
+    python -m src.game.simulation --hands 10000 --players 6 --agent random
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from .agents import (
+    Agent,
+    CallingStationAgent,
+    CheckFoldAgent,
+    RandomAgent,
+    check_or_fold,
+    seat_view,
+)
+from .manager import GameTable
+from .models import ActionPayload, Street
+
+BETTING_STREETS = (Street.preflop, Street.flop, Street.turn, Street.river)
+
+
+@dataclass
+class SimulationReport:
+    hands: int = 0
+    actions: int = 0
+    illegal_actions: int = 0
+    showdowns: int = 0
+    invariant_failures: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def actions_per_second(self) -> float:
+        return self.actions / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hands} hands / {self.actions} actions in {self.elapsed:.3f}s "
+            f"-> {self.hands_per_second:,.0f} hands/s, {self.actions_per_second:,.0f} actions/s "
+            f"(showdowns={self.showdowns}, illegal={self.illegal_actions}, "
+            f"invariant_failures={self.invariant_failures})"
+        )
+
+
+class HeadlessRunner:
+    """Plays hands on `table`, asking `agents[seat_index]` for every decision."""
+
+    def __init__(
+        self,
+        table: GameTable,
+        agents: Dict[int, Agent],
+        *,
+        strict: bool = True,
+    ) -> None:
+        self.table = table
+        self.agents = agents
+        self.strict = strict
+        self.report = SimulationReport()
+
+    def run(self, hands: int) -> SimulationReport:
+        start = time.perf_counter()
+        for _ in range(hands):
+            if not self.play_hand():
+                break
+        self.report.elapsed += time.perf_counter() - start
+        return self.report
+
+    def play_hand(self) -> bool:
+        table = self.table
+        table.start_new_hand()
+        if table.street == Street.waiting:
+            return False
+        chips_in_play = sum(table.stacks) + table.pot
+        while table.street in BETTING_STREETS:
+            if table.current_turn_seat is None:
+                if not table.advance_auto_runout():
+                    break
+                continue
+            self._act(table.current_turn_seat)
+        while table.advance_auto_runout():
+            pass
+        if table.street == Street.settlement:
+            if any(record.action == "showdown" for record in table.action_history):
+                self.report.showdowns += 1
+            updates = table.build_earnings_updates()
+            self._check(
+                sum(table.stacks) + sum(table.pending_payouts.values()) == chips_in_play,
+                "chips not conserved",
+            )
+            self._check(
+                sum(int(update["chips_delta"]) for update in updates) == 0,
+                "earnings deltas do not sum to zero",
+            )
+            table.complete_settlement()
+        self.report.hands += 1
+        return True
+
+    def _act(self, seat_index: int) -> None:
+        table = self.table
+        view = seat_view(table, seat_index)
+        agent = self.agents.get(seat_index)
+        decision = agent.decide(view) if agent else check_or_fold(view)
+        try:
+            table.record_action(
+                ActionPayload(email=view.email, action=decision.action, amount=decision.amount)
+            )
+        except ValueError:
+            self.report.illegal_actions += 1
+            fallback = check_or_fold(view)
+            table.record_action(ActionPayload(email=view.email, action=fallback.action))
+        self.report.actions += 1
+
+    def _check(self, condition: bool, message: str) -> None:
+        if condition:
+            return
+        self.report.invariant_failures += 1
+        if self.strict:
+            raise AssertionError(f"hand {self.table.hand_number}: {message}")
+
+
+AGENT_FACTORIES: Dict[str, Callable[[random.Random], Agent]] = {
+    "random": lambda rng: RandomAgent(rng),
+    "call": lambda rng: CallingStationAgent(),
+    "checkfold": lambda rng: CheckFoldAgent(),
+}
+
+
+def build_table(
+    players: int,
+    agent: str = "random",
+    seed: Optional[int] = None,
+    max_players: int = 6,
+) -> HeadlessRunner:
+    rng = random.Random(seed)
+    table = GameTable(table_id="headless", max_players=max_players, rng=rng)
+    agents: Dict[int, Agent] = {}
+    for seat_index in range(players):
+        table.reserve_seat(f"bot{seat_index}@headless", f"bot{seat_index}", seat_index)
+        agents[seat_index] = AGENT_FACTORIES[agent](rng)
+    return HeadlessRunner(table, agents)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run GameTable hands headlessly.")
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--agent", choices=sorted(AGENT_FACTORIES), default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    runner = build_table(args.players, args.agent, args.seed)
+    print(runner.run(args.hands).summary())
+
+
+if __name__ == "__main__":
+    main()
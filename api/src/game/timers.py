@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+
+class TimerHandle:
+    """A scheduled wheel entry. Returned by `TimerWheel.schedule` for cancellation."""
+
+    __slots__ = ("key", "deadline_tick", "slot", "callback", "args", "cancelled")
+
+    def __init__(
+        self,
+        key: Optional[Hashable],
+        deadline_tick: int,
+        slot: int,
+        callback: Callable[..., Any],
+        args: tuple,
+    ) -> None:
+        self.key = key
+        self.deadline_tick = deadline_tick
+        self.slot = slot
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel shared by every delayed table event in the process.
+
+    - One driver task per wheel; it only runs while timers are pending.
+    - `schedule` / `cancel` are O(1): an entry lives in the dict of its slot
+      (`deadline_tick % slot_count`) until it fires or is cancelled.
+    - Entries may be keyed (e.g. `("leave", email)`); scheduling an existing key
+      replaces the previous entry, so per-player registries never leak.
+    - Callbacks may be plain functions or coroutine functions (the coroutine is
+      run as a task so a slow callback never delays the next tick).
+    """
+
+    def __init__(self, tick_seconds: float = 0.05, slot_count: int = 1024) -> None:
+        if tick_seconds <= 0:
+            raise ValueError("tick_seconds must be positive")
+        if slot_count <= 0:
+            raise ValueError("slot_count must be positive")
+        self.tick_seconds = tick_seconds
+        self.slot_count = slot_count
+        self._slots: List[Dict[TimerHandle, None]] = [{} for _ in range(slot_count)]
+        self._keyed: Dict[Hashable, TimerHandle] = {}
+        self._count = 0
+        self._tick = 0
+        self._origin = 0.0
+        self._driver: Optional[asyncio.Task] = None
+        self._callback_tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keyed
+
+    def schedule(
+        self,
+        delay: float,
+        callback: Callable[..., Any],
+        *args: Any,
+        key: Optional[Hashable] = None,
+    ) -> TimerHandle:
+        if key is not None:
+            self.cancel(key)
+        loop = asyncio.get_running_loop()
+        if self._driver is None or self._driver.done():
+            # Restart the clock from idle; no entries exist that depend on the old origin.
+            self._origin = loop.time()
+            self._tick = 0
+            self._driver = loop.create_task(self._run())
+        elapsed_ticks = (loop.time() - self._origin) / self.tick_seconds
+        deadline_tick = max(
+            self._tick + 1,
+            math.ceil(elapsed_ticks + max(0.0, delay) / self.tick_seconds),
+        )
+        slot = deadline_tick % self.slot_count
+        handle = TimerHandle(key, deadline_tick, slot, callback, args)
+        self._slots[slot][handle] = None
+        self._count += 1
+        if key is not None:
+            self._keyed[key] = handle
+        return handle
+
+    def cancel(self, handle_or_key: TimerHandle | Hashable) -> bool:
+        if isinstance(handle_or_key, TimerHandle):
+            handle = handle_or_key
+        else:
+            handle = self._keyed.get(handle_or_key)
+            if handle is None:
+                return False
+        if handle.cancelled or handle not in self._slots[handle.slot]:
+            return False
+        self._remove(handle)
+        return True
+
+    async def sleep(self, delay: float) -> None:
+        """`asyncio.sleep` replacement that rides on the wheel instead of a loop timer."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        handle = self.schedule(delay, _resolve_waiter, waiter)
+        try:
+            await waiter
+        finally:
+            self.cancel(handle)
+
+    async def close(self) -> None:
+        for slot in self._slots:
+            for handle in list(slot):
+                self._remove(handle)
+        if self._driver is not None:
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
+            self._driver = None
+
+    def _remove(self, handle: TimerHandle) -> None:
+        handle.cancelled = True
+        del self._slots[handle.slot][handle]
+        self._count -= 1
+        if handle.key is not None and self._keyed.get(handle.key) is handle:
+            del self._keyed[handle.key]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._count:
+            self._tick += 1
+            delay = self._origin + self._tick * self.tick_seconds - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._fire_due(loop)
+
+    def _fire_due(self, loop: asyncio.AbstractEventLoop) -> None:
+        slot = self._slots[self._tick % self.slot_count]
+        if not slot:
+            return
+        due = [handle for handle in slot if handle.deadline_tick <= self._tick]
+        for handle in due:
+            if handle.cancelled:
+                continue
+            self._remove(handle)
+            try:
+                result = handle.callback(*handle.args)
+            except Exception as exc:
+                loop.call_exception_handler(
+                    {"message": "timer wheel callback failed", "exception": exc}
+                )
+                continue
+            if asyncio.iscoroutine(result):
+                task = loop.create_task(result)
+                self._callback_tasks.add(task)
+                task.add_done_callback(self._callback_tasks.discard)
+
+
+def _resolve_waiter(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
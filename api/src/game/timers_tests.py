@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from typing import List
+
+_HERE = os.path.dirname(__file__)
+_SRC_ROOT = os.path.dirname(_HERE)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from game.timers import TimerWheel  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+async def _fires_in_deadline_order() -> None:
+    wheel = TimerWheel(tick_seconds=0.01, slot_count=8)
+    fired: List[str] = []
+    wheel.schedule(0.05, fired.append, "late")
+    wheel.schedule(0.01, fired.append, "early")
+    # Longer than one revolution of the wheel (8 * 0.01s).
+    wheel.schedule(0.12, fired.append, "wrapped")
+    await asyncio.sleep(0.2)
+    _assert_equal(fired, ["early", "late", "wrapped"])
+    _assert_equal(len(wheel), 0)
+
+
+async def _cancel_and_replace_by_key() -> None:
+    wheel = TimerWheel(tick_seconds=0.01, slot_count=8)
+    fired: List[str] = []
+    wheel.schedule(0.03, fired.append, "first", key=("leave", "a@example.com"))
+    wheel.schedule(0.05, fired.append, "second", key=("leave", "a@example.com"))
+    _assert_equal(len(wheel), 1)
+    handle = wheel.schedule(0.03, fired.append, "cancelled")
+    _assert_equal(wheel.cancel(handle), True)
+    _assert_equal(wheel.cancel(handle), False)
+    await asyncio.sleep(0.1)
+    _assert_equal(fired, ["second"])
+    _assert_equal(("leave", "a@example.com") in wheel, False)
+
+
+async def _async_callbacks_and_sleep() -> None:
+    wheel = TimerWheel(tick_seconds=0.01, slot_count=8)
+    fired: List[str] = []
+
+    async def callback(label: str) -> None:
+        fired.append(label)
+
+    wheel.schedule(0.02, callback, "async")
+    await wheel.sleep(0.05)
+    _assert_equal(fired, ["async"])
+    _assert_equal(len(wheel), 0)
+    await wheel.close()
+
+
+def run() -> None:
+    asyncio.run(_fires_in_deadline_order())
+    asyncio.run(_cancel_and_replace_by_key())
+    asyncio.run(_async_callbacks_and_sleep())
+
+
+if __name__ == "__main__":
+    run()
+    print("timers_tests: ok")
@@ -0,0 +1,140 @@
+"""
+Google ID token verification that never blocks the event loop.
+
+`id_token.verify_oauth2_token` with a fresh `requests.Request()` downloads
+Google's signing certificates on every call and runs on the calling thread.
+`GoogleTokenVerifier` instead:
+
+- keeps one pooled `requests.Session` for the certificate endpoint and caches
+  the certificates for the `max-age` Google sends (refetching early only when a
+  token names a key id we have not seen, i.e. after a key rotation, and at
+  most once a minute so forged key ids cannot make us hammer Google);
+- verifies on a small dedicated thread pool, so a login spike queues there
+  rather than on the loop or the default executor;
+- remembers successful verifications for `cache_seconds` (never past the
+  token's own `exp`), keyed by a SHA-256 of the token.
+
+`google.auth` and `requests` are imported on first use (or by `warm_up`, which
+the app runs in the background once it is serving), so they stay off the
+cold-start path.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleTokenVerifier:
+    def __init__(
+        self,
+        client_id: Optional[str],
+        cache_seconds: float = 60.0,
+        cache_size: int = 1024,
+        max_workers: int = 4,
+        clock_skew_seconds: int = 10,
+    ) -> None:
+        self.client_id = client_id
+        self.cache_seconds = cache_seconds
+        self.cache_size = cache_size
+        self.clock_skew_seconds = clock_skew_seconds
+        self.cert_fetches = 0
+        self._max_workers = max_workers
+        self._session: Optional["requests.Session"] = None
+        self._certs: Dict[str, str] = {}
+        self._certs_expire_at = 0.0
+        self._last_early_fetch = float("-inf")
+        self._certs_lock = threading.Lock()
+        self._verified: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="google-auth")
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Claims of a valid Google ID token for `client_id`; ValueError otherwise."""
+        key = hashlib.sha256(token.encode()).hexdigest()
+        cached = self._verified.get(key)
+        if cached is not None:
+            expires_at, claims = cached
+            if time.time() < expires_at:
+                self._verified.move_to_end(key)
+                return dict(claims)
+            del self._verified[key]
+        loop = asyncio.get_running_loop()
+        claims = await loop.run_in_executor(self._executor, self._verify_sync, token)
+        expires_at = min(time.time() + self.cache_seconds, float(claims.get("exp", 0)))
+        self._verified[key] = (expires_at, claims)
+        while len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+        return dict(claims)
+
+    async def warm_up(self) -> None:
+        """Import the verification stack (and prefetch certificates) off the loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._warm_up_sync)
+
+    def _warm_up_sync(self) -> None:
+        from google.auth import jwt  # noqa: F401
+
+        if self.client_id:
+            # Without a client id no token can verify, so skip the network call.
+            self._get_certs()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._session is not None:
+            self._session.close()
+
+    def _verify_sync(self, token: str) -> Dict[str, Any]:
+        from google.auth import jwt
+
+        key_id = jwt.decode_header(token).get("kid")
+        certs = self._get_certs(required_key_id=key_id)
+        claims = jwt.decode(
+            token,
+            certs=certs,
+            audience=self.client_id,
+            clock_skew_in_seconds=self.clock_skew_seconds,
+        )
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+        return claims
+
+    def _get_certs(self, required_key_id: Optional[str] = None) -> Dict[str, str]:
+        with self._certs_lock:
+            now = time.time()
+            if now < self._certs_expire_at:
+                if required_key_id is None or required_key_id in self._certs:
+                    return self._certs
+                if now - self._last_early_fetch < 60:
+                    return self._certs
+                self._last_early_fetch = now
+            certs, max_age = self._fetch_certs()
+            self.cert_fetches += 1
+            self._certs = dict(certs)
+            self._certs_expire_at = time.time() + max_age
+            return self._certs
+
+    def _fetch_certs(self) -> Tuple[Mapping[str, str], float]:
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self._max_workers))
+            self._session = session
+        response = self._session.get(GOOGLE_CERTS_URL, timeout=5)
+        if response.status_code != 200:
+            raise ValueError(f"Could not fetch Google certificates ({response.status_code})")
+        match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        return response.json(), float(match.group(1)) if match else 300.0
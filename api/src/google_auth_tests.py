@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+_SRC_ROOT = os.path.dirname(__file__)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from google_auth import GoogleTokenVerifier  # noqa: E402
+
+CLIENT_ID = "client.apps.googleusercontent.com"
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _signing_key(key_id: str):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, key_id)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    pem_key = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    signer = crypt.RSASigner.from_string(pem_key, key_id)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def _token(signer, issuer: str = "https://accounts.google.com", email: str = "a@example.com") -> str:
+    now = int(time.time())
+    payload = {"iss": issuer, "aud": CLIENT_ID, "sub": "1", "email": email, "iat": now, "exp": now + 3600}
+    return jwt.encode(signer, payload).decode()
+
+
+class _FakeGoogle(GoogleTokenVerifier):
+    def __init__(self, certs, max_age: float = 3600.0) -> None:
+        super().__init__(CLIENT_ID)
+        self.published = certs
+        self.max_age = max_age
+
+    def _fetch_certs(self):
+        return dict(self.published), self.max_age
+
+
+async def _certs_and_verifications_are_cached() -> None:
+    signer, cert = _signing_key("k1")
+    verifier = _FakeGoogle({"k1": cert})
+    token = _token(signer)
+    claims = await verifier.verify(token)
+    _assert_equal(claims["email"], "a@example.com")
+    await verifier.verify(token)
+    await verifier.verify(_token(signer, email="b@example.com"))
+    _assert_equal(verifier.cert_fetches, 1)
+    # Key rotation: an unknown kid refetches once, even inside max-age.
+    rotated, rotated_cert = _signing_key("k2")
+    verifier.published = {"k1": cert, "k2": rotated_cert}
+    await verifier.verify(_token(rotated))
+    _assert_equal(verifier.cert_fetches, 2)
+    verifier.close()
+
+
+async def _bad_tokens_raise_value_error() -> None:
+    signer, cert = _signing_key("k1")
+    verifier = _FakeGoogle({"k1": cert})
+    forged, _ = _signing_key("k1")
+    for token in (_token(signer, issuer="evil.example.com"), _token(forged), "not-a-jwt"):
+        try:
+            await verifier.verify(token)
+        except ValueError:
+            continue
+        raise AssertionError(f"token should have been rejected: {token[:20]}")
+    verifier.close()
+
+
+def run() -> None:
+    asyncio.run(_certs_and_verifications_are_cached())
+    asyncio.run(_bad_tokens_raise_value_error())
+
+
+if __name__ == "__main__":
+    run()
+    print("google_auth_tests: ok")
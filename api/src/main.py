@@ -1,37 +1,121 @@
 import asyncio
+import hashlib
+import json
 import os
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from contextlib import asynccontextmanager
+from datetime import date
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from dotenv import load_dotenv
 
+from . import firestore_client
 from .allowlist import AllowListStore
+from .google_auth import GoogleTokenVerifier
+from .metrics import MetricsRegistry, instrument
+from .profiling import ProfileCapture
+from .session_tokens import SessionTokens
+from .tracing import Tracer
+from .earnings import rollups
 from .earnings.store import EarningsStore
+from .earnings.writer import EarningsWriteBehind
+from .game.bots import BotController
 from .game.manager import ConnectionManager, GameTable
 from .game.models import (
     ActionPayload,
+    AddBotPayload,
     JoinTablePayload,
+    PreActionPayload,
+    RemoveBotPayload,
     ReserveSeatPayload,
     RevealHandPayload,
     Street,
 )
+from .game.pipeline import TablePipeline
+from .game.timers import TimerWheel
 
 # .envファイルを読み込む
 load_dotenv()
 
-app = FastAPI()
+
+async def warm_up() -> None:
+    # 重い依存（Firestore / google-auth）の import とクライアント生成は、
+    # ポートを開いて最初の応答を返してから裏で済ませる（コールドスタート短縮）
+    await asyncio.sleep(WARM_UP_DELAY_SECONDS)
+    for name, step in (("earnings", earnings_store.warm_up), ("google auth", google_verifier.warm_up)):
+        try:
+            await step()
+        except Exception as exc:
+            print(f"warm-up failed ({name}): {exc}")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # 署名鍵がプロセスごとのランダム値だと、再起動や別インスタンスで全員が 4401 → ログアウトになる
+    if session_tokens.ephemeral:
+        if WS_REQUIRE_SESSION:
+            raise RuntimeError("SESSION_SECRET must be set while WS_REQUIRE_SESSION is on")
+        print(
+            "WARNING: SESSION_SECRET is not set; session tokens use a random per-process key "
+            "and stop working after a restart or on another instance"
+        )
+    # lifespan はポートのバインド前に走るので、ここでは待たずにタスクだけ起動する
+    warm_up_task = asyncio.create_task(warm_up())
+    rollup_task = asyncio.create_task(compact_earnings_rollups())
+    leaderboard_task = asyncio.create_task(save_leaderboard_periodically())
+    yield
+    # 停止時: 未書き込みの収支を必ずフラッシュしてから各バックグラウンド処理を閉じる
+    warm_up_task.cancel()
+    rollup_task.cancel()
+    leaderboard_task.cancel()
+    await table_pipeline.close()
+    await earnings_writer.close()
+    try:
+        await earnings_store.save_leaderboard()
+    except Exception as exc:
+        print(f"leaderboard save failed: {exc}")
+    earnings_store.close()
+    await firestore_client.close()
+    await timer_wheel.close()
+    bots.close()
+    google_verifier.close()
+    await profile_capture.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
 manager = ConnectionManager()
 table = GameTable(table_id="default")
 earnings_store = EarningsStore()
+# Settlement only queues earnings deltas; they are merged per player and flushed
+# in the background (interval, size threshold, shutdown) with retry.
+EARNINGS_FLUSH_SECONDS = float(os.getenv("EARNINGS_FLUSH_SECONDS", "2.0"))
+earnings_writer = EarningsWriteBehind(earnings_store, flush_interval=EARNINGS_FLUSH_SECONDS)
+# Closed weeks/months are rolled up from day buckets on this interval.
+EARNINGS_ROLLUP_SECONDS = float(os.getenv("EARNINGS_ROLLUP_SECONDS", "3600"))
+EARNINGS_RANGE_MAX_DAYS = 731
+# Firestore のランキング上位ドキュメントは書き込みごとではなくこの間隔（と停止時）で保存する
+LEADERBOARD_SAVE_SECONDS = float(os.getenv("LEADERBOARD_SAVE_SECONDS", "60"))
 allowlist_store = AllowListStore()
+# /login/google issues these; /ws/game only checks the HMAC locally.
+session_tokens = SessionTokens()
+WS_REQUIRE_SESSION = os.getenv("WS_REQUIRE_SESSION", "1") != "0"
+WS_SESSION_CLOSE_CODE = 4401
+# Every delayed table event (leave grace, disconnect auto-play, next-hand delay,
+# runout steps) rides on this single wheel instead of a sleeping task per player.
+timer_wheel = TimerWheel()
+# Bot seats think on worker threads; a late decision falls back to check/fold.
+BOT_DECISION_SECONDS = float(os.getenv("BOT_DECISION_SECONDS", "2.0"))
+bots = BotController(decision_timeout=BOT_DECISION_SECONDS)
+# Heavy imports and clients are built this long after startup, once the port is
+# bound, so they do not compete with the first requests for the GIL.
+WARM_UP_DELAY_SECONDS = float(os.getenv("WARM_UP_DELAY_SECONDS", "1.0"))
+bot_turns_task: asyncio.Task | None = None
+# Runout pacing, settlement and the next deal run here, never in a socket's receive loop.
+table_pipeline = TablePipeline(table.table_id)
 HAND_DELAY_SECONDS = 1.0
 RUNOUT_DELAY_SECONDS = 2.6
 LEAVE_GRACE_SECONDS = 30.0
 GAUGE_COMPLETE_TIMEOUT_SECONDS = 30.0
-pending_leave_tasks: dict[str, asyncio.Task] = {}
-pending_disconnect_tasks: dict[str, asyncio.Task] = {}
 settlement_gauge_ready: set[str] = set()
 settlement_gauge_timeout_task: asyncio.Task | None = None
 
@@ -49,6 +133,79 @@ app.add_middleware(
 
 # Google Cloud Consoleで取得したクライアントIDを環境変数から読み込む
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+# 検証はイベントループ外で行い、証明書と検証結果はキャッシュする
+google_verifier = GoogleTokenVerifier(GOOGLE_CLIENT_ID)
+
+# ホットパスの計測（メモリ上のカウンタ/ヒストグラム、GET /metrics で Prometheus 形式）
+metrics = MetricsRegistry()
+# METRICS_TOKEN を設定すると /metrics は Bearer トークン必須
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+WS_MESSAGE_TYPES = frozenset(
+    {
+        "joinTable", "leaveTable", "leaveNow", "leaveAfterHand", "cancelLeaveAfterHand",
+        "action", "setPreAction", "nextHandGaugeComplete", "revealHand", "syncState",
+        "heartbeat", "reserveSeat", "addBot", "removeBot", "resetTable", "setSaveStats",
+        "requestManualTopup", "startHand",
+    }
+)
+ws_message_seconds = metrics.histogram(
+    "poker_ws_message_seconds", "Time to handle one WebSocket message, by type.", labelnames=("type",)
+)
+ws_phase_seconds = metrics.histogram(
+    "poker_ws_phase_seconds",
+    "Time per message in engine / serialize / fanout, by message type.",
+    labelnames=("type", "phase"),
+)
+# メッセージ種別ごとのスパン（engine / serialize / fanout の内訳）。遅いメッセージはログに出す
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "250"))
+tracer = Tracer(ws_message_seconds, ws_phase_seconds, slow_seconds=TRACE_SLOW_MS / 1000)
+ws_connections_total = metrics.counter(
+    "poker_ws_connections_total", "WebSocket handshakes, by result.", labelnames=("result",)
+)
+metrics.counter_func("poker_ws_sent_frames_total", "WebSocket frames sent.", lambda: manager.frames_sent)
+metrics.counter_func(
+    "poker_ws_sent_bytes_total",
+    "UTF-8 bytes of WebSocket frames sent (non-ASCII frames estimated from 1 in 32).",
+    lambda: manager.bytes_sent,
+)
+metrics.gauge(
+    "poker_ws_open_connections",
+    "Open WebSocket connections.",
+    lambda: sum(len(sockets) for sockets in manager.active_connections.values()),
+)
+for _method, _name, _help, _sample_every in (
+    ("start_new_hand", "poker_start_new_hand_seconds", "Time to deal a hand; the count is hands dealt.", 1),
+    ("record_action", "poker_record_action_seconds", "Engine time per applied action.", 1),
+    # 閲覧者ごとに毎メッセージ呼ばれるので 8 回に 1 回だけ計測（オーバーヘッド 1% 未満に抑える）
+    ("to_state_for", "poker_to_state_for_seconds", "Time to build one viewer's table state (1 in 8 sampled).", 8),
+    ("_settle_pots", "poker_settle_pots_seconds", "Time to settle the pots at hand end.", 1),
+):
+    instrument(table, _method, metrics.histogram(_name, _help), sample_every=_sample_every)
+instrument(
+    earnings_store,
+    "apply_updates",
+    metrics.histogram("poker_earnings_apply_seconds", "Time to write one batch of earnings deltas."),
+)
+metrics.counter_func("poker_earnings_cache_hits_total", "Earnings cache hits.", lambda: earnings_store.cache_hits)
+metrics.counter_func("poker_earnings_cache_misses_total", "Earnings cache misses.", lambda: earnings_store.cache_misses)
+metrics.counter_func(
+    "poker_earnings_flush_failures_total", "Failed write-behind flushes.", lambda: earnings_writer.failures
+)
+metrics.gauge(
+    "poker_earnings_pending_players", "Players with unwritten earnings deltas.", earnings_writer.pending_count
+)
+metrics.counter_func("poker_allowlist_reloads_total", "Allowlist reloads.", lambda: allowlist_store.reloads)
+metrics.counter_func(
+    "poker_google_cert_fetches_total", "Google certificate downloads.", lambda: google_verifier.cert_fetches
+)
+
+# 管理用エンドポイント（/admin/*）は ADMIN_TOKEN を設定したときだけ有効
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR", os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "profiles"))
+)
+PROFILE_MAX_SECONDS = 60.0
+profile_capture = ProfileCapture(PROFILE_DIR, max_seconds=PROFILE_MAX_SECONDS)
 
 # フロントエンドから送られてくるデータの型定義
 class AuthRequest(BaseModel):
@@ -59,30 +216,173 @@ def read_root():
     return {"status": "ok", "message": "Poker API is running"}
 
 
+@app.get("/metrics")
+def read_metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def require_admin(request: Request) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if request.headers.get("authorization") != f"Bearer {ADMIN_TOKEN}":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@app.get("/admin/traces")
+def read_traces(request: Request, limit: int = Query(50, ge=1, le=256)):
+    require_admin(request)
+    return {"spans": tracer.recent_spans(limit)}
+
+
+@app.get("/admin/profile")
+def read_profile_status(request: Request):
+    require_admin(request)
+    return profile_capture.status()
+
+
+@app.post("/admin/profile")
+async def start_profile(request: Request, seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS)):
+    # イベントループ全体を seconds 秒だけ cProfile で計測し、PROFILE_DIR に書き出す
+    require_admin(request)
+    try:
+        path = profile_capture.start(seconds)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return {"status": "started", "seconds": seconds, "path": path}
+
+
+def with_pending_earnings(email: str, stats: dict, start: date | None = None, end: date | None = None) -> dict:
+    # まだフラッシュされていない差分も反映して返す（期間指定時はその期間に精算された分だけ）
+    pending = earnings_writer.pending_for(
+        email,
+        rollups.day_key(start) if start else None,
+        rollups.day_key(end) if end else None,
+    )
+    return {key: stats.get(key, 0) + pending.get(key, 0) for key in stats}
+
+
+async def earnings_for(emails: list[str]) -> dict[str, dict]:
+    found = await earnings_store.get_many(emails)
+    return {email: with_pending_earnings(email, stats) for email, stats in found.items()}
+
+
+@app.get("/earnings/batch")
+async def get_earnings_batch(email: list[str] = Query(default=[])):
+    # 卓の全員分をまとめて取得（1回の get_all / SQL で読む）
+    emails = [e for e in dict.fromkeys(email) if e]
+    if not emails:
+        raise HTTPException(status_code=400, detail="email is required")
+    if len(emails) > table.max_players:
+        raise HTTPException(status_code=400, detail=f"at most {table.max_players} emails")
+    return await earnings_for(emails)
+
+
+async def compact_earnings_rollups() -> None:
+    while True:
+        await asyncio.sleep(EARNINGS_ROLLUP_SECONDS)
+        try:
+            await earnings_store.compact_rollups()
+        except Exception as exc:
+            # 失敗しても範囲取得時に日別から集計し直すので、ここでは記録だけ
+            print(f"earnings rollup failed: {exc}")
+
+
+async def save_leaderboard_periodically() -> None:
+    while True:
+        await asyncio.sleep(LEADERBOARD_SAVE_SECONDS)
+        try:
+            await earnings_store.save_leaderboard()
+        except Exception as exc:
+            # 次の周期で再保存される（dirty のまま）
+            print(f"leaderboard save failed: {exc}")
+
+
+@app.get("/earnings/range")
+async def get_earnings_range(email: str, start: date, end: date):
+    # 期間内の収支: 閉じた月・週の集計と端の日別バケットだけを読む
+    if not email:
+        raise HTTPException(status_code=400, detail="email is required")
+    if (end - start).days > EARNINGS_RANGE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"range is limited to {EARNINGS_RANGE_MAX_DAYS} days")
+    try:
+        stats, buckets = await earnings_store.get_range(email, start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    stats = with_pending_earnings(email, stats, start, end)
+    return {"email": email, "start": start, "end": end, "stats": stats, "buckets": buckets}
+
+
+def leaderboard_player_id(email: str) -> str:
+    # ランキングにはメールアドレスを出さず、メールから導いた不透明な ID を返す
+    return hashlib.sha256(f"leaderboard:{email}".encode()).hexdigest()[:16]
+
+
+def require_session(request: Request) -> str:
+    authorization = request.headers.get("authorization", "")
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    try:
+        return session_tokens.verify(authorization[len("Bearer "):])["sub"]
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@app.get("/leaderboard")
+async def get_leaderboard(
+    request: Request,
+    column: str = "chips_delta",
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+):
+    # ログイン済み（セッショントークン）のプレイヤーだけが見られる上位 N 人のランキング
+    email = require_session(request)
+    try:
+        entries = await earnings_store.leaderboard_page(column, offset, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {
+        "column": column,
+        "offset": offset,
+        "size": earnings_store.leaderboard_persist_size,
+        "player_id": leaderboard_player_id(email),
+        "entries": [
+            {"rank": entry["rank"], "player_id": leaderboard_player_id(entry["email"]), "value": entry["value"]}
+            for entry in entries
+        ],
+    }
+
+
 @app.get("/earnings")
-async def get_earnings(email: str):
+async def get_earnings(email: str, request: Request):
     if not email:
         raise HTTPException(status_code=400, detail="email is required")
-    return await earnings_store.get(email)
+    merged = with_pending_earnings(email, await earnings_store.get(email))
+    # 内容から ETag を作り、変わっていなければ 304 で本文を省く
+    body = json.dumps(merged, separators=(",", ":"))
+    etag = f'W/"{hashlib.sha1(f"{email}:{body}".encode()).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # Googleログイン用のエンドポイントを追加
 @app.post("/login/google")
 async def google_login(auth_data: AuthRequest):
     try:
         # Google IDトークンの検証
-        id_info = id_token.verify_oauth2_token(
-            auth_data.token, 
-            requests.Request(), 
-            GOOGLE_CLIENT_ID
-        )
+        id_info = await google_verifier.verify(auth_data.token)
 
         # 検証成功：ユーザー情報を取得
         user_id = id_info['sub']  # Googleユーザー固有のID
         email = id_info.get('email')
         name = id_info.get('name')
 
-        allowed_emails = await allowlist_store.get_allowed_emails()
-        if allowed_emails and (not email or email.lower() not in allowed_emails):
+        # メールのないトークンではセッションを発行できない（WebSocket 側で必ず弾かれる）
+        if not email:
+            raise HTTPException(status_code=403, detail="Google account has no email")
+        if not await allowlist_store.is_allowed(email):
             raise HTTPException(status_code=403, detail="Email not allowed")
 
         # ここで本来はデータベースへの保存等を行います
@@ -92,7 +392,8 @@ async def google_login(auth_data: AuthRequest):
                 "id": user_id,
                 "email": email,
                 "name": name
-            }
+            },
+            "session_token": session_tokens.issue(email, name),
         }
 
     except ValueError:
@@ -103,6 +404,21 @@ async def google_login(auth_data: AuthRequest):
 @app.websocket("/ws/game")
 async def websocket_game(websocket: WebSocket):
     table_id = table.table_id
+    # ハンドシェイク時にセッショントークンを検証（外部呼び出しなし）
+    session_email: str | None = None
+    token = websocket.query_params.get("token")
+    if token:
+        try:
+            session_email = session_tokens.verify(token)["sub"]
+        except ValueError:
+            session_email = None
+    if session_email is None and WS_REQUIRE_SESSION:
+        ws_connections_total.inc(labels=("rejected",))
+        # accept してから閉じないとブラウザにクローズコードが届かない
+        await websocket.accept()
+        await websocket.close(code=WS_SESSION_CLOSE_CODE)
+        return
+    ws_connections_total.inc(labels=("accepted",))
     await manager.connect(table_id, websocket)
     def connected_emails() -> set[str]:
         connections = manager.active_connections.get(table_id, set())
@@ -115,11 +431,17 @@ async def websocket_game(websocket: WebSocket):
     def table_state_payload_for(viewer_email: str | None) -> dict:
         return table.to_state_for(viewer_email, connected_emails()).model_dump()
 
-    async def broadcast_table_state() -> None:
+    async def broadcast_table_state(message_type: str = "tableState") -> None:
         connections = list(manager.active_connections.get(table_id, set()))
-        for ws in connections:
-            pid = manager.get_player(ws)
-            await manager.send(ws, {"type": "tableState", "payload": table_state_payload_for(pid)})
+        # 全員分の状態を先に作ってから送る（同じ時点のスナップショットを配る）
+        with tracer.phase("serialize"):
+            messages = [
+                (ws, {"type": message_type, "payload": table_state_payload_for(manager.get_player(ws))})
+                for ws in connections
+            ]
+        with tracer.phase("fanout"):
+            for ws, message in messages:
+                await manager.send(ws, message)
 
     await manager.send(
         websocket,
@@ -127,47 +449,44 @@ async def websocket_game(websocket: WebSocket):
     )
 
     async def cancel_pending_leave(email: str) -> None:
-        task = pending_leave_tasks.pop(email, None)
-        if task:
-            task.cancel()
+        timer_wheel.cancel(("leave", email))
 
     async def cancel_pending_disconnect(email: str) -> None:
-        task = pending_disconnect_tasks.pop(email, None)
-        if task:
-            task.cancel()
+        timer_wheel.cancel(("disconnect", email))
 
-    async def schedule_leave(email: str) -> None:
-        await cancel_pending_leave(email)
+    async def delayed_leave(email: str) -> None:
+        if manager.has_player(email):
+            return
+        table.leave_player(email)
+        await broadcast_table_state()
+        schedule_bot_turns()
 
-        async def delayed_leave() -> None:
-            await asyncio.sleep(LEAVE_GRACE_SECONDS)
-            if manager.has_player(email):
-                return
-            table.leave_player(email)
-            await broadcast_table_state()
+    async def delayed_disconnect(email: str) -> None:
+        if manager.has_player(email):
+            return
+        table.set_auto_play(email, True)
+        table.apply_auto_play()
+        await broadcast_table_state()
+        schedule_bot_turns()
 
-        pending_leave_tasks[email] = asyncio.create_task(delayed_leave())
+    async def schedule_leave(email: str) -> None:
+        timer_wheel.schedule(
+            LEAVE_GRACE_SECONDS, delayed_leave, email, key=("leave", email)
+        )
 
     async def schedule_disconnect(email: str) -> None:
-        await cancel_pending_disconnect(email)
-
-        async def delayed_disconnect() -> None:
-            await asyncio.sleep(LEAVE_GRACE_SECONDS)
-            if manager.has_player(email):
-                return
-            table.set_auto_play(email, True)
-            table.apply_auto_play()
-            await broadcast_table_state()
-
-        pending_disconnect_tasks[email] = asyncio.create_task(delayed_disconnect())
+        timer_wheel.schedule(
+            LEAVE_GRACE_SECONDS, delayed_disconnect, email, key=("disconnect", email)
+        )
 
     async def start_hand_with_delay() -> None:
-        await asyncio.sleep(HAND_DELAY_SECONDS)
+        await timer_wheel.sleep(HAND_DELAY_SECONDS)
+        if table.street != Street.waiting:
+            # Another startHand already dealt while this one was waiting.
+            return
         table.start_new_hand()
-        connections = list(manager.active_connections.get(table_id, set()))
-        for ws in connections:
-            pid = manager.get_player(ws)
-            await manager.send(ws, {"type": "handState", "payload": table_state_payload_for(pid)})
+        await broadcast_table_state("handState")
+        schedule_bot_turns()
 
     async def wait_for_all_gauges_then_start_hand() -> None:
         global settlement_gauge_ready, settlement_gauge_timeout_task
@@ -178,6 +497,14 @@ async def websocket_game(websocket: WebSocket):
             settlement_gauge_timeout_task.cancel()
             settlement_gauge_timeout_task = None
 
+    async def broadcast_table_earnings(emails: list[str]) -> None:
+        # 精算直後の着席者の収支をまとめて配信（各クライアントが個別に取りに来なくて済む）
+        if not emails:
+            return
+        payload = await earnings_for(emails)
+        for ws in list(manager.active_connections.get(table_id, set())):
+            await manager.send(ws, {"type": "tableEarnings", "payload": payload})
+
     async def start_next_hand_from_settlement(expected_hand_number: int) -> None:
         """
         Finalize settlement and start a new hand.
@@ -194,140 +521,195 @@ async def websocket_game(websocket: WebSocket):
         settlement_gauge_ready.clear()
         try:
             if table.save_earnings:
-                updates = table.build_earnings_updates()
-                await earnings_store.apply_updates(updates)
+                earnings_writer.submit(table.build_earnings_updates())
+                emails = [
+                    seat.email
+                    for seat in table.seats
+                    if seat.email and seat.seat_index not in table.bot_seats
+                ]
+                # 次のハンド開始を待たせないよう、収支の配信は後続ジョブで行う
+                table_pipeline.submit(lambda: broadcast_table_earnings(emails))
         except Exception as exc:
             print(f"earnings update failed: {exc}")
-        table.apply_pending_payouts()
-        table._finalize_pending_leaves()
-        table._finalize_leave_after_hand()
+        table.complete_settlement()
         table.start_new_hand()
-        connections = list(manager.active_connections.get(table_id, set()))
-        for ws in connections:
-            pid = manager.get_player(ws)
-            await manager.send(
-                ws, {"type": "handState", "payload": table_state_payload_for(pid)}
-            )
+        await broadcast_table_state("handState")
+        schedule_bot_turns()
 
     async def check_gauge_complete_and_start() -> None:
         global settlement_gauge_ready, settlement_gauge_timeout_task
         required = connected_emails()
         if required and settlement_gauge_ready >= required:
-            await start_next_hand_from_settlement(table.hand_number)
+            hand_number = table.hand_number
+            table_pipeline.submit(lambda: start_next_hand_from_settlement(hand_number))
+
+    async def after_action(data: ActionPayload) -> None:
+        await manager.broadcast(
+            table_id,
+            {"type": "actionApplied", "payload": data.model_dump()},
+        )
+        await broadcast_table_state()
+        if table.should_auto_runout() or table.street == Street.settlement:
+            table_pipeline.submit(run_out_and_settle)
+
+    async def run_out_and_settle() -> None:
+        while table.should_auto_runout():
+            await timer_wheel.sleep(RUNOUT_DELAY_SECONDS)
+            if not table.advance_auto_runout():
+                break
+            await broadcast_table_state()
+        # ハンド終了（settlement）後は全プレイヤーのゲージが0になるまで待ってから次のハンドを開始
+        if (
+            table.street == Street.settlement
+            and len([s for s in table.seats if s.email]) >= 2
+        ):
+            await wait_for_all_gauges_then_start_hand()
+
+    async def play_bot_turns() -> None:
+        try:
+            while (data := await bots.take_turn(table)) is not None:
+                await after_action(data)
+        except Exception as exc:
+            print(f"bot turn failed: {exc}")
+
+    def schedule_bot_turns() -> None:
+        # One bot loop per table; a running loop picks up any new bot turn itself.
+        global bot_turns_task
+        if table.bot_to_act() is None:
+            return
+        if bot_turns_task is None or bot_turns_task.done():
+            bot_turns_task = asyncio.create_task(play_bot_turns())
 
     try:
         while True:
             message = await websocket.receive_json()
             message_type = message.get("type")
             payload = message.get("payload") or {}
-
-            if message_type == "joinTable":
-                data = JoinTablePayload(**payload)
-                manager.set_player(websocket, data.email)
-                await cancel_pending_leave(data.email)
-                await cancel_pending_disconnect(data.email)
-                table.set_auto_play(data.email, False)
-                existing = table.find_seat(data.email)
-                if existing:
-                    table.join_player(data.email, data.name)
-                elif table.street in (Street.preflop, Street.flop, Street.turn, Street.river):
-                    # hand in progress: wait for seat reservation
-                    pass
-                else:
-                    # 参加時に自動着席せず、席選択に移る
+            if session_email and "email" in payload:
+                # クライアントが送る email は信用せず、トークンの本人に固定する
+                payload["email"] = session_email
+
+            # ラベルはクライアント任意の文字列にしない（未知の type は "unknown" にまとめる）
+            span = tracer.begin(message_type if message_type in WS_MESSAGE_TYPES else "unknown")
+            try:
+                if message_type == "joinTable":
+                    data = JoinTablePayload(**payload)
+                    manager.set_player(websocket, data.email)
+                    await cancel_pending_leave(data.email)
+                    await cancel_pending_disconnect(data.email)
+                    table.set_auto_play(data.email, False)
+                    existing = table.find_seat(data.email)
+                    if existing:
+                        table.join_player(data.email, data.name)
+                    elif table.street in (Street.preflop, Street.flop, Street.turn, Street.river):
+                        # hand in progress: wait for seat reservation
+                        pass
+                    else:
+                        # 参加時に自動着席せず、席選択に移る
+                        pass
+                    await broadcast_table_state()
+                elif message_type == "leaveTable":
+                    email = payload.get("email") or manager.get_player(websocket)
+                    if email:
+                        await schedule_leave(email)
+                elif message_type == "leaveNow":
+                    # 即時離席（待機/未着席UIから参加画面に戻る用途）
+                    email = payload.get("email") or manager.get_player(websocket)
+                    if email:
+                        await cancel_pending_leave(email)
+                        await cancel_pending_disconnect(email)
+                        table.leave_player(email)
+                        await broadcast_table_state()
+                        schedule_bot_turns()
+                elif message_type == "leaveAfterHand":
+                    email = payload.get("email") or manager.get_player(websocket)
+                    if email:
+                        table.mark_leave_after_hand(email)
+                        await broadcast_table_state()
+                elif message_type == "cancelLeaveAfterHand":
+                    email = payload.get("email") or manager.get_player(websocket)
+                    if email:
+                        table.cancel_leave_after_hand(email)
+                        await broadcast_table_state()
+                elif message_type == "action":
+                    data = ActionPayload(**payload)
+                    table.record_action(data)
+                    await after_action(data)
+                    schedule_bot_turns()
+                elif message_type == "setPreAction":
+                    # 手番前の予約アクション（手番が来た瞬間にサーバー側で実行）
+                    data = PreActionPayload(**payload)
+                    applied = table.set_pre_action(data.email, data.kind, data.amount)
+                    if applied is not None:
+                        await after_action(applied)
+                        schedule_bot_turns()
+                    else:
+                        # Only the requester's own payload shows the queued pre-action.
+                        await manager.send(
+                            websocket,
+                            {"type": "tableState", "payload": table_state_payload_for(data.email)},
+                        )
+                elif message_type == "nextHandGaugeComplete":
+                    email = payload.get("email") or manager.get_player(websocket)
+                    if email and table.street == Street.settlement:
+                        settlement_gauge_ready.add(email)
+                        await check_gauge_complete_and_start()
+                elif message_type == "revealHand":
+                    email = payload.get("email") or manager.get_player(websocket)
+                    if email:
+                        data = RevealHandPayload(email=email)
+                        if table.record_hand_reveal(data.email):
+                            await broadcast_table_state()
+                elif message_type == "syncState":
+                    await manager.send(
+                        websocket,
+                        {"type": "tableState", "payload": table_state_payload_for(manager.get_player(websocket))},
+                    )
+                elif message_type == "heartbeat":
+                    # Cloud Run keep-alive: no-op
                     pass
-                await broadcast_table_state()
-            elif message_type == "leaveTable":
-                email = payload.get("email") or manager.get_player(websocket)
-                if email:
-                    await schedule_leave(email)
-            elif message_type == "leaveNow":
-                # 即時離席（待機/未着席UIから参加画面に戻る用途）
-                email = payload.get("email") or manager.get_player(websocket)
-                if email:
-                    await cancel_pending_leave(email)
-                    await cancel_pending_disconnect(email)
-                    table.leave_player(email)
+                elif message_type == "reserveSeat":
+                    data = ReserveSeatPayload(**payload)
+                    table.reserve_seat(data.email, data.name, data.seat_index)
                     await broadcast_table_state()
-            elif message_type == "leaveAfterHand":
-                email = payload.get("email") or manager.get_player(websocket)
-                if email:
-                    table.mark_leave_after_hand(email)
+                elif message_type == "addBot":
+                    data = AddBotPayload(**payload)
+                    bots.add(table, data.seat_index, data.strategy, data.name)
                     await broadcast_table_state()
-            elif message_type == "cancelLeaveAfterHand":
-                email = payload.get("email") or manager.get_player(websocket)
-                if email:
-                    table.cancel_leave_after_hand(email)
+                elif message_type == "removeBot":
+                    data = RemoveBotPayload(**payload)
+                    bots.remove(table, data.seat_index)
                     await broadcast_table_state()
-            elif message_type == "action":
-                data = ActionPayload(**payload)
-                table.record_action(data)
-                await manager.broadcast(
-                    table_id,
-                    {"type": "actionApplied", "payload": data.model_dump()},
-                )
-                await broadcast_table_state()
-                while table.should_auto_runout():
-                    await asyncio.sleep(RUNOUT_DELAY_SECONDS)
-                    if not table.advance_auto_runout():
-                        break
+                    schedule_bot_turns()
+                elif message_type == "resetTable":
+                    table.reset()
                     await broadcast_table_state()
-                # ハンド終了（settlement）後は全プレイヤーのゲージが0になるまで待ってから次のハンドを開始
-                if (
-                    table.street == Street.settlement
-                    and len([s for s in table.seats if s.email]) >= 2
-                ):
-                    await wait_for_all_gauges_then_start_hand()
-            elif message_type == "nextHandGaugeComplete":
-                email = payload.get("email") or manager.get_player(websocket)
-                if email and table.street == Street.settlement:
-                    settlement_gauge_ready.add(email)
-                    await check_gauge_complete_and_start()
-            elif message_type == "revealHand":
-                email = payload.get("email") or manager.get_player(websocket)
-                if email:
-                    data = RevealHandPayload(email=email)
-                    if table.record_hand_reveal(data.email):
+                elif message_type == "setSaveStats":
+                    if table.street == Street.waiting and "save_stats" in payload:
+                        table.save_earnings = bool(payload["save_stats"])
                         await broadcast_table_state()
-            elif message_type == "syncState":
-                await manager.send(
-                    websocket,
-                    {"type": "tableState", "payload": table_state_payload_for(manager.get_player(websocket))},
-                )
-            elif message_type == "heartbeat":
-                # Cloud Run keep-alive: no-op
-                pass
-            elif message_type == "reserveSeat":
-                data = ReserveSeatPayload(**payload)
-                table.reserve_seat(data.email, data.name, data.seat_index)
-                await broadcast_table_state()
-            elif message_type == "resetTable":
-                table.reset()
-                await broadcast_table_state()
-            elif message_type == "setSaveStats":
-                if table.street == Street.waiting and "save_stats" in payload:
-                    table.save_earnings = bool(payload["save_stats"])
-                    await broadcast_table_state()
-            elif message_type == "requestManualTopup":
-                # Next hand: +300 chips (only when stack <= 100). Earnings unaffected.
-                email = payload.get("email") or manager.get_player(websocket)
-                if email:
-                    table.request_manual_topup(email)
-                    # No visible change until next hand, but we still broadcast so the UI can
-                    # stay in sync if needed.
-                    await broadcast_table_state()
-            elif message_type == "startHand":
-                if (
-                    table.street == Street.waiting
-                    and len([s for s in table.seats if s.email]) >= 2
-                ):
-                    table.save_earnings = payload.get("save_stats", False)
-                    await start_hand_with_delay()
-            else:
-                await manager.send(
-                    websocket,
-                    {"type": "error", "payload": {"message": "Unknown message type"}},
-                )
+                elif message_type == "requestManualTopup":
+                    # Next hand: +300 chips (only when stack <= 100). Earnings unaffected.
+                    email = payload.get("email") or manager.get_player(websocket)
+                    if email:
+                        table.request_manual_topup(email)
+                        # No visible change until next hand, but we still broadcast so the UI can
+                        # stay in sync if needed.
+                        await broadcast_table_state()
+                elif message_type == "startHand":
+                    if (
+                        table.street == Street.waiting
+                        and len([s for s in table.seats if s.email]) >= 2
+                    ):
+                        table.save_earnings = payload.get("save_stats", False)
+                        table_pipeline.submit(start_hand_with_delay)
+                else:
+                    await manager.send(
+                        websocket,
+                        {"type": "error", "payload": {"message": "Unknown message type"}},
+                    )
+            finally:
+                tracer.end(span)
     except WebSocketDisconnect:
         email = manager.get_player(websocket)
         if email:
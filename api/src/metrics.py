@@ -0,0 +1,244 @@
+"""
+In-memory metrics exposed in the Prometheus text format (`GET /metrics`).
+
+Counters and fixed-bucket histograms are plain dicts/lists updated on the event
+loop thread, so an observation is a `bisect` and two additions (well under a
+microsecond) and needs no lock. Gauges are callbacks read at scrape time, which
+lets components keep their own plain counters (`cache_hits`, `reloads`, ...).
+
+Engine and store code stays metrics-free: `instrument` wraps a method on one
+instance (e.g. `table._settle_pots`) with a histogram timer.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# Seconds: 50us .. 2.5s, for handler / engine call latencies.
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+# Bytes: 256B .. 1MiB, for payload sizes.
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_text(names: Sequence[str], values: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: "Histogram", labels: Labels) -> None:
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, self._labels)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one count per bucket, one for +Inf, then the sum.
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def time(self, labels: Labels = ()) -> _Timer:
+        return _Timer(self, labels)
+
+    def count(self, labels: Labels = ()) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def total(self, labels: Labels = ()) -> float:
+        series = self._series.get(labels)
+        return series[-1] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        bounds = self.buckets + (math.inf,)
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}")
+            label_text = _label_text(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        self.name = name
+        self.help = help_text
+        self.read = read
+
+    def render(self) -> List[str]:
+        try:
+            value = float(self.read())
+        except Exception:
+            return []
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class CounterFunc(Gauge):
+    """A component's own monotonic counter, read at scrape time."""
+
+    kind = "counter"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+
+    def _add(self, metric: Any) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+        labelnames: Sequence[str] = (),
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, buckets, labelnames))
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], float]) -> Gauge:
+        return self._add(Gauge(name, help_text, read))
+
+    def counter_func(self, name: str, help_text: str, read: Callable[[], float]) -> CounterFunc:
+        return self._add(CounterFunc(name, help_text, read))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def instrument(
+    obj: Any,
+    method_name: str,
+    histogram: Histogram,
+    labels: Labels = (),
+    sample_every: int = 1,
+) -> None:
+    """
+    Time calls of `obj.method_name` (sync or async) into `histogram`.
+
+    With `sample_every=N` only every Nth call is timed, for calls made once per
+    viewer on every message; the histogram then describes latency, not volume.
+    """
+    method = getattr(obj, method_name)
+    observe = histogram.observe
+    clock = time.perf_counter
+    calls = 0
+    if asyncio.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def timed_async(*args: Any, **kwargs: Any) -> Any:
+            nonlocal calls
+            calls += 1
+            if calls < sample_every:
+                return await method(*args, **kwargs)
+            calls = 0
+            started = clock()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                observe(clock() - started, labels)
+
+        setattr(obj, method_name, timed_async)
+        return
+
+    @functools.wraps(method)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        if calls < sample_every:
+            return method(*args, **kwargs)
+        calls = 0
+        started = clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            observe(clock() - started, labels)
+
+    setattr(obj, method_name, timed)
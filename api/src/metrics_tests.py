@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+_SRC_ROOT = os.path.dirname(__file__)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from game.manager import ConnectionManager  # noqa: E402
+from metrics import MetricsRegistry, instrument  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _render_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    messages = registry.counter("messages_total", "Messages.", labelnames=("type",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0), labelnames=("type",))
+    registry.gauge("open", "Open sockets.", lambda: 3)
+    registry.gauge("broken", "Read fails.", lambda: 1 / 0)
+    messages.inc(labels=("action",))
+    messages.inc(2, labels=('we"ird\n',))
+    for value in (0.05, 0.1, 0.5, 7.0):
+        latency.observe(value, ("action",))
+    lines = registry.render().splitlines()
+    for expected in (
+        "# TYPE messages_total counter",
+        'messages_total{type="action"} 1',
+        'messages_total{type="we\\"ird\\n"} 2',
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{type="action",le="0.1"} 2',
+        'latency_seconds_bucket{type="action",le="1"} 3',
+        'latency_seconds_bucket{type="action",le="+Inf"} 4',
+        'latency_seconds_sum{type="action"} 7.65',
+        'latency_seconds_count{type="action"} 4',
+        "open 3",
+        "# TYPE broken gauge",
+    ):
+        if expected not in lines:
+            raise AssertionError(f"missing line: {expected}")
+    _assert_equal([line for line in lines if line.startswith("broken ")], [])
+    _assert_equal(latency.count(("action",)), 4)
+    try:
+        registry.counter("messages_total", "Again.")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("duplicate metric names should be rejected")
+
+
+def _instrument_sync_and_async() -> None:
+    registry = MetricsRegistry()
+    sync_hist = registry.histogram("sync_seconds", "Sync.")
+    async_hist = registry.histogram("async_seconds", "Async.")
+
+    class Worker:
+        def compute(self, value: int) -> int:
+            if value < 0:
+                raise ValueError("negative")
+            return value * 2
+
+        async def store(self, value: int) -> int:
+            await asyncio.sleep(0)
+            return value + 1
+
+    worker = Worker()
+    instrument(worker, "compute", sync_hist)
+    instrument(worker, "store", async_hist)
+    _assert_equal(worker.compute(4), 8)
+    try:
+        worker.compute(-1)
+    except ValueError:
+        pass
+    _assert_equal(asyncio.run(worker.store(1)), 2)
+    _assert_equal(sync_hist.count(), 2)
+    _assert_equal(async_hist.count(), 1)
+    sampled_hist = registry.histogram("sampled_seconds", "Sampled.")
+    instrument(worker, "store", sampled_hist, sample_every=3)
+    for value in range(7):
+        asyncio.run(worker.store(value))
+    _assert_equal(sampled_hist.count(), 2)
+    # Only this instance is wrapped.
+    _assert_equal(Worker().compute.__name__, "compute")
+    _assert_equal(hasattr(Worker().compute, "__wrapped__"), False)
+
+
+def _connection_manager_counts_sent_frames() -> None:
+    class Socket:
+        async def send_text(self, text: str) -> None:
+            return None
+
+    async def scenario() -> ConnectionManager:
+        manager = ConnectionManager()
+        sockets = [Socket(), Socket()]
+        manager.active_connections["t"] = set(sockets)
+        await manager.broadcast("t", {"type": "heartbeat"})  # 20 ASCII bytes, twice
+        await manager.send(sockets[0], {"card": "A\u2660"})  # the suit is 3 bytes in UTF-8
+        return manager
+
+    manager = asyncio.run(scenario())
+    _assert_equal(manager.frames_sent, 3)
+    _assert_equal(manager.bytes_sent, 40 + len('{"card":"A"}') + 3)
+
+
+def run() -> None:
+    _render_prometheus_text()
+    _instrument_sync_and_async()
+    _connection_manager_counts_sent_frames()
+
+
+if __name__ == "__main__":
+    run()
+    print("metrics_tests: ok")
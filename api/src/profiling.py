@@ -0,0 +1,92 @@
+"""
+Time-boxed cProfile captures of the event loop, triggered from an admin endpoint.
+
+`ProfileCapture.start(seconds)` enables `cProfile` on the event loop thread
+(every task on the loop is profiled, not just the request that asked), then
+after `seconds` disables it and writes two files to `output_dir`:
+
+- `profile-<UTC timestamp>.pstats`: the raw stats (`python -m pstats`, snakeviz);
+- `profile-<UTC timestamp>.txt`: the top functions by cumulative time.
+
+Only one capture runs at a time and the duration is capped, so a forgotten
+request cannot leave the profiler's overhead on a live table.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import time
+from typing import Any, Dict, Optional
+
+
+class ProfileCapture:
+    def __init__(self, output_dir: str, max_seconds: float = 60.0, top: int = 60) -> None:
+        self.output_dir = output_dir
+        self.max_seconds = max_seconds
+        self.top = top
+        self.last_path: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._path: Optional[str] = None
+        self._profiler: Optional[cProfile.Profile] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        return {"running": self.running, "path": self._path if self.running else None, "last_path": self.last_path}
+
+    def start(self, seconds: float) -> str:
+        """Begin a capture; returns the `.pstats` path it will write. ValueError if busy or out of range."""
+        if not 0 < seconds <= self.max_seconds:
+            raise ValueError(f"seconds must be in (0, {self.max_seconds:g}]")
+        if self.running:
+            raise ValueError("A profile capture is already running")
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc:
+            # Another profiler (or debugger) already owns this thread.
+            raise ValueError(f"Cannot start profiler: {exc}") from exc
+        self._profiler = profiler
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        self._path = os.path.join(self.output_dir, f"profile-{stamp}.pstats")
+        self._task = asyncio.get_running_loop().create_task(self._finish(profiler, seconds, self._path))
+        return self._path
+
+    async def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        # A task cancelled before it first ran never reaches its `finally`.
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+
+    async def _finish(self, profiler: cProfile.Profile, seconds: float, path: str) -> None:
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+            self._profiler = None
+        try:
+            await asyncio.to_thread(self._write, profiler, path)
+        except OSError as exc:
+            print(f"profile dump failed: {exc}")
+            return
+        self.last_path = path
+
+    def _write(self, profiler: cProfile.Profile, path: str) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(self.top)
+        with open(os.path.splitext(path)[0] + ".txt", "w", encoding="utf-8") as handle:
+            handle.write(summary.getvalue())
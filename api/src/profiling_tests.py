@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+
+_SRC_ROOT = os.path.dirname(__file__)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from profiling import ProfileCapture  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _busy_work() -> int:
+    return sum(i * i for i in range(20000))
+
+
+async def _capture_writes_stats_and_summary() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = ProfileCapture(os.path.join(tmp, "profiles"), max_seconds=5)
+        path = capture.start(0.2)
+        _assert_equal(capture.status()["running"], True)
+        try:
+            capture.start(0.2)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a second capture should be refused while one runs")
+        # Other tasks on the loop are profiled too.
+        for _ in range(5):
+            _busy_work()
+            await asyncio.sleep(0.01)
+        while capture.running:
+            await asyncio.sleep(0.05)
+        _assert_equal(capture.last_path, path)
+        _assert_equal(os.path.exists(path), True)
+        with open(os.path.splitext(path)[0] + ".txt", encoding="utf-8") as handle:
+            summary = handle.read()
+        if "_busy_work" not in summary:
+            raise AssertionError("summary should list the profiled work")
+
+
+async def _duration_is_capped() -> None:
+    capture = ProfileCapture(tempfile.gettempdir(), max_seconds=5)
+    for seconds in (0, -1, 5.5):
+        try:
+            capture.start(seconds)
+        except ValueError:
+            continue
+        raise AssertionError(f"{seconds}s should be rejected")
+    _assert_equal(capture.running, False)
+
+
+async def _cancel_stops_the_profiler() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = ProfileCapture(tmp, max_seconds=60)
+        path = capture.start(60)
+        await capture.cancel()
+        _assert_equal(capture.running, False)
+        _assert_equal(sys.getprofile(), None)
+        _assert_equal(os.path.exists(path), False)
+        # The thread's profiler was released, so a new capture can start.
+        capture.start(0.05)
+        while capture.running:
+            await asyncio.sleep(0.02)
+
+
+def run() -> None:
+    asyncio.run(_capture_writes_stats_and_summary())
+    asyncio.run(_duration_is_capped())
+    asyncio.run(_cancel_stops_the_profiler())
+
+
+if __name__ == "__main__":
+    run()
+    print("profiling_tests: ok")
@@ -0,0 +1,55 @@
+"""
+Short-lived HMAC-signed session tokens.
+
+`/login/google` verifies the Google ID token once and issues one of these; the
+WebSocket handshake only checks the HS256 signature and expiry locally, so
+connects and reconnects never call out to Google.
+
+`SESSION_SECRET` (shared by every API instance) is required while sessions are
+enforced; the app refuses to start without it. Only with `WS_REQUIRE_SESSION=0`
+does it fall back to a random per-process key (`ephemeral`), whose tokens stop
+working after a restart and on other instances.
+`jose` (and with it `cryptography`) is imported on first use, off the cold-start path.
+"""
+from __future__ import annotations
+
+import os
+import secrets
+import time
+from typing import Any, Dict, Optional
+
+ALGORITHM = "HS256"
+
+
+class SessionTokens:
+    def __init__(self, secret: Optional[str] = None, ttl_seconds: Optional[int] = None) -> None:
+        secret = secret or os.getenv("SESSION_SECRET")
+        self.ephemeral = not secret
+        self._secret = secret or secrets.token_urlsafe(32)
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv("SESSION_TOKEN_SECONDS", "43200"))
+        self.ttl_seconds = ttl_seconds
+
+    def issue(self, email: str, name: Optional[str] = None) -> str:
+        """A token for `email`; ValueError if it is empty (it could never verify)."""
+        from jose import jwt
+
+        if not email:
+            raise ValueError("Session token needs an email")
+        now = int(time.time())
+        claims: Dict[str, Any] = {"sub": email, "iat": now, "exp": now + self.ttl_seconds}
+        if name:
+            claims["name"] = name
+        return jwt.encode(claims, self._secret, algorithm=ALGORITHM)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Claims of a valid, unexpired token; ValueError otherwise."""
+        from jose import JWTError, jwt
+
+        try:
+            claims = jwt.decode(token, self._secret, algorithms=[ALGORITHM])
+        except JWTError as exc:
+            raise ValueError(f"Invalid session token: {exc}") from exc
+        if not claims.get("sub"):
+            raise ValueError("Invalid session token: no subject")
+        return claims
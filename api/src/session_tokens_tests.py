@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+_SRC_ROOT = os.path.dirname(__file__)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from session_tokens import SessionTokens  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _assert_rejected(tokens: SessionTokens, token: str) -> None:
+    try:
+        tokens.verify(token)
+    except ValueError:
+        return
+    raise AssertionError(f"token should have been rejected: {token[:20]}")
+
+
+def _round_trip() -> None:
+    tokens = SessionTokens(secret="s3cret", ttl_seconds=60)
+    claims = tokens.verify(tokens.issue("alice@example.com", "Alice"))
+    _assert_equal(claims["sub"], "alice@example.com")
+    _assert_equal(claims["name"], "Alice")
+    _assert_equal(claims["exp"] - claims["iat"], 60)
+
+
+def _bad_tokens_raise_value_error() -> None:
+    tokens = SessionTokens(secret="s3cret", ttl_seconds=60)
+    other = SessionTokens(secret="other", ttl_seconds=60)
+    _assert_rejected(tokens, other.issue("mallory@example.com"))
+    _assert_rejected(tokens, "not-a-token")
+    header, body, signature = tokens.issue("alice@example.com").split(".")
+    forged_body = other.issue("mallory@example.com").split(".")[1]
+    _assert_rejected(tokens, f"{header}.{forged_body}.{signature}")
+
+
+def _expired_tokens_are_rejected() -> None:
+    # Already expired when issued; an explicit ttl is used as given.
+    tokens = SessionTokens(secret="s3cret", ttl_seconds=-1)
+    _assert_rejected(tokens, tokens.issue("alice@example.com"))
+
+
+def _missing_secret_is_flagged_ephemeral() -> None:
+    saved = os.environ.pop("SESSION_SECRET", None)
+    try:
+        _assert_equal(SessionTokens(ttl_seconds=60).ephemeral, True)
+        _assert_equal(SessionTokens(secret="s3cret", ttl_seconds=60).ephemeral, False)
+        os.environ["SESSION_SECRET"] = "from-env"
+        _assert_equal(SessionTokens(ttl_seconds=60).ephemeral, False)
+    finally:
+        os.environ.pop("SESSION_SECRET", None)
+        if saved is not None:
+            os.environ["SESSION_SECRET"] = saved
+
+
+def _tokens_need_an_email() -> None:
+    tokens = SessionTokens(secret="s3cret", ttl_seconds=60)
+    for email in ("", None):
+        try:
+            tokens.issue(email)
+        except ValueError:
+            continue
+        raise AssertionError(f"issue({email!r}) should be rejected")
+
+
+def _verification_is_cheap() -> None:
+    tokens = SessionTokens(secret="s3cret", ttl_seconds=60)
+    token = tokens.issue("alice@example.com")
+    started = time.perf_counter()
+    for _ in range(1000):
+        tokens.verify(token)
+    per_call = (time.perf_counter() - started) / 1000
+    if per_call > 0.001:
+        raise AssertionError(f"verify took {per_call * 1e6:.0f}us per token")
+
+
+def run() -> None:
+    _round_trip()
+    _bad_tokens_raise_value_error()
+    _expired_tokens_are_rejected()
+    _tokens_need_an_email()
+    _missing_secret_is_flagged_ephemeral()
+    _verification_is_cheap()
+
+
+if __name__ == "__main__":
+    run()
+    print("session_tokens_tests: ok")
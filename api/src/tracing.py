@@ -0,0 +1,112 @@
+"""
+Per-message tracing spans for the `/ws/game` dispatcher.
+
+Each handled message opens a span named after its type; code it calls marks
+phases (`serialize`: building viewer states, `fanout`: sending frames) with
+`tracer.phase(...)`, which finds the open span through a context variable, so
+nothing is threaded through call signatures. When the span ends, the time not
+covered by a phase is recorded as `engine` (validation and the table call).
+
+Spans feed two histograms (message time by type, phase time by type and
+phase), a ring of recent spans for `/admin/traces`, and a log line for slow
+messages. Work that outlives its message (pipeline jobs, timers) still records
+phases, labelled `background`.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .metrics import Histogram
+
+BACKGROUND = "background"
+
+
+class Span:
+    __slots__ = ("name", "started_at", "started", "duration", "phases", "ended")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.phases: Dict[str, float] = {}
+        self.ended = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class _Phase:
+    __slots__ = ("_tracer", "_name", "_started")
+
+    def __init__(self, tracer: "Tracer", name: str) -> None:
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self) -> "_Phase":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._tracer._add_phase(self._name, time.perf_counter() - self._started)
+
+
+class Tracer:
+    def __init__(
+        self,
+        message_seconds: "Histogram",
+        phase_seconds: "Histogram",
+        recent_size: int = 256,
+        slow_seconds: Optional[float] = None,
+    ) -> None:
+        self.message_seconds = message_seconds
+        self.phase_seconds = phase_seconds
+        self.slow_seconds = slow_seconds
+        self.recent: Deque[Span] = deque(maxlen=recent_size)
+
+    def begin(self, name: str) -> Span:
+        span = Span(name)
+        _current_span.set(span)
+        return span
+
+    def end(self, span: Span) -> None:
+        span.duration = time.perf_counter() - span.started
+        span.ended = True
+        _current_span.set(None)
+        covered = sum(span.phases.values())
+        span.phases["engine"] = max(0.0, span.duration - covered)
+        labels = (span.name,)
+        self.message_seconds.observe(span.duration, labels)
+        self.phase_seconds.observe(span.phases["engine"], (span.name, "engine"))
+        self.recent.append(span)
+        if self.slow_seconds is not None and span.duration >= self.slow_seconds:
+            phases = ", ".join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in span.phases.items())
+            print(f"slow message {span.name}: {span.duration * 1000:.1f}ms ({phases})")
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def recent_spans(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest first."""
+        spans = list(self.recent)[-limit:] if limit > 0 else []
+        return [span.to_dict() for span in reversed(spans)]
+
+    def _add_phase(self, name: str, seconds: float) -> None:
+        span = _current_span.get()
+        if span is None or span.ended:
+            self.phase_seconds.observe(seconds, (BACKGROUND, name))
+            return
+        span.phases[name] = span.phases.get(name, 0.0) + seconds
+        self.phase_seconds.observe(seconds, (span.name, name))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+_SRC_ROOT = os.path.dirname(__file__)
+if _SRC_ROOT not in sys.path:
+    sys.path.append(_SRC_ROOT)
+
+from metrics import MetricsRegistry  # noqa: E402
+from tracing import BACKGROUND, Tracer  # noqa: E402
+
+
+def _assert_equal(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"expected {expected}, got {actual}")
+
+
+def _tracer(slow_seconds=None):
+    registry = MetricsRegistry()
+    messages = registry.histogram("messages", "Messages.", labelnames=("type",))
+    phases = registry.histogram("phases", "Phases.", labelnames=("type", "phase"))
+    return Tracer(messages, phases, recent_size=3, slow_seconds=slow_seconds), messages, phases
+
+
+def _phases_split_the_message() -> None:
+    tracer, messages, phases = _tracer()
+    span = tracer.begin("action")
+    time.sleep(0.01)
+    with tracer.phase("serialize"):
+        time.sleep(0.01)
+    with tracer.phase("fanout"):
+        time.sleep(0.01)
+    with tracer.phase("fanout"):
+        pass
+    tracer.end(span)
+    _assert_equal(sorted(span.phases), ["engine", "fanout", "serialize"])
+    if abs(sum(span.phases.values()) - span.duration) > 1e-6:
+        raise AssertionError("phases should add up to the message time")
+    if span.phases["engine"] < 0.009:
+        raise AssertionError(f"engine should cover untraced time, got {span.phases['engine']}")
+    _assert_equal(messages.count(("action",)), 1)
+    _assert_equal(phases.count(("action", "fanout")), 2)
+    _assert_equal(phases.count(("action", "engine")), 1)
+
+
+def _work_after_the_message_is_background() -> None:
+    tracer, _messages, phases = _tracer()
+
+    async def scenario() -> None:
+        span = tracer.begin("startHand")
+        # Tasks copy the context, so a job started by the message sees its span.
+        release = asyncio.Event()
+
+        async def job() -> None:
+            await release.wait()
+            with tracer.phase("fanout"):
+                pass
+
+        task = asyncio.create_task(job())
+        tracer.end(span)
+        release.set()
+        await task
+        with tracer.phase("serialize"):
+            pass
+
+    asyncio.run(scenario())
+    _assert_equal(phases.count(("startHand", "fanout")), 0)
+    _assert_equal(phases.count((BACKGROUND, "fanout")), 1)
+    _assert_equal(phases.count((BACKGROUND, "serialize")), 1)
+
+
+def _recent_spans_and_slow_log() -> None:
+    tracer, _messages, _phases = _tracer(slow_seconds=0.005)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for name in ("joinTable", "action", "heartbeat", "syncState"):
+            span = tracer.begin(name)
+            if name == "action":
+                time.sleep(0.01)
+            tracer.end(span)
+    _assert_equal([span["type"] for span in tracer.recent_spans(10)], ["syncState", "heartbeat", "action"])
+    _assert_equal([span["type"] for span in tracer.recent_spans(1)], ["syncState"])
+    logged = output.getvalue()
+    if "slow message action" not in logged or "heartbeat" in logged:
+        raise AssertionError(f"unexpected slow log: {logged!r}")
+
+
+def run() -> None:
+    _phases_split_the_message()
+    _work_after_the_message_is_background()
+    _recent_spans_and_slow_log()
+
+
+if __name__ == "__main__":
+    run()
+    print("tracing_tests: ok")
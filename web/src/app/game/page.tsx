@@ -16,6 +16,7 @@ export default async function GamePage() {
         <JoinTableScreen
             email={email}
             defaultName={defaultName}
+            sessionToken={session.sessionToken}
         />
     )
 }
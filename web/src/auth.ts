@@ -27,6 +27,9 @@ export const { handlers, auth, signIn, signOut } = NextAuth({
                     });
 
                     if (response.ok) {
+                        // WebSocket 接続用のセッショントークンを jwt コールバックへ引き継ぐ
+                        const data = await response.json();
+                        account.session_token = data.session_token;
                         return true; // バックエンドも承認したので、ログイン成功！
                     } else {
                         console.error("Backend login failed");
@@ -39,5 +42,17 @@ export const { handlers, auth, signIn, signOut } = NextAuth({
             }
             return false;
         },
+        async jwt({ token, account }) {
+            if (typeof account?.session_token === "string") {
+                token.sessionToken = account.session_token;
+            }
+            return token;
+        },
+        async session({ session, token }) {
+            if (typeof token.sessionToken === "string") {
+                session.sessionToken = token.sessionToken;
+            }
+            return session;
+        },
     },
 })
\ No newline at end of file
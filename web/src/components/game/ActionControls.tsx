@@ -1,6 +1,6 @@
 "use client"
 
-import { ActionPayload, ActionType, TableState } from "@/lib/game/types"
+import { ActionPayload, ActionType, PreActionPayload, TableState } from "@/lib/game/types"
 import { useEffect, useMemo, useRef, useState } from "react"
 import { createPortal } from "react-dom"
 
@@ -15,6 +15,8 @@ interface ActionControlsProps {
     table: TableState | null
     email: string
     onAction: (payload: ActionPayload) => void
+    /** 手番前の予約アクション（All Fold は check/fold、Call X / Call Any は call / call_any として送る） */
+    onPreAction?: (payload: PreActionPayload) => void
     className?: string
     forceAllFold?: boolean
     interactionEnabled?: boolean
@@ -76,6 +78,7 @@ export function ActionControls({
     table,
     email,
     onAction,
+    onPreAction,
     className = "",
     forceAllFold = false,
     interactionEnabled = true,
@@ -93,6 +96,9 @@ export function ActionControls({
     const [allFoldCheckedThisStreet, setAllFoldCheckedThisStreet] = useState(false)
     const forcedByTimerRef = useRef(false)
     const lastAutoActionRef = useRef<string | null>(null)
+    const prevServerPreActionRef = useRef<string | null>(null)
+    const preActionExpiredRef = useRef(false)
+    const lastPreActionSentRef = useRef<string | null>(null)
     const prevStreetRef = useRef<TableState["street"] | null>(table?.street ?? null)
     const prevHandNumberRef = useRef<number | null>(table?.hand_number ?? null)
     const quickBetScrollRef = useRef<HTMLDivElement | null>(null)
@@ -114,41 +120,21 @@ export function ActionControls({
         if (!table) return null
         return table.seats.find((item) => item.email === email) ?? null
     }, [table, email])
-    const toCall = useMemo(() => {
-        if (!table || !seat) return 0
-        return Math.max(0, table.current_bet - seat.street_commit)
+    // 合法アクションはサーバーが手番のプレイヤーにだけ送る（クライアントでルールを再計算しない）
+    const legal = useMemo(() => {
+        const actions = table?.legal_actions
+        if (!actions || !seat || actions.seat_index !== seat.seat_index) return null
+        return actions
     }, [table, seat])
-    const canCheck = Boolean(table && seat && toCall === 0)
-    const callAmount = Math.max(0, Math.min(toCall, seat?.stack ?? 0))
-    const canCall = Boolean(table && seat && toCall > 0 && callAmount > 0)
-    const hasNonAllInOpponent = Boolean(
-        table &&
-        seat &&
-        table.seats.some(
-            (other) =>
-                other.email &&
-                other.seat_index !== seat.seat_index &&
-                !other.is_folded &&
-                !other.is_all_in
-        )
-    )
-    const canBet = Boolean(table && seat && table.current_bet === 0)
-    const canRaise = Boolean(
-        table &&
-        seat &&
-        table.current_bet > 0 &&
-        !seat.raise_blocked &&
-        seat.stack + seat.street_commit > table.current_bet &&
-        hasNonAllInOpponent
-    )
-    const canAllIn = Boolean(canBet || canRaise)
-    const rawMin = table
-        ? table.current_bet === 0
-            ? table.big_blind
-            : table.current_bet + table.min_raise
-        : 3
-    const sliderMax = table && seat ? seat.stack + seat.street_commit : 60
-    const sliderMin = Math.min(rawMin, sliderMax)
+    const toCall = legal?.to_call ?? 0
+    const canCheck = Boolean(legal?.can_check)
+    const callAmount = legal?.call_amount ?? 0
+    const canCall = Boolean(legal?.can_call)
+    const canBet = Boolean(legal?.can_bet)
+    const canRaise = Boolean(legal?.can_raise)
+    const canAllIn = Boolean(legal?.can_all_in)
+    const sliderMax = legal?.max_total ?? (table && seat ? seat.stack + seat.street_commit : 60)
+    const sliderMin = legal?.min_total ?? Math.min(table?.big_blind ?? 3, sliderMax)
     const foldBlocked = Boolean(isTurn && table && toCall === 0)
     const showAllFoldToggle = Boolean(
         table &&
@@ -198,7 +184,7 @@ export function ActionControls({
         canRaise,
         canAllIn,
         betSize: effectiveBetSize,
-        allInSize: (seat?.stack ?? 0) + (seat?.street_commit ?? 0),
+        allInSize: sliderMax,
     })
 
     const checkCallBtn = isTurnReady
@@ -256,6 +242,54 @@ export function ActionControls({
         }
     }, [forceAllFold])
 
+    // サーバーの check/fold 予約がチェック済みのストリート終了で消えたら、
+    // 従来どおり次のストリートでは All Fold を OFF に戻す
+    const serverPreAction = table?.pre_action?.kind ?? null
+    useEffect(() => {
+        const prev = prevServerPreActionRef.current
+        prevServerPreActionRef.current = serverPreAction
+        preActionExpiredRef.current = false
+        if (prev !== "check_fold" || serverPreAction !== null || !allFoldEnabled) return
+        if (forceAllFold) return
+        preActionExpiredRef.current = true
+        setAllFoldEnabled(false)
+    }, [serverPreAction, allFoldEnabled, forceAllFold])
+
+    // All Fold の ON/OFF をサーバーの予約に反映（手番が来た瞬間にサーバーで check/fold）
+    useEffect(() => {
+        if (!onPreAction || !table || !seat || isTurn) return
+        if (!["preflop", "flop", "turn", "river"].includes(table.street) || seat.is_folded) return
+        let kind: PreActionPayload["kind"] | undefined
+        if (allFoldEnabled && serverPreAction !== "check_fold" && !preActionExpiredRef.current) {
+            kind = "check_fold"
+        } else if (!allFoldEnabled && serverPreAction === "check_fold") {
+            kind = null
+        }
+        if (kind === undefined) return
+        // 再描画のたびに同じ予約を送らない
+        const key = `${table.hand_number}-${table.street}-${serverPreAction}-${kind}`
+        if (lastPreActionSentRef.current === key) return
+        lastPreActionSentRef.current = key
+        onPreAction({ email, kind })
+    }, [allFoldEnabled, serverPreAction, isTurn, table, seat, email, onPreAction])
+
+    // 手番前の Call 予約（Call X: 今のベット額だけ / Call Any: 何が来てもコール）
+    const offTurnToCall = table && seat ? Math.max(0, table.current_bet - seat.street_commit) : 0
+    const showCallPreActions = Boolean(showAllFoldToggle && onPreAction && !forceAllFold)
+    const handleCallPreAction = (kind: "call" | "call_any") => {
+        if (!onPreAction || !table) return
+        if (serverPreAction === kind) {
+            onPreAction({ email, kind: null })
+            return
+        }
+        if (allFoldEnabled) {
+            // All Fold を OFF にしても check/fold の解除は送らない（この予約で上書きされる）
+            lastPreActionSentRef.current = `${table.hand_number}-${table.street}-${serverPreAction}-null`
+            setAllFoldEnabled(false)
+        }
+        onPreAction(kind === "call" ? { email, kind, amount: table.current_bet } : { email, kind })
+    }
+
     useEffect(() => {
         if (!allFoldEnabled || !isTurnReady || !table) return
         const key = `${table.hand_number}-${table.street}-${toCall}-${table.current_bet}`
@@ -501,6 +535,33 @@ export function ActionControls({
                         >
                             {checkCallBtn.label}
                         </button>
+                    ) : showCallPreActions ? (
+                        <div className="flex gap-1.5 h-full min-h-0">
+                            {offTurnToCall > 0 && (
+                                <button
+                                    type="button"
+                                    className={`rounded px-2.5 py-1.5 text-sm font-semibold whitespace-nowrap flex-1 min-w-0 text-center h-full flex items-center justify-center ${serverPreAction === "call"
+                                        ? "bg-emerald-300/60 text-white/90 hover:bg-emerald-300/70"
+                                        : "bg-emerald-300/30 text-white/80 hover:bg-emerald-300/40"
+                                        }`}
+                                    onClick={() => handleCallPreAction("call")}
+                                    aria-pressed={serverPreAction === "call"}
+                                >
+                                    {`Call ${Math.min(offTurnToCall, seat?.stack ?? offTurnToCall)}`}
+                                </button>
+                            )}
+                            <button
+                                type="button"
+                                className={`rounded px-2.5 py-1.5 text-sm font-semibold whitespace-nowrap flex-1 min-w-0 text-center h-full flex items-center justify-center ${serverPreAction === "call_any"
+                                    ? "bg-emerald-300/60 text-white/90 hover:bg-emerald-300/70"
+                                    : "bg-emerald-300/30 text-white/80 hover:bg-emerald-300/40"
+                                    }`}
+                                onClick={() => handleCallPreAction("call_any")}
+                                aria-pressed={serverPreAction === "call_any"}
+                            >
+                                Call Any
+                            </button>
+                        </div>
                     ) : (
                         <div className={emptySlotClass}>
                             —
@@ -10,9 +10,12 @@ import {
     EarningsSummary,
     GameMessage,
     JoinTablePayload,
+    PreActionPayload,
     ReserveSeatPayload,
+    TableEarnings,
     TableState,
 } from "@/lib/game/types"
+import { signOut } from "next-auth/react"
 import { useRouter } from "next/navigation"
 import { useEffect, useLayoutEffect, useMemo, useRef, useState } from "react"
 import { ActionControls } from "./ActionControls"
@@ -21,8 +24,13 @@ import { BoardPot } from "./BoardPot"
 import { EarningsModal } from "./EarningsModal"
 import { SeatCard } from "./SeatCard"
 
+/** API がセッショントークン不正時に送るクローズコード */
+const SESSION_EXPIRED_CLOSE_CODE = 4401
+
 interface GameClientProps {
     player: JoinTablePayload
+    /** /ws/game のハンドシェイクで検証されるセッショントークン */
+    sessionToken?: string
     /** HOME画面に埋め込まれている場合（タイトルはHOME側で表示） */
     embeddedInHome?: boolean
     /** テーブルを抜けてHOMEの名前入力に戻る（embeddedInHome 時のみ使用） */
@@ -31,6 +39,7 @@ interface GameClientProps {
 
 export function GameClient({
     player,
+    sessionToken,
     embeddedInHome,
     onBackToHome,
 }: GameClientProps) {
@@ -526,7 +535,10 @@ export function GameClient({
     }, [showMenuRandom])
 
     useEffect(() => {
-        const wsUrl = apiUrl.replace(/^http/, "ws") + "/ws/game"
+        const wsUrl =
+            apiUrl.replace(/^http/, "ws") +
+            "/ws/game" +
+            (sessionToken ? `?token=${encodeURIComponent(sessionToken)}` : "")
         const socket = new WebSocket(wsUrl)
         socketRef.current = socket
         let didOpen = false
@@ -558,8 +570,13 @@ export function GameClient({
             flushPendingNextHandGaugeComplete()
         })
 
-        socket.addEventListener("close", () => {
+        socket.addEventListener("close", (event) => {
             if (socketRef.current !== socket) return
+            if (event.code === SESSION_EXPIRED_CLOSE_CODE) {
+                // セッショントークンが無効・期限切れ: 再ログインで新しいトークンを取り直す
+                signOut({ callbackUrl: "/" })
+                return
+            }
             if (!didOpen) return
             setIsDisconnected(true)
             if (heartbeatIntervalRef.current) {
@@ -580,6 +597,14 @@ export function GameClient({
 
         socket.addEventListener("message", (event) => {
             const message: GameMessage<TableState> = JSON.parse(event.data)
+            if (message.type === "tableEarnings") {
+                // 精算ごとに卓全員の収支が届くので、モーダルは再取得せずキャッシュを使う
+                const earnings = (message.payload ?? {}) as unknown as TableEarnings
+                Object.entries(earnings).forEach(([email, summary]) => {
+                    earningsCacheRef.current.set(email, summary)
+                })
+                return
+            }
             if (message.type === "tableState" || message.type === "handState") {
                 const nextState = message.payload ?? null
                 if (!nextState) {
@@ -701,7 +726,7 @@ export function GameClient({
             }
             socket.close()
         }
-    }, [apiUrl, player.email, player.name, reconnectToken])
+    }, [apiUrl, player.email, player.name, reconnectToken, sessionToken])
 
     useEffect(() => {
         tableStateRef.current = tableState
@@ -1066,6 +1091,10 @@ export function GameClient({
         sendMessage({ type: "action", payload })
     }
 
+    const handlePreAction = (payload: PreActionPayload) => {
+        sendMessage({ type: "setPreAction", payload })
+    }
+
     const handleLeave = () => {
         sendMessage({
             type: "leaveTable",
@@ -1632,6 +1661,7 @@ export function GameClient({
                                         table={tableState}
                                         email={player.email}
                                         onAction={handleAction}
+                                        onPreAction={handlePreAction}
                                         forceAllFold={forceAllFold}
                                         interactionEnabled={actionControlsEnabled}
                                         leaveSlot={leaveSlot}
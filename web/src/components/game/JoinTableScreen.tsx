@@ -12,6 +12,8 @@ import { GameClient } from "./GameClient"
 interface JoinTableScreenProps {
     email: string
     defaultName: string
+    /** /login/google が発行した WebSocket 接続用トークン */
+    sessionToken?: string
 }
 
 /**
@@ -22,6 +24,7 @@ interface JoinTableScreenProps {
 export function JoinTableScreen({
     email,
     defaultName,
+    sessionToken,
 }: JoinTableScreenProps) {
     const [name, setName] = useState(defaultName)
     const [player, setPlayer] = useState<JoinTablePayload | null>(null)
@@ -96,6 +99,7 @@ export function JoinTableScreen({
                 {player ? (
                     <GameClient
                         player={player}
+                        sessionToken={sessionToken}
                         embeddedInHome
                         onBackToHome={() => setPlayer(null)}
                     />
@@ -6,7 +6,8 @@ export const fetchEarningsSummary = async (
 ): Promise<EarningsSummary> => {
     const response = await fetch(
         `${apiUrl}/earnings?email=${encodeURIComponent(email)}`,
-        { cache: "no-store" }
+        // ETag で再検証する（変化がなければサーバーは 304 を返す）
+        { cache: "no-cache" }
     )
     if (!response.ok) {
         throw new Error(`Failed to load earnings (${response.status})`)
@@ -26,6 +26,7 @@ export interface SeatState {
     is_all_in: boolean
     street_commit: number
     raise_blocked: boolean
+    is_bot?: boolean
 }
 
 export interface ActionRecord {
@@ -37,6 +38,40 @@ export interface ActionRecord {
     detail?: string | null
 }
 
+/** 手番のプレイヤーだけに送られる、サーバー計算済みの合法アクション */
+export interface LegalActions {
+    seat_index: number
+    to_call: number
+    /** 実際にコールで出すチップ（ショートスタックはオールイン分） */
+    call_amount: number
+    can_check: boolean
+    can_call: boolean
+    can_bet: boolean
+    can_raise: boolean
+    can_all_in: boolean
+    /** ショートオールイン後はレイズ不可（コール/フォールドのみ） */
+    raise_reopened: boolean
+    /** ベット/レイズ額（このストリートの合計）の下限・上限。上限はオールイン */
+    min_total: number
+    max_total: number
+}
+
+export type PreActionKind = "check_fold" | "call_any" | "call"
+
+/** 手番前に予約したアクション（本人にだけ送られる） */
+export interface PreAction {
+    kind: PreActionKind
+    /** call: コールするベット額。ベットが変わると予約は取り消される */
+    amount?: number | null
+}
+
+export interface PreActionPayload {
+    email: string
+    /** null で予約解除 */
+    kind: PreActionKind | null
+    amount?: number
+}
+
 export interface TableState {
     table_id: string
     small_blind: number
@@ -56,6 +91,8 @@ export interface TableState {
     seats: SeatState[]
     action_history: ActionRecord[]
     current_turn_seat?: number | null
+    legal_actions?: LegalActions | null
+    pre_action?: PreAction | null
     hand_number: number
     /** 収支を保存するか（サーバー同期・誰かが変えると全員に反映） */
     save_earnings?: boolean
@@ -73,6 +110,9 @@ export interface EarningsSummary {
     chips_delta_69_92: number
 }
 
+// 精算後にサーバーから送られる着席者全員の収支（email -> 収支）
+export type TableEarnings = Record<string, EarningsSummary>
+
 export interface ActionPayload {
     email: string
     action: ActionType
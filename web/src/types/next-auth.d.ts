@@ -0,0 +1,19 @@
+import "next-auth";
+import "next-auth/jwt";
+
+declare module "next-auth" {
+  interface Session {
+    /** /login/google が発行した WebSocket 用セッショントークン */
+    sessionToken?: string;
+  }
+
+  interface Account {
+    session_token?: string;
+  }
+}
+
+declare module "next-auth/jwt" {
+  interface JWT {
+    sessionToken?: string;
+  }
+}